@@ -0,0 +1,24 @@
+"""
+backend.py — choix du moteur qui exécute les requêtes /analytics
+  • sql    : requêtes MySQL (app/db/repositories/analytics_repo.py)
+  • memory : colonnes NumPy en mémoire (app/analytics/memory.py)
+  • duckdb : DuckDB embarqué sur l'export Parquet (app/analytics/duckdb_backend.py)
+
+Tous les moteurs exposent top_countries, newest_values, trend,
+mortality_recovery, total et data_state avec la même signature (db en
+premier argument).
+"""
+
+from app.core.config import settings
+from app.analytics.memory import memory_engine
+from app.analytics.duckdb_backend import duckdb_analytics
+from app.db.repositories import analytics_repo
+
+
+def get_analytics_backend():
+    # Tant que le moteur choisi n'est pas prêt, on reste sur le SQL
+    if settings.ANALYTICS_ENGINE == "memory" and memory_engine.ready:
+        return memory_engine
+    if settings.ANALYTICS_ENGINE == "duckdb" and duckdb_analytics.ready:
+        return duckdb_analytics
+    return analytics_repo
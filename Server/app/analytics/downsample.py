@@ -0,0 +1,43 @@
+"""
+downsample.py — réduction de séries temporelles pour l'affichage
+  • LTTB (Largest-Triangle-Three-Buckets, S. Steinarsson 2013) : garde les
+    points qui portent la forme de la courbe (pics, creux), premier et dernier inclus
+  • une itération Python par bucket, calculs du bucket vectorisés NumPy :
+    quelques centaines d'itérations quelle que soit la longueur de la série
+"""
+
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices (croissants) des `threshold` points retenus ; tous si la série est déjà courte"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # buckets intermédiaires [bounds[i], bounds[i+1]) ; le premier et le dernier point sont fixes
+    every = (n - 2) / (threshold - 2)
+    bounds = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    bounds[-1] = n - 1
+
+    # moyenne de chaque bucket, puis moyenne du bucket suivant (dernier point pour le dernier)
+    sizes = np.diff(bounds)
+    avg_x = np.add.reduceat(x[1:n - 1], bounds[:-1] - 1) / sizes
+    avg_y = np.add.reduceat(y[1:n - 1], bounds[:-1] - 1) / sizes
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        ax, ay = x[a], y[a]
+        # double aire du triangle (point retenu précédent, candidat, moyenne du bucket suivant)
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
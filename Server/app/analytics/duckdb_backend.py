@@ -0,0 +1,224 @@
+"""
+duckdb_backend.py — moteur analytique DuckDB embarqué (ANALYTICS_ENGINE=duckdb)
+  • export : instantané Parquet de covid_stats (row groups, mémoire constante)
+  • les requêtes /analytics (app/db/repositories/analytics_repo.py, dialecte
+    duckdb) tournent sur ce fichier : les agrégations lourdes ne touchent
+    plus MySQL, qui reste libre pour les écritures
+  • schéma Arrow explicite, tiré des types de CovidStat : une colonne entièrement
+    NULL dans un bloc garde son type
+  • l'instantané porte la version des données exportée (métadonnées Parquet) ;
+    un thread par worker compare toutes les ANALYTICS_REFRESH_SECONDS la
+    version de la base (ingest, /manage) et met en file un job "parquet_export"
+    (un seul par version, clé unique du job runner), ou exporte lui-même si
+    JOBS_ENABLED=false
+
+Usage (depuis Server/) :
+    python -m app.analytics.duckdb_backend export
+"""
+
+import argparse
+import datetime
+import logging
+import pathlib
+import re
+import threading
+from typing import List
+
+from sqlalchemy import BigInteger, Float, Integer
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal, engine as db_engine
+from app.db.models.covid import CovidStat
+from app.db.repositories import change_repo, job_repo
+from app.db.repositories.analytics_repo import AnalyticsQueries, DIALECTS
+
+logger = logging.getLogger(__name__)
+
+_PARAM = re.compile(r"(?<!:):(\w+)")
+
+# métadonnée Parquet : version des données (app/db/repositories/change_repo.py) exportée
+VERSION_KEY = b"data_version"
+
+
+# ------------------------------------------------------------------
+# Export Parquet de covid_stats
+# ------------------------------------------------------------------
+def arrow_schema(version: int):
+    """Schéma Arrow de covid_stats d'après les types du modèle, version en métadonnée"""
+    import pyarrow as pa
+
+    def arrow_type(column):
+        if isinstance(column.type, (Integer, BigInteger)):
+            return pa.int64()
+        if isinstance(column.type, Float):
+            return pa.float64()
+        return pa.string()
+
+    return pa.schema(
+        [pa.field(c.name, arrow_type(c)) for c in CovidStat.__table__.columns],
+        metadata={VERSION_KEY: str(version).encode()},
+    )
+
+
+def export_parquet(path=None, chunksize: int = 100_000, engine=None) -> dict:
+    """Lecture par blocs + un row group par bloc ; remplacement atomique du fichier"""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = pathlib.Path(path or settings.ANALYTICS_PARQUET_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".parquet.tmp")
+
+    # version lue avant les lignes : une écriture pendant l'export redéclenche un export
+    with Session(engine or db_engine) as db:
+        version = change_repo.data_version(db)
+    schema = arrow_schema(version)
+    select = "SELECT " + ", ".join(db_quote(name, engine) for name in schema.names) + " FROM covid_stats"
+
+    rows = 0
+    with pq.ParquetWriter(str(tmp), schema) as writer:      # table vide : fichier valide sans ligne
+        with (engine or db_engine).connect().execution_options(stream_results=True) as conn:
+            for chunk in pd.read_sql_query(select, conn, chunksize=chunksize):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                rows += len(chunk)
+    tmp.replace(path)
+    logger.info(f"covid_stats exported to {path} ({rows} rows, version {version})")
+    return {"rows": rows, "path": str(path), "data_version": version}
+
+
+def snapshot_version(path) -> int:
+    """Version des données de l'instantané ; -1 si absent ou antérieur à la métadonnée"""
+    import pyarrow.parquet as pq
+
+    try:
+        metadata = pq.read_schema(str(path)).metadata or {}
+    except FileNotFoundError:
+        return -1
+    return int(metadata.get(VERSION_KEY, b"-1"))
+
+
+def db_quote(column: str, engine=None) -> str:
+    return (engine or db_engine).dialect.identifier_preparer.quote(column)
+
+
+# ------------------------------------------------------------------
+# Requêtes /analytics sur l'instantané Parquet
+# ------------------------------------------------------------------
+class DuckDBAnalytics(AnalyticsQueries):
+    def __init__(self, parquet_path=None, refresh_seconds: float = settings.ANALYTICS_REFRESH_SECONDS):
+        self.parquet_path = pathlib.Path(parquet_path or settings.ANALYTICS_PARQUET_PATH)
+        self.refresh_seconds = refresh_seconds
+        self._conn = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self) -> bool:
+        return self.parquet_path.exists()
+
+    # ---------- fraîcheur de l'instantané ----------
+    def refresh(self) -> bool:
+        """Export (job ou direct) si la base a avancé depuis l'instantané ; True si lancé"""
+        db = SessionLocal()
+        try:
+            version = change_repo.data_version(db)
+            if snapshot_version(self.parquet_path) >= version:
+                return False
+            if not settings.JOBS_ENABLED:
+                export_parquet(self.parquet_path)
+                return True
+            # tous les workers voient le retard : la clé ne laisse passer qu'un job par version
+            dedupe_key = f"parquet_export:{version}"
+            if job_repo.get_job_by_dedupe_key(db, dedupe_key) is not None:
+                return False
+            job = job_repo.create_job(
+                db,
+                "parquet_export",
+                max_attempts=settings.JOB_MAX_ATTEMPTS,
+                timeout_seconds=settings.JOB_TIMEOUT_SECONDS,
+                dedupe_key=dedupe_key,
+            )
+            logger.info(f"Parquet snapshot behind version {version}: job {job.id} queued")
+            return True
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._wake.set()            # premier contrôle immédiat (instantané absent ou ancien)
+            self._thread = threading.Thread(target=self._loop, name="parquet-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
+
+    def notify(self) -> None:
+        """Écriture locale (manage) : contrôler sans attendre la prochaine période"""
+        self._wake.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.refresh_seconds)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Parquet snapshot refresh failed")
+
+    def _connection(self):
+        if self._conn is None:
+            import duckdb
+
+            conn = duckdb.connect(database=":memory:")
+            # vue : le fichier est relu à chaque requête, un nouvel export est pris en compte
+            path = str(self.parquet_path).replace("'", "''")
+            conn.execute(f"CREATE VIEW covid_stats AS SELECT * FROM read_parquet('{path}')")
+            self._conn = conn
+        return self._conn
+
+    def dialect_for(self, db):
+        return DIALECTS["duckdb"]
+
+    def data_state(self, db):
+        # l'instantané Parquet ne change qu'à l'export
+        st = self.parquet_path.stat()
+        return f"p{st.st_mtime_ns}", datetime.datetime.utcfromtimestamp(st.st_mtime)
+
+    def fetch(self, db, sql: str, params: dict) -> List[dict]:
+        # paramètres SQLAlchemy (:nom) → DuckDB ($nom)
+        sql = _PARAM.sub(r"$\1", sql)
+        # une connexion DuckDB n'est pas partagée entre threads : curseur dédié
+        with self._lock:
+            cursor = self._connection().cursor()
+        try:
+            result = cursor.execute(sql, params)
+            names = [col[0] for col in result.description]
+            return [dict(zip(names, row)) for row in result.fetchall()]
+        finally:
+            cursor.close()
+
+
+duckdb_analytics = DuckDBAnalytics()
+
+
+# ─── Entrée en CLI ───────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Instantané Parquet de covid_stats pour DuckDB")
+    parser.add_argument("command", choices=["export"])
+    parser.add_argument("--path", default=None, help="Fichier Parquet cible")
+    args = parser.parse_args()
+
+    result = export_parquet(args.path)
+    print(f"✅ {result['rows']} lignes → {result['path']}")
@@ -0,0 +1,274 @@
+"""
+memory.py — moteur analytique en mémoire (ANALYTICS_ENGINE=memory)
+  • covid_stats chargé au démarrage en colonnes NumPy, triées par (pays, date)
+  • rafraîchissement incrémental : le journal `covid_changes` est relu
+    périodiquement et seuls les pays modifiés sont rechargés ; le curseur est
+    la version de données (ordre des commits), pas l'id du journal
+  • mêmes signatures et mêmes résultats que app/db/repositories/analytics_repo.py
+    (vérifié par tests/test_analytics_parity.py
+    et, sur une base réelle, python -m app.analytics.parity)
+
+Les lectures travaillent sur un instantané immuable remplacé d'un bloc à
+chaque rafraîchissement : aucun verrou sur le chemin des requêtes.
+"""
+
+import datetime
+import logging
+import threading
+from typing import List
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models.covid import CovidStat
+from app.db.repositories import change_repo
+from app.db.repositories.analytics_repo import ALLOWED_METRICS
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = 86_400_000
+
+# attribut CovidStat → nom de colonne SQL (celui utilisé par ALLOWED_METRICS)
+_COLUMNS = {
+    "total_confirmed": "total_confirmed",
+    "total_deaths": "total_deaths",
+    "total_recovered": "total_recovered",
+    "new_cases": "New cases",
+    "new_deaths": "New deaths",
+    "new_recovered": "New recovered",
+}
+
+
+def _sql_round(values: np.ndarray) -> np.ndarray:
+    # CAST(... AS SIGNED) / ROUND() MySQL sur un DOUBLE : arrondi rint (pair le plus proche)
+    return np.rint(values)
+
+
+class _Snapshot:
+    """Colonnes concaténées par pays ; `offsets[i]:offsets[i+1]` = lignes du pays i"""
+
+    def __init__(self, per_country: dict):
+        self.per_country = per_country
+        self.names = np.array(sorted(per_country), dtype=object)
+        sizes = [len(per_country[name]["ts"]) for name in self.names]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        self.columns = {
+            key: np.concatenate([per_country[name][key] for name in self.names])
+            if len(self.names) else np.empty(0)
+            for key in ["ts", *_COLUMNS.values()]
+        }
+
+    @property
+    def rows(self) -> int:
+        return int(self.offsets[-1])
+
+    def last_index_where(self, mask: np.ndarray) -> np.ndarray:
+        """Par pays : indice de la dernière ligne (date la plus récente) vérifiant `mask`, -1 sinon"""
+        if not len(self.names):
+            return np.empty(0, dtype=np.int64)
+        idx = np.where(mask, np.arange(len(mask)), -1)
+        last = np.maximum.reduceat(idx, self.offsets[:-1])
+        # reduceat renvoie la 1re valeur pour un pays sans ligne ; on l'invalide
+        empty = self.offsets[:-1] == self.offsets[1:]
+        last[empty | (last < self.offsets[:-1])] = -1
+        return last
+
+
+class MemoryAnalyticsEngine:
+    def __init__(self, refresh_seconds: float = settings.ANALYTICS_REFRESH_SECONDS, session_factory=SessionLocal):
+        self.refresh_seconds = refresh_seconds
+        self._session_factory = session_factory
+        self._snapshot = None
+        self._version = 0
+        self._loaded_at = None
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    # ---------- chargement ----------
+    @staticmethod
+    def _load_countries(db: Session, countries=None) -> dict:
+        query = db.query(
+            CovidStat.country,
+            CovidStat.date_timestamp,
+            *[getattr(CovidStat, attr) for attr in _COLUMNS],
+        ).filter(CovidStat.country.isnot(None), CovidStat.date_timestamp.isnot(None))
+        if countries is not None:
+            query = query.filter(CovidStat.country.in_(countries))
+        rows = query.order_by(CovidStat.country, CovidStat.date_timestamp).all()
+
+        per_country = {}
+        if not rows:
+            return per_country
+        columns = list(zip(*rows))
+        names = np.array(columns[0], dtype=object)
+        # début de chaque pays dans le résultat trié
+        starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]])
+        ends = np.r_[starts[1:], len(names)]
+        ts = np.array(columns[1], dtype=np.int64)
+        # dtype float : les NULL deviennent NaN
+        values = {
+            col: np.array(columns[i + 2], dtype=np.float64)
+            for i, col in enumerate(_COLUMNS.values())
+        }
+        for start, end in zip(starts, ends):
+            per_country[names[start]] = {
+                "ts": ts[start:end],
+                **{col: arr[start:end] for col, arr in values.items()},
+            }
+        return per_country
+
+    def load(self) -> None:
+        db = self._session_factory()
+        try:
+            version = change_repo.data_version(db)
+            self._snapshot = _Snapshot(self._load_countries(db))
+            self._version = version
+            self._loaded_at = datetime.datetime.utcnow()
+        finally:
+            db.close()
+        logger.info(
+            f"Analytics memory engine loaded: {len(self._snapshot.names)} countries, "
+            f"{self._snapshot.rows} rows (version {self._version})"
+        )
+
+    def refresh(self) -> int:
+        """Recharge uniquement les pays apparus dans covid_changes depuis la dernière version chargée"""
+        with self._refresh_lock:
+            db = self._session_factory()
+            try:
+                changes = change_repo.changes_since(db, self._version)
+                if not changes:
+                    return 0
+                if any(country is None for _, country in changes):
+                    self._snapshot = _Snapshot(self._load_countries(db))
+                else:
+                    countries = sorted({country for _, country in changes})
+                    fresh = self._load_countries(db, countries)
+                    per_country = dict(self._snapshot.per_country)
+                    for country in countries:
+                        if country in fresh:
+                            per_country[country] = fresh[country]
+                        else:
+                            per_country.pop(country, None)    # supprimé
+                    self._snapshot = _Snapshot(per_country)
+                self._version = changes[-1][0]
+                self._loaded_at = datetime.datetime.utcnow()
+                return len(changes)
+            finally:
+                db.close()
+
+    # ---------- cycle de vie ----------
+    def start(self) -> None:
+        self.load()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="analytics-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
+
+    def notify(self) -> None:
+        """Écriture locale (manage) : rafraîchir sans attendre la prochaine période"""
+        self._wake.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.refresh_seconds)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                if self.refresh():
+                    logger.info(f"Analytics memory engine refreshed (version {self._version})")
+            except Exception:
+                logger.exception("Analytics memory engine refresh failed")
+
+    def data_state(self, db: Session):
+        # version du journal effectivement chargée (peut suivre la base avec un léger retard)
+        return self._version, self._loaded_at
+
+    # ---------- requêtes (mêmes signatures que analytics_repo) ----------
+    def _latest_ranking(self, column: str, limit: int) -> List[dict]:
+        snap = self._snapshot
+        values = snap.columns[column]
+        with np.errstate(invalid="ignore"):
+            last = snap.last_index_where(values > 0)
+        keep = last >= 0
+        names, picked = snap.names[keep], _sql_round(values[last[keep]])
+        # ORDER BY value DESC (nom en départage, l'ordre SQL des ex æquo n'est pas défini)
+        order = np.lexsort((names.astype(str), -picked))[:limit]
+        return [{"name": names[i], "value": int(picked[i])} for i in order]
+
+    def top_countries(self, db: Session, metric: str, limit: int) -> List[dict]:
+        return self._latest_ranking(ALLOWED_METRICS[metric][0], limit)
+
+    def newest_values(self, db: Session, metric: str, limit: int) -> List[dict]:
+        return self._latest_ranking(ALLOWED_METRICS[metric][1], limit)
+
+    def trend(self, db: Session, metric: str, days: int) -> List[dict]:
+        snap = self._snapshot
+        ts, values = snap.columns["ts"], snap.columns[ALLOWED_METRICS[metric][1]]
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        first_day = (today - datetime.timedelta(days=days)).toordinal() - datetime.date(1970, 1, 1).toordinal()
+
+        day = ts // DAY_MS
+        with np.errstate(invalid="ignore"):
+            mask = (ts > 0) & (day > first_day) & (values >= 0)
+        if not mask.any():
+            return []
+        unique_days, inverse = np.unique(day[mask], return_inverse=True)
+        sums = _sql_round(np.bincount(inverse, weights=values[mask]))
+        epoch = datetime.date(1970, 1, 1)
+        return [
+            {"name": str(epoch + datetime.timedelta(days=int(d))), "value": int(v)}
+            for d, v in zip(unique_days, sums)
+        ]
+
+    def mortality_recovery(self, db: Session, limit: int) -> List[dict]:
+        snap = self._snapshot
+        confirmed = snap.columns["total_confirmed"]
+        with np.errstate(invalid="ignore"):
+            last = snap.last_index_where(confirmed > 0)
+        last = last[last >= 0]
+        last = last[confirmed[last] >= 1000]
+
+        c = confirmed[last]
+        d = np.nan_to_num(snap.columns["total_deaths"][last])
+        r = np.nan_to_num(snap.columns["total_recovered"][last])
+        names = snap.names[np.searchsorted(snap.offsets, last, side="right") - 1]
+        mortality = np.clip(np.round(d / c * 100, 2), 0, 100)
+        recovery = np.clip(np.round(r / c * 100, 2), 0, 100)
+
+        order = np.lexsort((names.astype(str), -c))[:limit]
+        return [
+            {
+                "name": names[i],
+                "Mortality %": float(mortality[i]),
+                "Recovery %": float(recovery[i]),
+                "confirmed": int(c[i]),
+                "deaths": int(d[i]),
+                "recovered": int(r[i]),
+            }
+            for i in order
+        ]
+
+    def total(self, db: Session, metric: str) -> int:
+        values = self._snapshot.columns[ALLOWED_METRICS[metric][1]]
+        with np.errstate(invalid="ignore"):
+            return int(_sql_round(values[values > 0].sum()))
+
+
+memory_engine = MemoryAnalyticsEngine()
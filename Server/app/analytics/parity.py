@@ -0,0 +1,81 @@
+"""
+parity.py — vérifie qu'un moteur analytique renvoie exactement les résultats SQL
+  • rejoue chaque requête /analytics sur le moteur testé et sur la base,
+    pour chaque métrique
+  • code de sortie 1 en cas d'écart
+  • mêmes cas que la suite pytest (tests/test_analytics_parity.py, base SQLite
+    synthétique) ; ce module les rejoue sur une base réelle
+
+Usage (depuis Server/, base accessible) :
+    python -m app.analytics.parity            # moteur mémoire
+    python -m app.analytics.parity duckdb     # export Parquet + DuckDB
+"""
+
+import sys
+
+from app.analytics.memory import MemoryAnalyticsEngine
+from app.db.database import SessionLocal
+from app.db.repositories import analytics_repo
+from app.db.repositories.analytics_repo import ALLOWED_METRICS
+
+
+def _same_ranking(expected: list, actual: list, key: str = "value") -> bool:
+    """
+    Classements égaux au sens SQL : l'ordre des ex æquo n'est pas défini,
+    ni le choix des ex æquo retenus à la limite du LIMIT.
+    """
+    if [row[key] for row in expected] != [row[key] for row in actual]:
+        return False
+    if not expected:
+        return True
+    cutoff = expected[-1][key]
+
+    def above(rows):
+        return sorted((row for row in rows if row[key] != cutoff), key=lambda row: (-row[key], row["name"]))
+
+    return above(expected) == above(actual)
+
+
+def cases():
+    for metric in ALLOWED_METRICS:
+        yield f"top/{metric}", "top_countries", (metric, 50), _same_ranking
+        yield f"new/{metric}", "newest_values", (metric, 50), _same_ranking
+        yield f"total/{metric}", "total", (metric,), None
+        # 36500 jours : couvre tout l'historique, quelle que soit la date du jour
+        for days in (1, 30, 365, 36500):
+            yield f"trend/{metric}/{days}", "trend", (metric, days), None
+    yield "mortality-recovery", "mortality_recovery", (50,), lambda e, a: _same_ranking(e, a, "confirmed")
+
+
+def run(engine=None, other=analytics_repo) -> list:
+    """Liste des écarts (vide si parité)"""
+    if engine is None:
+        engine = MemoryAnalyticsEngine()
+        engine.load()
+
+    mismatches = []
+    db = SessionLocal()
+    try:
+        for name, fn, args, same in cases():
+            expected = getattr(other, fn)(db, *args)
+            actual = getattr(engine, fn)(db, *args)
+            if not (same(expected, actual) if same else expected == actual):
+                mismatches.append((name, expected, actual))
+    finally:
+        db.close()
+    return mismatches
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["duckdb"]:
+        from app.analytics.duckdb_backend import duckdb_analytics, export_parquet
+
+        export_parquet(duckdb_analytics.parquet_path)
+        mismatches = run(duckdb_analytics)
+    else:
+        mismatches = run()
+    for name, expected, actual in mismatches:
+        print(f"❌ {name}\n   expected: {expected}\n   actual:   {actual}")
+    if mismatches:
+        sys.exit(1)
+    print(f"✅ Parité avec le SQL sur {sum(1 for _ in cases())} requêtes")
@@ -0,0 +1,20 @@
+# Server/app/api/endpoints/admission.py - ÉTAT DU CONTRÔLE D'ADMISSION (ADMIN)
+from fastapi import APIRouter, Depends
+
+from app.core import admission, login_guard
+from app.core.config import settings
+from app.core.deps import get_admin_user
+from app.db.models.user import User
+
+router = APIRouter(prefix="/admission", tags=["admission"])
+
+
+@router.get("")
+def read_admission(current_user: User = Depends(get_admin_user)):
+    """Limites, requêtes en cours et refus par groupe de routes, pour ce worker (ADMIN SEULEMENT)"""
+    return {
+        "enabled": settings.ADMISSION_ENABLED,
+        "queue_timeout": settings.ADMISSION_QUEUE_TIMEOUT,
+        "groups": admission.snapshot(),
+        "login": login_guard.snapshot(),
+    }
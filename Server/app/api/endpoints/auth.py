@@ -1,28 +1,50 @@
 # Server/app/api/endpoints/auth.py - VERSION SIMPLIFIÉE
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from datetime import timedelta
+from starlette.concurrency import run_in_threadpool
+from datetime import datetime, timedelta
+from typing import Optional
 import logging
+import secrets
 
 from app.db.database import get_db
+from app.core import login_guard
 from app.core.security import (
-    verify_password, 
+    verify_token,
     create_access_token,
+    get_password_hash,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
-from app.core.deps import get_current_user
-from app.schemas.auth import LoginRequest, LoginResponse, UserResponse
+from app.core.deps import get_admin_user, get_current_user, security
+from app.core.revocation import revocation_cache
+from app.schemas.auth import ChangePasswordRequest, LoginRequest, LoginResponse, UserResponse
 from app.db.models.user import User
+from app.db.repositories import session_repo
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 logger = logging.getLogger(__name__)
 
+def _find_user(db: Session, username: str):
+    """Utilisateur détaché ; la connexion est rendue au pool avant la vérification bcrypt"""
+    user = db.query(User).filter(User.username == username).first()
+    if user is not None:
+        db.expunge(user)
+    db.rollback()
+    return user
+
 @router.post("/login", response_model=LoginResponse)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
-    """Connexion admin"""
-    user = db.query(User).filter(User.username == login_data.username).first()
+async def login(login_data: LoginRequest, request: Request, db: Session = Depends(get_db)):
+    """Connexion admin (bcrypt sur le pool dédié de login_guard, pas dans le threadpool partagé)"""
+    client_ip = request.client.host if request.client else "unknown"
+    login_guard.check(login_data.username, client_ip)
+
+    user = await run_in_threadpool(_find_user, db, login_data.username)
     
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not user or not await login_guard.verify_password(login_data.password, user.hashed_password):
+        login_guard.record_failure(login_data.username, client_ip)
         logger.warning(f"Failed login attempt for username: {login_data.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,12 +57,21 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
             detail="Account is disabled"
         )
     
-    # Créer le token
+    # Créer le token et sa session (révocable via user_sessions)
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    jti = secrets.token_urlsafe(16)
     access_token = create_access_token(
-        data={"sub": user.username},
+        data={"sub": user.username, "jti": jti},
         expires_delta=access_token_expires
     )
+    user_response = UserResponse.from_orm(user)
+    try:
+        await run_in_threadpool(session_repo.create_session, db, user.id, jti, datetime.utcnow() + access_token_expires)
+    except SQLAlchemyError as e:
+        # user_sessions absente ou inaccessible : token émis, révocable seulement par le cache local
+        db.rollback()
+        logger.error(f"Session not recorded for {user.username}: {e}")
+    login_guard.record_success(login_data.username)
     
     logger.info(f"Successful login for user: {user.username}")
     
@@ -48,11 +79,100 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
         access_token=access_token,
         token_type="bearer",
         expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        user=UserResponse.from_orm(user)
+        user=user_response
     )
 
 @router.post("/logout")
-def logout(current_user: User = Depends(get_current_user)):
-    """Déconnexion"""
+def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Déconnexion : le token courant est révoqué"""
+    payload = verify_token(credentials.credentials)
+    jti = payload.get("jti")
+    if jti:
+        expires_at = datetime.utcfromtimestamp(payload["exp"])
+        revocation_cache.add([(jti, expires_at)])
+        try:
+            session_repo.revoke_token(db, current_user.id, jti, expires_at)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Revocation of {current_user.username}'s token not persisted: {e}")
     logger.info(f"User logged out: {current_user.username}")
-    return {"message": "Successfully logged out"}
\ No newline at end of file
+    return {"message": "Successfully logged out"}
+
+def _set_password(db: Session, user_id: int, hashed_password: str):
+    """Nouveau hash et révocation de toutes les sessions de l'utilisateur, en une transaction"""
+    db.execute(update(User).where(User.id == user_id).values(hashed_password=hashed_password))
+    revoked = session_repo.revoke_user_sessions(db, user_id)
+    db.commit()
+    return revoked
+
+@router.post("/change-password")
+async def change_password(
+    payload: ChangePasswordRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Changement de mot de passe : tous les tokens de l'utilisateur sont révoqués"""
+    if not await login_guard.verify_password(payload.current_password, current_user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Incorrect current password"
+        )
+    hashed_password = await run_in_threadpool(get_password_hash, payload.new_password)
+    revoked = await run_in_threadpool(_set_password, db, current_user.id, hashed_password)
+    revocation_cache.add(revoked)
+    logger.info(f"Password changed for {current_user.username}, {len(revoked)} session(s) revoked")
+    return {"message": "Password changed", "revoked": len(revoked)}
+
+# ------------------------------------------------------------------
+# Sessions (ADMIN)
+# ------------------------------------------------------------------
+@router.get("/sessions")
+def list_sessions(
+    user_id: Optional[int] = None,
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Sessions actives (tokens non expirés, non révoqués) (ADMIN SEULEMENT)"""
+    sessions = session_repo.active_sessions(db, user_id)
+    return {
+        "sessions": [
+            {
+                "id": s.id,
+                "user_id": s.user_id,
+                "created_at": s.created_at,
+                "expires_at": s.expires_at,
+            }
+            for s in sessions
+        ],
+        "revocation": revocation_cache.snapshot(),
+    }
+
+@router.delete("/sessions/{session_id}")
+def revoke_session(
+    session_id: int,
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Révoquer une session (ADMIN SEULEMENT)"""
+    revoked = session_repo.revoke_session(db, session_id)
+    if not revoked:
+        raise HTTPException(status_code=404, detail="Active session not found")
+    revocation_cache.add(revoked)
+    logger.info(f"Session {session_id} revoked by {current_user.username}")
+    return {"revoked": len(revoked)}
+
+@router.delete("/users/{user_id}/sessions")
+def revoke_user_sessions(
+    user_id: int,
+    current_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Révoquer toutes les sessions d'un utilisateur (ADMIN SEULEMENT)"""
+    revoked = session_repo.revoke_user_sessions(db, user_id)
+    revocation_cache.add(revoked)
+    logger.info(f"{len(revoked)} session(s) of user {user_id} revoked by {current_user.username}")
+    return {"revoked": len(revoked)}
\ No newline at end of file
@@ -1,11 +1,19 @@
 # Server/app/api/endpoints/covid.py - VERSION SÉCURISÉE
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from app.db.database import get_db
-from app.schemas.covid import GlobalStats, CountrySummary
+from app.db.replica import get_read_db
+from app.core.http_cache import covid_validators
+from app.core.responses import FastJSONResponse
+from app.schemas.covid import GlobalStats, CountrySummary, CountrySeries
 from app.db.repositories.covid_repo import (
     get_global_stats,
     get_countries_summary,
+    get_country_series,
+    SERIES_METRICS,
+    SUMMARY_SORT_FIELDS,
 )
 from app.core.deps import get_current_user  # ✅ Ajouter l'authentification
 from app.db.models.user import User
@@ -16,18 +24,62 @@ logger = logging.getLogger(__name__)
 
 @router.get("/global", response_model=GlobalStats)
 def read_global_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # ✅ AUTHENTIFICATION REQUISE
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),  # ✅ AUTHENTIFICATION REQUISE
+    cache_headers: dict = Depends(covid_validators)   # 304 si le client est à jour
 ):
     """Obtenir les statistiques globales COVID (ADMIN SEULEMENT)"""
     logger.info(f"Global stats requested by {current_user.username}")
+    response.headers.update(cache_headers)
     return get_global_stats(db)
 
 @router.get("/countries/summary", response_model=list[CountrySummary])
 def read_countries_summary(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # ✅ AUTHENTIFICATION REQUISE
+    sort: Literal[tuple(SUMMARY_SORT_FIELDS)] = Query("country", description="Champ de tri"),
+    order: Literal["asc", "desc"] = Query("asc"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Taille de page (toutes les lignes si absent)"),
+    cursor: Optional[str] = Query(None, description="En-tête X-Next-Cursor de la page précédente"),
+    q: Optional[str] = Query(None, max_length=100, description="Préfixe du nom de pays"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),  # ✅ AUTHENTIFICATION REQUISE
+    cache_headers: dict = Depends(covid_validators)
 ):
-    """Obtenir le résumé des pays (ADMIN SEULEMENT)"""
+    """Obtenir le résumé des pays, paginé par curseur (ADMIN SEULEMENT)"""
     logger.info(f"Countries summary requested by {current_user.username}")
-    return get_countries_summary(db)
\ No newline at end of file
+    try:
+        rows, next_cursor, total = get_countries_summary(db, sort, order, limit, cursor, q)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return FastJSONResponse(rows, headers={**cache_headers, **page_headers(next_cursor, total)})
+
+
+@router.get("/countries/{cid}/series", response_model=CountrySeries)
+def read_country_series(
+    cid: str,
+    metrics: List[Literal[tuple(SERIES_METRICS)]] = Query(["cases"], description="Métriques (répétable)"),
+    start: Optional[date] = Query(None, description="Premier jour inclus (AAAA-MM-JJ)"),
+    end: Optional[date] = Query(None, description="Dernier jour inclus (AAAA-MM-JJ)"),
+    points: Optional[int] = Query(None, ge=3, le=5000, description="Nombre maximal de points par métrique (LTTB)"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),  # ✅ AUTHENTIFICATION REQUISE
+    cache_headers: dict = Depends(covid_validators)
+):
+    """Obtenir l'historique d'un pays, réduit côté serveur si `points` est donné (ADMIN SEULEMENT)"""
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    logger.info(f"Series for {cid} requested by {current_user.username}")
+    series = get_country_series(db, cid, list(dict.fromkeys(metrics)), start, end, points)
+    if series is None:
+        raise HTTPException(status_code=404, detail="Country not found")
+    return FastJSONResponse(series, headers=cache_headers)
+
+
+def page_headers(next_cursor: Optional[str], total: int) -> dict:
+    """Pagination dans les en-têtes : le corps reste la liste attendue par le client"""
+    headers = {"X-Total-Count": str(total)}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return headers
@@ -0,0 +1,45 @@
+# Server/app/api/endpoints/export.py - EXPORT EN FLUX (ADMIN)
+from datetime import date
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.deps import get_admin_user
+from app.data.export import iter_partitions, stream_csv, stream_parquet
+from app.db.models.user import User
+from app.db.replica import client_version
+import logging
+
+router = APIRouter(prefix="/covid", tags=["export"])
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+@router.get("/export")
+def export_covid_stats(
+    request: Request,
+    format: Literal["csv", "parquet"] = Query("csv"),
+    country: Optional[List[str]] = Query(None, description="Identifiants de pays (répétable)"),
+    start: Optional[date] = Query(None, description="Premier jour inclus (AAAA-MM-JJ)"),
+    end: Optional[date] = Query(None, description="Dernier jour inclus (AAAA-MM-JJ)"),
+    current_user: User = Depends(get_admin_user)
+):
+    """Exporter covid_stats en flux, mémoire constante (ADMIN SEULEMENT)"""
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    logger.info(f"covid_stats {format} export requested by {current_user.username}")
+    # réplica, sauf s'il n'a pas encore rejoint les écritures de ce client
+    partitions = iter_partitions(country, start, end, min_version=client_version(request))
+    body = stream_csv(partitions) if format == "csv" else stream_parquet(partitions)
+    filename = f"covid_stats_{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,112 @@
+# Server/app/api/endpoints/jobs.py - JOBS DE MONITORING (ADMIN)
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.deps import get_admin_user
+from app.db.database import get_db
+from app.db.models.user import User
+from app.db.repositories import job_repo
+from app.monitoring import paths
+from app.monitoring.paths import BATCH_DIR, MODEL_KINDS, REPORT_DIR, STORE_BATCH
+from app.schemas.jobs import JobSubmit, JobOut
+import logging
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+logger = logging.getLogger(__name__)
+
+
+def _batch_file(name: str) -> str:
+    # Seuls les fichiers de Server/batches sont acceptés
+    batch_path = (BATCH_DIR / name).resolve()
+    if batch_path.parent != BATCH_DIR.resolve() or not batch_path.is_file():
+        raise HTTPException(status_code=400, detail="Unknown batch file")
+    return str(batch_path)
+
+
+def _get_job_or_404(db: Session, job_id: int):
+    job = job_repo.get_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
+def submit_job(
+    payload: JobSubmit,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Mettre en file un job de monitoring (ADMIN SEULEMENT)"""
+    # échec certain à chaque tentative sans le modèle : refus immédiat
+    if payload.kind in MODEL_KINDS and not paths.model_available():
+        raise HTTPException(status_code=409, detail=f"Monitoring model not available: {paths.MODEL_PATH.name}")
+    params = {}
+    if payload.batch and payload.kind in ("monitoring", "drift", "report"):
+        store, _, day = payload.batch.partition(":")
+        if store == STORE_BATCH:
+            # features de covid_features, d'un jour donné ou du dernier calculé
+            try:
+                if day:
+                    date.fromisoformat(day)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid store batch date")
+            params["batch"] = payload.batch
+        else:
+            params["batch"] = _batch_file(payload.batch)
+    if payload.rmse_threshold is not None and payload.kind in ("monitoring", "report"):
+        params["rmse_threshold"] = payload.rmse_threshold
+
+    job = job_repo.create_job(
+        db,
+        payload.kind,
+        params,
+        submitted_by=current_user.username,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        timeout_seconds=settings.JOB_TIMEOUT_SECONDS,
+    )
+    logger.info(f"Job {job.id} ({job.kind}) submitted by {current_user.username}")
+    return job
+
+
+@router.get("", response_model=list[JobOut])
+def read_jobs(
+    kind: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Lister les derniers jobs (ADMIN SEULEMENT)"""
+    return job_repo.list_jobs(db, limit=limit, kind=kind)
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def read_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Statut et résultat d'un job (ADMIN SEULEMENT)"""
+    return _get_job_or_404(db, job_id)
+
+
+@router.get("/{job_id}/artifacts/{name}")
+def read_job_artifact(
+    job_id: int,
+    name: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Télécharger un artefact (rapport HTML, metrics.csv) d'un job (ADMIN SEULEMENT)"""
+    job = _get_job_or_404(db, job_id)
+    artifacts = (job.result or {}).get("artifacts", [])
+    if name not in artifacts:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+
+    path = REPORT_DIR / name
+    if not path.is_file():
+        raise HTTPException(status_code=410, detail="Artifact no longer available")
+    return FileResponse(path, filename=name)
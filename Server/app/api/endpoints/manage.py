@@ -1,35 +1,90 @@
 # Server/app/api/endpoints/manage.py - VERSION SÉCURISÉE
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
-from app.schemas.manage import CountryManage
+from app.db.replica import get_read_db, get_write_db
+from app.schemas.manage import CountryManage, CountryBatchUpdate, CountryBatchDelete
+from app.api.endpoints.covid import page_headers
+from app.core.http_cache import covid_validators
+from app.core.responses import FastJSONResponse
 from app.db.repositories.manage_repo import (
+    MANAGE_SORT_FIELDS,
     list_country_totals,
     update_country_totals,
+    update_many_country_totals,
     delete_country,
+    delete_countries,
 )
 from app.core.deps import get_current_user  # ✅ Authentification
+from app.analytics.memory import memory_engine
+from app.analytics.duckdb_backend import duckdb_analytics
 from app.db.models.user import User
 import logging
 
 router = APIRouter(prefix="/covid/countries", tags=["manage"])
 logger = logging.getLogger(__name__)
 
+
+def _notify_analytics() -> None:
+    # moteurs /analytics non SQL : rattraper l'écriture sans attendre leur période
+    memory_engine.notify()
+    duckdb_analytics.notify()
+
+
 @router.get("/manage", response_model=list[CountryManage])
 def read_all(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  # ✅ AUTHENTIFICATION REQUISE
+    sort: Literal[tuple(MANAGE_SORT_FIELDS)] = Query("country", description="Champ de tri"),
+    order: Literal["asc", "desc"] = Query("asc"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Taille de page (toutes les lignes si absent)"),
+    cursor: Optional[str] = Query(None, description="En-tête X-Next-Cursor de la page précédente"),
+    q: Optional[str] = Query(None, max_length=100, description="Préfixe du nom de pays"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),  # ✅ AUTHENTIFICATION REQUISE
+    cache_headers: dict = Depends(covid_validators)
 ):
-    """Lister tous les pays (ADMIN SEULEMENT)"""
+    """Lister les pays, paginé par curseur (ADMIN SEULEMENT)"""
     logger.info(f"Country management list requested by {current_user.username}")
-    return list_country_totals(db)
+    try:
+        rows, next_cursor, total = list_country_totals(db, sort, order, limit, cursor, q)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return FastJSONResponse(rows, headers={**cache_headers, **page_headers(next_cursor, total)})
+
+@router.put("/manage", response_model=list[CountryManage])
+def put_countries(
+    payload: CountryBatchUpdate,
+    db: Session = Depends(get_write_db),
+    current_user: User = Depends(get_current_user)  # ✅ AUTHENTIFICATION REQUISE
+):
+    """Mettre à jour plusieurs pays en une transaction (ADMIN SEULEMENT)"""
+    ids = [item.id.lower() for item in payload.countries]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Duplicate country IDs in batch")
+
+    logger.info(f"{len(ids)} countries updated by {current_user.username}")
+    result = update_many_country_totals(db, payload.countries)
+    _notify_analytics()
+    return result
+
+@router.delete("/manage", status_code=status.HTTP_204_NO_CONTENT)
+def remove_countries(
+    payload: CountryBatchDelete,
+    db: Session = Depends(get_write_db),
+    current_user: User = Depends(get_current_user)  # ✅ AUTHENTIFICATION REQUISE
+):
+    """Supprimer plusieurs pays en une transaction (ADMIN SEULEMENT)"""
+    logger.warning(f"Countries {', '.join(payload.ids)} deleted by {current_user.username}")
+    delete_countries(db, payload.ids)
+    _notify_analytics()
 
 @router.put("/{cid}", response_model=CountryManage)
 def put_country(
     cid: str, 
     payload: CountryManage, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     current_user: User = Depends(get_current_user)  # ✅ AUTHENTIFICATION REQUISE
 ):
     """Mettre à jour un pays (ADMIN SEULEMENT)"""
@@ -37,14 +92,17 @@ def put_country(
         raise HTTPException(status_code=400, detail="ID mismatch")
     
     logger.info(f"Country {cid} updated by {current_user.username}")
-    return update_country_totals(db, cid, payload)
+    result = update_country_totals(db, cid, payload)
+    _notify_analytics()
+    return result
 
 @router.delete("/{cid}", status_code=status.HTTP_204_NO_CONTENT)
 def remove_country(
     cid: str, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     current_user: User = Depends(get_current_user)  # ✅ AUTHENTIFICATION REQUISE
 ):
     """Supprimer un pays (ADMIN SEULEMENT)"""
     logger.warning(f"Country {cid} deleted by {current_user.username}")
-    delete_country(db, cid)
\ No newline at end of file
+    delete_country(db, cid)
+    _notify_analytics()
\ No newline at end of file
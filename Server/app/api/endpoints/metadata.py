@@ -1,10 +1,15 @@
 # Server/app/api/endpoints/metadata.py - VERSION COMPLÈTEMENT SÉCURISÉE
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer
 from app.core.deps import get_current_user
+from app.core import instrumentation
+from app.core.http_cache import etag_matches
 from app.db.models.user import User
-import pandas as pd
+import hashlib
+import json
 import os
+import threading
 import logging
 
 # ✅ Sécurité HTTPBearer obligatoire
@@ -23,40 +28,71 @@ def validate_admin_user(current_user: User):
     if not current_user.is_active:
         raise HTTPException(status_code=403, detail="Account is disabled")
 
+# -------- INDEX RÉGION → PAYS (construit une fois, reconstruit si le CSV change) ------
+CSV_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "data_cleaned_used.csv")
+
+_index_lock = threading.Lock()
+_index = {"signature": None, "payload": None, "etag": None}
+
+def _file_signature(path: str):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+def _build_index(path: str) -> dict:
+    """Une seule passe sur le CSV : couples (région, pays) dédoublonnés puis groupés"""
+    from app.data.columnar import read_frame    # pandas chargé au premier build (lifespan)
+
+    df = read_frame(path, columns=["Country", "WHO Region"])
+    pairs = df.dropna(subset=["Country", "WHO Region"]).drop_duplicates()
+
+    region_country_map = {
+        region: sorted(countries.tolist())
+        for region, countries in pairs.groupby("WHO Region")["Country"]
+    }
+    regions = sorted(region_country_map)
+    return {
+        "who_regions": regions,
+        "countries_by_region": {region: region_country_map[region] for region in regions}
+    }
+
+def get_metadata_index() -> tuple[dict, str]:
+    """Retourne (payload, etag) ; ne relit le CSV que si mtime/taille ont changé"""
+    if not os.path.exists(CSV_PATH):
+        logger.error(f"Data file not found: {CSV_PATH}")
+        raise HTTPException(status_code=500, detail="Data file not found")
+
+    signature = _file_signature(CSV_PATH)
+    instrumentation.cache_hit("metadata_index", _index["signature"] == signature)
+    if _index["signature"] != signature:
+        with _index_lock:
+            if _index["signature"] != signature:
+                payload = _build_index(CSV_PATH)
+                body = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+                _index["payload"] = payload
+                _index["etag"] = f'"{hashlib.sha1(body).hexdigest()}"'
+                _index["signature"] = signature
+                logger.info(
+                    f"Metadata index built: {len(payload['who_regions'])} regions, "
+                    f"{sum(len(c) for c in payload['countries_by_region'].values())} countries"
+                )
+    return _index["payload"], _index["etag"]
+
 @router.get("/metadata", dependencies=[Depends(security)])
-def get_metadata(current_user: User = Depends(get_current_user)):
+def get_metadata(request: Request, current_user: User = Depends(get_current_user)):
     """Obtenir les métadonnées pour les prédictions - ADMIN SEULEMENT"""
     validate_admin_user(current_user)
     
-    logger.info(f"Metadata requested by admin {current_user.username}")
-    
     try:
-        csv_path = os.path.join("app", "data", "data_cleaned_used.csv")
-        
-        if not os.path.exists(csv_path):
-            logger.error(f"Data file not found: {csv_path}")
-            raise HTTPException(status_code=500, detail="Data file not found")
-        
-        df = pd.read_csv(csv_path)
-
-        # Nettoyage des données
-        df = df.dropna(subset=["Country", "WHO Region"])
-            
-        regions = sorted(df["WHO Region"].unique().tolist())
-
-        # Mapping région -> [pays...]
-        region_country_map = {}
-        for region in regions:
-            countries = df[df["WHO Region"] == region]["Country"].unique().tolist()
-            region_country_map[region] = sorted(countries)
-
-        logger.info(f"Metadata delivered to admin {current_user.username}: {len(regions)} regions, {sum(len(countries) for countries in region_country_map.values())} countries")
-        
-        return {
-            "who_regions": regions,
-            "countries_by_region": region_country_map
-        }
-        
+        payload, etag = get_metadata_index()
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error loading metadata for admin {current_user.username}: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to load metadata")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to load metadata")
+
+    # Réponse privée (authentifiée) mais revalidable : 304 si le client est à jour
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(payload, headers=headers)
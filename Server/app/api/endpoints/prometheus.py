@@ -0,0 +1,24 @@
+# Server/app/api/endpoints/prometheus.py - MÉTRIQUES D'EXÉCUTION (FORMAT PROMETHEUS)
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from app.core import instrumentation
+from app.core.config import settings
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+def read_prometheus_metrics(request: Request):
+    """Latences HTTP/SQL, pool, modèle et caches, tous workers confondus (jeton METRICS_TOKEN exigé)"""
+    if not settings.METRICS_TOKEN:
+        # pas de jeton configuré : rien n'est exposé (l'API est réservée aux admins)
+        raise HTTPException(status_code=403, detail="Metrics token not configured")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token, settings.METRICS_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(instrumentation.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,44 @@
+# Server/app/api/endpoints/queries.py - PROFIL DES REQUÊTES SQL (ADMIN)
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.core.config import settings
+from app.core.deps import get_admin_user
+from app.core.query_profiler import query_profiler
+from app.core.responses import FastJSONResponse
+from app.db.replica import replica_router
+from app.db.models.user import User
+import logging
+
+router = APIRouter(prefix="/db", tags=["profiling"])
+logger = logging.getLogger(__name__)
+
+
+@router.get("/queries")
+def read_query_profile(
+    sort: Literal["total", "p95", "max", "mean", "count"] = Query("total", description="Critère de classement"),
+    limit: int = Query(20, ge=1, le=200),
+    explain: bool = Query(True, description="Plan d'exécution des échantillons lents"),
+    current_user: User = Depends(get_admin_user)
+):
+    """Empreintes SQL de ce worker : nombre, total, p95, max, routes, échantillons lents (ADMIN SEULEMENT)"""
+    return FastJSONResponse({
+        "enabled": settings.QUERY_PROFILER_ENABLED,
+        "slow_query_ms": settings.SLOW_QUERY_MS,
+        "dropped": query_profiler.dropped,
+        "queries": query_profiler.report(sort, limit, explain),
+    })
+
+
+@router.delete("/queries", status_code=status.HTTP_204_NO_CONTENT)
+def reset_query_profile(current_user: User = Depends(get_admin_user)):
+    """Remettre le profil à zéro, par exemple avant une mesure (ADMIN SEULEMENT)"""
+    query_profiler.reset()
+    logger.info(f"Query profile reset by {current_user.username}")
+
+
+@router.get("/replica")
+def read_replica_state(current_user: User = Depends(get_admin_user)):
+    """Réplica en lecture de ce worker : disponibilité, utilisateurs épinglés, sessions par cible (ADMIN SEULEMENT)"""
+    return replica_router.snapshot()
@@ -1,20 +1,45 @@
 # Server/app/api/predict.py - VERSION COMPLÈTEMENT SÉCURISÉE
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.security import HTTPBearer
-from app.schemas.prediction import InputRow, PredictionOut
+from sqlalchemy.orm import Session
+from app.schemas.prediction import InputRow, PredictionOut, ModelQuality
+from app.core.config import settings
+from app.core.load_model import get_model, is_loaded
+from app.core.instrumentation import MODEL_INFERENCE_SECONDS
 from app.core.deps import get_current_user
+from app.db.database import get_db
 from app.db.models.user import User
-import pickle
-import os
-import pandas as pd
+from app.db.repositories.quality_repo import rolling_rmse
+from app.monitoring.prediction_log import prediction_log
+from datetime import timezone
+import math
+import time
 
 # ✅ Sécurité HTTPBearer obligatoire
 security = HTTPBearer()
 router = APIRouter()
 
-MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'models', 'pipeline.pkl')
-with open(MODEL_PATH, 'rb') as f:
-    model = pickle.load(f)
+def _target_ts(input: InputRow) -> int:
+    """Minuit UTC du jour prédit, en ms (unité de covid_stats.date_timestamp)"""
+    d = input.date.astimezone(timezone.utc) if input.date.tzinfo else input.date
+    return int(d.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc).timestamp() * 1000)
+
+def input_frame(input: InputRow):
+    """Ligne d'entrée du modèle (aussi mesurée par perf/microbench.py)"""
+    import pandas as pd     # déjà chargé par le modèle ; absent du démarrage de l'API
+
+    # ⚠️ Utilise exactement les mêmes noms de colonnes qu'à l'entraînement
+    return pd.DataFrame([{
+        "Confirmed": input.Confirmed,
+        "Deaths": input.Deaths,
+        "Recovered": input.Recovered,
+        "Active": input.Active,
+        "New cases": input.New_cases,
+        "New recovered": input.New_recovered,
+        "timestamp": input.date.timestamp(),
+        "Country": input.Country,
+        "WHO Region": input.WHO_Region
+    }])
 
 @router.post("/predict", response_model=PredictionOut, dependencies=[Depends(security)])
 def predict(
@@ -32,27 +57,31 @@ def predict(
         raise HTTPException(status_code=403, detail="Admin access required")
     
     try:
-        timestamp = input.date.timestamp()
-
-        # ⚠️ Utilise exactement les mêmes noms de colonnes qu'à l'entraînement
-        input_data = pd.DataFrame([{
-            "Confirmed": input.Confirmed,
-            "Deaths": input.Deaths,
-            "Recovered": input.Recovered,
-            "Active": input.Active,
-            "New cases": input.New_cases,
-            "New recovered": input.New_recovered,
-            "timestamp": timestamp,
-            "Country": input.Country,
-            "WHO Region": input.WHO_Region
-        }])
+        model, model_version = get_model()
+        input_data = input_frame(input)
 
+        start = time.perf_counter()
         pred = model.predict(input_data)[0]
-        return {"pred_new_deaths": int(round(pred))}
+        MODEL_INFERENCE_SECONDS.observe(time.perf_counter() - start, model_version)
+        pred_new_deaths = int(round(pred))
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+    # Journalisation asynchrone pour le suivi de la qualité en production
+    if settings.PREDICTION_LOG_ENABLED:
+        prediction_log.record(
+            country=input.Country,
+            who_region=input.WHO_Region,
+            target_ts=_target_ts(input),
+            pred_new_deaths=float(pred),
+            model_version=model_version,
+            features=input.model_dump(mode="json"),
+            username=current_user.username,
+        )
+
+    return {"pred_new_deaths": pred_new_deaths}
+
 @router.get("/predict/health", dependencies=[Depends(security)])
 def health_check(current_user: User = Depends(get_current_user)):
     """Vérification santé du modèle - ADMIN SEULEMENT"""
@@ -64,7 +93,39 @@ def health_check(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=403, detail="Admin access required")
     
     return {
-        "model_loaded": True,
+        "model_loaded": is_loaded(),
+        "model_version": get_model()[1] if is_loaded() else None,
         "status": "healthy",
-        "user": current_user.username
+        "user": current_user.username,
+        "prediction_log": prediction_log.stats()
+    }
+
+@router.get("/predict/quality", response_model=ModelQuality, dependencies=[Depends(security)])
+def model_quality(
+    days: int = Query(14, ge=1, le=365),
+    country: str | None = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """RMSE glissante des prédictions servies vs réels - ADMIN SEULEMENT"""
+    
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    by_country = rolling_rmse(db, days=days, country=country)
+
+    # Agrégat par version : RMSE globale pondérée par le nombre de points
+    by_model = {}
+    for row in by_country:
+        acc = by_model.setdefault(row["model_version"], [0, 0.0])
+        acc[0] += row["n"]
+        acc[1] += row["rmse"] ** 2 * row["n"]
+
+    return {
+        "days": days,
+        "by_model": [
+            {"model_version": version, "n": n, "rmse": round(math.sqrt(sq / n), 4)}
+            for version, (n, sq) in by_model.items()
+        ],
+        "by_country": by_country
     }
\ No newline at end of file
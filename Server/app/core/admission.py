@@ -0,0 +1,219 @@
+"""
+admission.py — contrôle d'admission des routes coûteuses (ASGI pur)
+  • groupes de routes : predict (POST /predict), analytics (/analytics/*),
+    manage (/covid/countries/manage et écritures sur /covid/countries/{id})
+  • seau de jetons par utilisateur et par groupe (sub du JWT, IP à défaut) :
+    429 + Retry-After quand le seau est vide
+  • nombre maximal de requêtes en cours par groupe et file d'attente bornée :
+    503 + Retry-After si la file est pleine ou l'attente trop longue
+  • l'attente se fait sur la boucle asyncio : ni thread du threadpool ni
+    connexion du pool SQL n'est prise avant l'admission
+  • limites par worker (gunicorn) ; compteurs lisibles via snapshot()
+"""
+
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Optional
+
+from app.core import instrumentation
+from app.core.config import settings
+from app.core.security import token_subject
+
+API_PREFIX = settings.API_V1_STR
+MAX_BUCKETS = 10000
+
+
+def route_group(method: str, path: str) -> Optional[str]:
+    if not path.startswith(API_PREFIX):
+        return None
+    path = path[len(API_PREFIX):]
+    if path == "/predict" and method == "POST":
+        return "predict"
+    if path.startswith("/analytics/"):
+        return "analytics"
+    if path.startswith("/covid/countries/manage") or (
+        method in ("PUT", "DELETE") and path.startswith("/covid/countries/")
+    ):
+        return "manage"
+    return None
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """0 si un jeton est pris, sinon secondes avant le prochain jeton"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else float(settings.ADMISSION_RETRY_AFTER)
+
+    def idle(self, now: float) -> bool:
+        """Seau plein de nouveau : il peut être oublié sans changer le comportement"""
+        return self.tokens + (now - self.updated) * self.rate >= self.burst
+
+
+class AdmissionGate:
+    """Requêtes en cours d'un groupe, et file FIFO des requêtes en attente d'une place"""
+
+    def __init__(self, name: str, rate: float, burst: int, in_flight: int, queue: int):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = in_flight
+        self.max_queue = queue
+        self.in_flight = 0
+        self.waiters = deque()
+        self.buckets = {}
+        self.counters = {"admitted": 0, "queued": 0, "rejected_rate": 0, "rejected_queue_full": 0, "rejected_timeout": 0}
+
+    def take_token(self, user: str) -> float:
+        bucket = self.buckets.get(user)
+        if bucket is None:
+            if len(self.buckets) >= MAX_BUCKETS:
+                now = time.monotonic()
+                self.buckets = {k: b for k, b in self.buckets.items() if not b.idle(now)}
+            bucket = self.buckets[user] = TokenBucket(self.rate, self.burst)
+        return bucket.take()
+
+    async def acquire(self, timeout: float) -> Optional[str]:
+        """None si admis, sinon le motif du refus ("queue_full" ou "timeout")"""
+        if self.in_flight < self.max_in_flight and not self.waiters:
+            self.in_flight += 1
+            self.counters["admitted"] += 1
+            return None
+        if len(self.waiters) >= self.max_queue:
+            self.counters["rejected_queue_full"] += 1
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.counters["queued"] += 1
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            self._forget(waiter)
+            self.counters["rejected_timeout"] += 1
+            return "timeout"
+        except asyncio.CancelledError:
+            # client parti : rendre la place si elle venait d'être transmise
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._forget(waiter)
+            raise
+        self.counters["admitted"] += 1
+        return None
+
+    def release(self) -> None:
+        # la place passe directement au premier en attente (in_flight inchangé)
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _forget(self, waiter) -> None:
+        try:
+            self.waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def snapshot(self) -> dict:
+        return {
+            "limits": {"rate": self.rate, "burst": self.burst, "in_flight": self.max_in_flight, "queue": self.max_queue},
+            "in_flight": self.in_flight,
+            "waiting": len(self.waiters),
+            "users": len(self.buckets),
+            **self.counters,
+        }
+
+
+gates = {name: AdmissionGate(name, **limits) for name, limits in settings.ADMISSION_GROUPS.items()}
+
+
+def snapshot() -> dict:
+    return {name: gate.snapshot() for name, gate in gates.items()}
+
+
+def _admission_samples() -> list:
+    samples = []
+    for name, gate in gates.items():
+        group = {"group": name}
+        samples.append(("admission_in_flight", "gauge", "Requêtes admises en cours", group, gate.in_flight))
+        samples.append(("admission_waiting", "gauge", "Requêtes en file d'attente", group, len(gate.waiters)))
+        for result, count in gate.counters.items():
+            samples.append(("admission_requests_total", "counter", "Décisions d'admission",
+                            {**group, "result": result}, count))
+    return samples
+
+
+instrumentation.COLLECTORS.append(_admission_samples)
+
+
+def _user_key(scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer":
+                sub = token_subject(token)
+                if sub:
+                    return f"user:{sub}"
+            break
+    # jeton absent ou invalide : la route répondra 401, le seau est celui de l'IP
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+async def _reject(send, status: int, detail: str, retry_after: float) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        group = route_group(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        gate = gates.get(group)
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        wait = gate.take_token(_user_key(scope))
+        if wait > 0:
+            gate.counters["rejected_rate"] += 1
+            await _reject(send, 429, f"Too many {group} requests", wait)
+            return
+
+        refused = await gate.acquire(settings.ADMISSION_QUEUE_TIMEOUT)
+        if refused is not None:
+            await _reject(send, 503, f"Server busy ({group} {refused})", settings.ADMISSION_RETRY_AFTER)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
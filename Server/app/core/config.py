@@ -14,4 +14,78 @@ class Settings:
     
     DATABASE_URL: str = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+    # Jobs de monitoring (app/monitoring/runner.py)
+    JOBS_ENABLED: bool = os.getenv("JOBS_ENABLED", "true").lower() == "true"
+    JOBS_WORKERS: int = int(os.getenv("JOBS_WORKERS", "1"))
+    JOBS_POLL_SECONDS: float = float(os.getenv("JOBS_POLL_SECONDS", "10"))
+    JOBS_DAILY_HOUR: int = int(os.getenv("JOBS_DAILY_HOUR", "6"))  # UTC
+    JOBS_DAILY_KINDS: list = [k for k in os.getenv("JOBS_DAILY_KINDS", "monitoring,report").split(",") if k]
+    JOB_TIMEOUT_SECONDS: int = int(os.getenv("JOB_TIMEOUT_SECONDS", "900"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+    # Journal des prédictions servies (app/monitoring/prediction_log.py)
+    PREDICTION_LOG_ENABLED: bool = os.getenv("PREDICTION_LOG_ENABLED", "true").lower() == "true"
+    PREDICTION_LOG_BATCH: int = int(os.getenv("PREDICTION_LOG_BATCH", "500"))
+    PREDICTION_LOG_FLUSH_SECONDS: float = float(os.getenv("PREDICTION_LOG_FLUSH_SECONDS", "5"))
+    PREDICTION_LOG_MAX_BUFFER: int = int(os.getenv("PREDICTION_LOG_MAX_BUFFER", "50000"))
+
+    # Modèle chargé au démarrage (lifespan / maître gunicorn) plutôt qu'au premier /predict
+    MODEL_PRELOAD: bool = os.getenv("MODEL_PRELOAD", "true").lower() == "true"
+
+    # Moteur des endpoints /analytics : "sql", "memory" ou "duckdb" (app/analytics/backend.py)
+    ANALYTICS_ENGINE: str = os.getenv("ANALYTICS_ENGINE", "sql").lower()
+    ANALYTICS_REFRESH_SECONDS: float = float(os.getenv("ANALYTICS_REFRESH_SECONDS", "5"))
+    ANALYTICS_PARQUET_PATH: str = os.getenv(
+        "ANALYTICS_PARQUET_PATH",
+        os.path.join(os.path.dirname(__file__), "..", "data", "exports", "covid_stats.parquet"),
+    )
+
+    # Réponses JSON/texte compressées (gzip, brotli si installé) au-delà de cette taille en octets
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+    # Contrôle d'admission par groupe de routes (app/core/admission.py)
+    # rate/burst : seau de jetons par utilisateur ; in_flight/queue : par worker
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_QUEUE_TIMEOUT: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2"))
+    ADMISSION_RETRY_AFTER: int = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+    ADMISSION_GROUPS: dict = {
+        group: {
+            "rate": float(os.getenv(f"ADMISSION_{group.upper()}_RATE", rate)),
+            "burst": int(os.getenv(f"ADMISSION_{group.upper()}_BURST", burst)),
+            "in_flight": int(os.getenv(f"ADMISSION_{group.upper()}_IN_FLIGHT", in_flight)),
+            "queue": int(os.getenv(f"ADMISSION_{group.upper()}_QUEUE", queue)),
+        }
+        for group, (rate, burst, in_flight, queue) in {
+            "predict": ("5", "20", "8", "32"),
+            "analytics": ("10", "30", "8", "32"),
+            "manage": ("2", "10", "2", "8"),
+        }.items()
+    }
+
+    # Métriques Prometheus (GET /metrics, app/core/instrumentation.py)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")            # jeton Bearer exigé ; vide : /metrics refusé
+    METRICS_DIR: str = os.getenv("METRICS_DIR", "")                # partagé entre workers gunicorn
+    METRICS_FLUSH_SECONDS: float = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
+    # Profil des requêtes SQL par empreinte (GET /db/queries, app/core/query_profiler.py)
+    QUERY_PROFILER_ENABLED: bool = os.getenv("QUERY_PROFILER_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+    QUERY_PROFILER_MAX_FINGERPRINTS: int = int(os.getenv("QUERY_PROFILER_MAX_FINGERPRINTS", "500"))
+
+    # Révocation des tokens (user_sessions, app/core/revocation.py) : délai max de propagation entre workers
+    REVOCATION_SYNC_SECONDS: float = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+
+    # /auth/login (app/core/login_guard.py) : pool bcrypt borné et refus après échecs répétés
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "1"))   # par worker ; 0 : threadpool partagé
+    PASSWORD_HASH_QUEUE: int = int(os.getenv("PASSWORD_HASH_QUEUE", "16"))
+    LOGIN_MAX_FAILURES_USER: int = int(os.getenv("LOGIN_MAX_FAILURES_USER", "5"))
+    LOGIN_MAX_FAILURES_IP: int = int(os.getenv("LOGIN_MAX_FAILURES_IP", "30"))
+    LOGIN_FAILURE_WINDOW: float = float(os.getenv("LOGIN_FAILURE_WINDOW", "300"))
+
+    # Réplica en lecture des GET covid / analytics / manage (app/db/replica.py) ; vide : primaire seul
+    REPLICA_DATABASE_URL: str = os.getenv("REPLICA_DATABASE_URL", "")
+    REPLICA_PIN_SECONDS: float = float(os.getenv("REPLICA_PIN_SECONDS", "60"))      # validité de la version renvoyée après écriture
+    REPLICA_RETRY_SECONDS: float = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))  # réplica écarté après échec
+
 settings = Settings()
\ No newline at end of file
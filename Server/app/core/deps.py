@@ -1,6 +1,8 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from app.core.revocation import revocation_cache
 from app.core.security import verify_token
 from app.db.database import get_db
 from app.db.models.user import User, UserRole
@@ -15,6 +17,13 @@ def get_current_user(
     """Obtenir l'utilisateur actuel à partir du token"""
     token = credentials.credentials
     payload = verify_token(token)
+
+    # Logout / révocation admin : contrôle en mémoire, sans requête SQL
+    if revocation_cache.is_revoked(payload.get("jti")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revoked"
+        )
     
     username = payload.get("sub")
     user = db.query(User).filter(User.username == username).first()
@@ -31,9 +40,14 @@ def get_current_user(
             detail="Inactive user"
         )
     
-    # Mettre à jour le dernier login
-    user.last_login = datetime.utcnow()
+    # Mettre à jour le dernier login ; l'utilisateur est détaché avant le commit :
+    # ses attributs restent chargés et la connexion retourne au pool dès maintenant
+    # (une route servie par le réplica ne garde pas de connexion au primaire)
+    now = datetime.utcnow()
+    db.expunge(user)
+    db.execute(update(User).where(User.id == user.id).values(last_login=now))
     db.commit()
+    user.last_login = now
     
     return user
 
@@ -0,0 +1,113 @@
+"""
+http_cache.py — requêtes conditionnelles (ETag / Last-Modified) des endpoints de données
+  • validateur dérivé d'une version bon marché : compteur covid_data_version
+    (une lecture par clé primaire), avancé par chaque commit d'écriture dans
+    l'ordre des commits ; jamais la requête principale
+  • dépendances FastAPI : exécutées avant l'endpoint, elles lèvent NotModified
+    (→ 304 dans main.py) si le client est à jour, sans toucher aux données
+  • If-None-Match prioritaire sur If-Modified-Since (RFC 9110 §13.2.2)
+  • réponses privées (authentifiées) mais revalidables : Cache-Control private, no-cache
+  • version lue dans la même session que les données (get_read_db) : un
+    réplica en retard ne sert jamais d'anciennes données sous un nouvel ETag
+"""
+
+from datetime import datetime, time, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Depends, Request
+from sqlalchemy.orm import Session
+
+from app.analytics.backend import get_analytics_backend
+from app.core import instrumentation
+from app.core.deps import get_admin_user, get_current_user
+from app.db.replica import get_read_db
+from app.db.models.user import User
+from app.db.repositories import change_repo
+
+
+class NotModified(Exception):
+    """Le client possède déjà la représentation courante (réponse 304)"""
+
+    def __init__(self, headers: dict):
+        self.headers = headers
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparaison faible : W/"x" et "x" désignent la même représentation"""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+
+def _as_utc(value: datetime) -> datetime:
+    # les DateTime relus de SQLite/MySQL sont naïfs mais écrits en UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _not_modified_since(if_modified_since: Optional[str], modified: Optional[datetime]) -> bool:
+    if not if_modified_since or modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # Last-Modified n'a qu'une précision à la seconde
+    return _as_utc(modified).replace(microsecond=0) <= _as_utc(since)
+
+
+def validator_headers(tag: str, modified: Optional[datetime]) -> dict:
+    headers = {"ETag": f'W/"{tag}"', "Cache-Control": "private, no-cache"}
+    if modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(modified), usegmt=True)
+    return headers
+
+
+def check_conditional(request: Request, tag: str, modified: Optional[datetime]) -> dict:
+    """En-têtes de validation à renvoyer, ou NotModified si le client est à jour"""
+    headers = validator_headers(tag, modified)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = etag_matches(if_none_match, headers["ETag"])
+    elif "if-modified-since" in request.headers:
+        fresh = _not_modified_since(request.headers["if-modified-since"], modified)
+    else:
+        return headers
+    instrumentation.cache_hit("http_conditional", fresh)
+    if fresh:
+        raise NotModified(headers)
+    return headers
+
+
+# ------------------------------------------------------------------
+# Dépendances des endpoints
+# ------------------------------------------------------------------
+def covid_validators(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> dict:
+    """/covid/* : la réponse ne dépend que de covid_stats, donc de la version de données"""
+    version, modified = change_repo.current_state(db)
+    return check_conditional(request, f"c{version}", modified)
+
+
+def analytics_validators(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_admin_user),
+) -> dict:
+    """
+    /analytics/* : version des données du moteur actif, plus le jour courant
+    (la fenêtre de /trend glisse chaque jour même sans nouvelle donnée).
+    """
+    version, modified = get_analytics_backend().data_state(db)
+    today = datetime.now(timezone.utc).date()
+    midnight = datetime.combine(today, time.min, tzinfo=timezone.utc)
+    modified = midnight if modified is None else max(_as_utc(modified), midnight)
+    return check_conditional(request, f"a{version}-{today.isoformat()}", modified)
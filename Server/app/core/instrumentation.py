@@ -0,0 +1,328 @@
+"""
+instrumentation.py — métriques d'exécution au format texte Prometheus (GET /metrics)
+  • HTTP : histogramme de latence et compteur de statuts par route (modèle de
+    chemin « /covid/countries/{cid}/series », jamais l'URL brute)
+  • SQL : latence par type d'instruction (événements before/after_cursor_execute)
+  • pool de connexions, admission, inférence du modèle, succès des caches
+  • coût d'une observation : un perf_counter, une bisection et un incrément
+    sous verrou ; le texte n'est produit qu'au moment du scrape
+  • plusieurs workers : avec METRICS_DIR, chaque worker dépose son état toutes
+    les METRICS_FLUSH_SECONDS ({pid}.json) ; /metrics dépose d'abord celui du
+    worker qui répond puis additionne les fichiers seuls (totaux monotones)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REGISTRY: Dict[str, "_Metric"] = {}
+COLLECTORS: List[Callable[[], List[tuple]]] = []
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.series = {}
+        self._lock = threading.Lock()
+        REGISTRY[name] = self
+
+    def state(self) -> list:
+        with self._lock:
+            return [[list(key), list(values)] for key, values in self.series.items()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            values = self.series.get(labels)
+            if values is None:
+                values = self.series[labels] = [0]
+            values[0] += amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...], buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels) -> None:
+        # compte par intervalle (non cumulé), +Inf en dernier, puis la somme
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            values = self.series.get(labels)
+            if values is None:
+                values = self.series[labels] = [0] * (len(self.buckets) + 2)
+            values[index] += 1
+            values[-1] += value
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Durée des requêtes HTTP", ("method", "route")
+)
+HTTP_RESPONSES = Counter(
+    "http_responses_total", "Réponses HTTP par statut", ("method", "route", "status")
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "Durée des instructions SQL", ("engine", "operation")
+)
+MODEL_INFERENCE_SECONDS = Histogram(
+    "model_inference_duration_seconds", "Durée de model.predict", ("model_version",)
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Accès aux caches applicatifs", ("cache", "result")
+)
+
+
+def cache_hit(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+
+# ------------------------------------------------------------------
+# HTTP : libellé de route
+# ------------------------------------------------------------------
+_route_paths = {}
+
+
+def route_label(scope) -> str:
+    """Modèle de chemin de la route servie (le routeur Starlette dépose `endpoint` dans le scope)"""
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    path = _route_paths.get(endpoint)
+    if path is None:
+        for route in getattr(scope.get("app"), "routes", ()):
+            if getattr(route, "endpoint", None) is not None:
+                _route_paths[route.endpoint] = route.path
+        path = _route_paths.setdefault(endpoint, "unmatched")
+    return path
+
+
+def observe_request(scope, status: int, seconds: float) -> None:
+    route = route_label(scope)
+    HTTP_REQUEST_SECONDS.observe(seconds, scope["method"], route)
+    HTTP_RESPONSES.inc(scope["method"], route, str(status))
+
+
+# ------------------------------------------------------------------
+# SQL : événements du moteur
+# ------------------------------------------------------------------
+_engines = {}
+
+
+def instrument_engine(engine, name: str = "primary") -> None:
+    if name in _engines:
+        return
+    _engines[name] = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is not None:
+            operation = statement.lstrip()[:6].lower()
+            if operation not in ("select", "insert", "update", "delete"):
+                operation = "other"
+            DB_QUERY_SECONDS.observe(time.perf_counter() - start, name, operation)
+
+
+def _pool_samples() -> List[tuple]:
+    samples = []
+    for name, engine in _engines.items():
+        pool = engine.pool
+        for stat in ("size", "checkedout", "overflow", "checkedin"):
+            method = getattr(pool, stat, None)
+            if method is not None:
+                samples.append(("db_pool_connections", "gauge", "État du pool SQLAlchemy",
+                                {"engine": name, "state": stat}, method()))
+    return samples
+
+
+COLLECTORS.append(_pool_samples)
+
+
+# ------------------------------------------------------------------
+# État, fusion entre workers et exposition texte
+# ------------------------------------------------------------------
+def local_state() -> dict:
+    metrics = {
+        name: {"kind": m.kind, "help": m.help, "labels": list(m.labels),
+               "buckets": list(getattr(m, "buckets", ())), "series": m.state()}
+        for name, m in REGISTRY.items()
+    }
+    for collector in COLLECTORS:
+        try:
+            samples = collector()
+        except Exception as e:      # une source défaillante ne casse pas le scrape
+            logger.warning(f"Metrics collector {collector.__name__} failed: {e}")
+            continue
+        for name, kind, help, labels, value in samples:
+            metric = metrics.setdefault(name, {"kind": kind, "help": help, "labels": list(labels),
+                                               "buckets": [], "series": []})
+            metric["series"].append([list(labels.values()), [value]])
+    return metrics
+
+
+def _merge(states: List[dict]) -> dict:
+    merged = {}
+    for state in states:
+        for name, metric in state.items():
+            target = merged.setdefault(name, {**metric, "series": {}})
+            for key, values in metric["series"]:
+                current = target["series"].setdefault(tuple(key), [0] * len(values))
+                for i, value in enumerate(values):
+                    current[i] += value
+    return merged
+
+
+def _worker_states() -> List[dict]:
+    """
+    États déposés par les workers, celui du worker courant compris (déposé à
+    l'instant) : chaque fichier ne fait qu'avancer, la somme ne recule donc pas
+    d'un scrape à l'autre quel que soit le worker qui répond. Un worker terminé
+    garde ses compteurs et histogrammes (dead-{pid}.json), pas ses jauges.
+    """
+    if not settings.METRICS_DIR:
+        return [local_state()]
+    metrics_flusher.flush()
+    states = []
+    for entry in os.scandir(settings.METRICS_DIR):
+        if not entry.name.endswith(".json"):
+            continue
+        path, dead = entry.path, entry.name.startswith("dead-")
+        if not dead:
+            try:
+                os.kill(int(entry.name[:-5]), 0)
+            except ValueError:
+                continue
+            except ProcessLookupError:
+                # worker terminé : un seul scrape réussit le renommage
+                path, dead = os.path.join(settings.METRICS_DIR, f"dead-{entry.name}"), True
+                try:
+                    os.rename(entry.path, path)
+                except OSError:
+                    continue
+            except PermissionError:
+                pass
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if dead:
+            state = {name: metric for name, metric in state.items() if metric["kind"] != "gauge"}
+        states.append(state)
+    return states
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render() -> str:
+    lines = []
+    for name, metric in sorted(_merge(_worker_states()).items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        names = metric["labels"]
+        for key, values in sorted(metric["series"].items()):
+            if metric["kind"] != "histogram":
+                lines.append(f"{name}{_labels(names, key)} {_number(values[0])}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric["buckets"] + ["+Inf"], values[:-1]):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{name}_bucket{_labels(names, key, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, key)} {_number(values[-1])}")
+            lines.append(f"{name}_count{_labels(names, key)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+# ------------------------------------------------------------------
+# Dépôt périodique de l'état du worker (METRICS_DIR)
+# ------------------------------------------------------------------
+class MetricsFlusher:
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()       # tâche de fond et scrapes du worker
+
+    @property
+    def path(self) -> str:
+        return os.path.join(settings.METRICS_DIR, f"{os.getpid()}.json")
+
+    def start(self) -> None:
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="metrics-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        # arrêt gracieux : compteurs conservés pour les scrapes suivants, jauges ignorées
+        try:
+            self.flush()
+            os.replace(self.path, os.path.join(settings.METRICS_DIR, f"dead-{os.getpid()}.json"))
+        except OSError as e:
+            logger.warning(f"Final metrics flush failed: {e}")
+
+    def flush(self) -> None:
+        with self._lock:
+            os.makedirs(settings.METRICS_DIR, exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(local_state(), f)
+            os.replace(tmp, self.path)     # jamais de fichier à moitié écrit pour les autres workers
+
+    def _loop(self) -> None:
+        while not self._stop.wait(settings.METRICS_FLUSH_SECONDS):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Metrics flush failed: {e}")
+
+
+metrics_flusher = MetricsFlusher()
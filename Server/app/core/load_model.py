@@ -1,5 +1,20 @@
-import pickle
+"""
+load_model.py — modèle de prédiction (models/pipeline.pkl), chargé une seule fois
+  • au premier appel de get_model(), ou explicitement par warm_up() : lifespan
+    de main.py, ou maître gunicorn (partage copy-on-write entre workers)
+  • importer ce module ne charge ni le pickle ni scikit-learn/xgboost/pandas
+  • version = empreinte du pickle, sauf si MODEL_VERSION est imposée
+"""
+
+import hashlib
+import logging
+import os
 import pathlib
+import pickle
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 # ../models/pipeline.pkl
 MODEL_PATH = (
@@ -11,6 +26,29 @@ MODEL_PATH = (
     / "pipeline.pkl"
 )
 
-with open(MODEL_PATH, "rb") as f:
-    model = pickle.load(f)
+_lock = threading.Lock()
+_loaded = {"model": None, "version": None}
+
+
+def get_model():
+    """(modèle, version) ; le premier appel charge le pickle"""
+    if _loaded["model"] is None:
+        with _lock:
+            if _loaded["model"] is None:
+                start = time.perf_counter()
+                model_bytes = MODEL_PATH.read_bytes()
+                _loaded["version"] = os.getenv("MODEL_VERSION") or hashlib.sha256(model_bytes).hexdigest()[:12]
+                _loaded["model"] = pickle.loads(model_bytes)
+                logger.info(
+                    f"Model {_loaded['version']} loaded in {time.perf_counter() - start:.2f}s"
+                )
+    return _loaded["model"], _loaded["version"]
+
+
+def is_loaded() -> bool:
+    return _loaded["model"] is not None
+
 
+def warm_up() -> None:
+    """Phase de démarrage explicite : le premier /predict ne paie pas le chargement"""
+    get_model()
@@ -0,0 +1,162 @@
+"""
+login_guard.py — /auth/login sans saturer le threadpool des requêtes
+  • bcrypt (volontairement lent) exécuté sur un pool dédié de
+    PASSWORD_HASH_WORKERS threads ; au-delà de PASSWORD_HASH_QUEUE vérifications
+    en attente : refus immédiat (503 + Retry-After) plutôt qu'une file sans fin
+  • l'attente se fait sur la boucle asyncio : une tempête de logins n'occupe
+    que ce pool, les autres endpoints gardent le threadpool partagé
+  • échecs répétés par nom d'utilisateur et par IP sur LOGIN_FAILURE_WINDOW :
+    429 + Retry-After avant toute requête SQL ou vérification bcrypt ; l'IP est
+    celle du client derrière le nginx du frontend (FORWARDED_ALLOW_IPS,
+    gunicorn.conf.py), sinon tous les utilisateurs relayés partageraient un compteur
+  • PASSWORD_HASH_WORKERS=0 : vérification dans le threadpool partagé
+    (comportement historique, référence de perf/login_storm.py)
+  • état propre à chaque worker ; compteurs dans snapshot() et /metrics
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core import instrumentation
+from app.core.config import settings
+from app.core.security import verify_password as _verify_password
+
+MAX_TRACKED = 10000
+
+
+class PasswordPool:
+    """Exécuteur borné des opérations bcrypt"""
+
+    def __init__(self, workers: int, queue: int):
+        self.workers = workers
+        self.max_pending = workers + queue
+        self.pending = 0
+        self.counters = {"verified": 0, "rejected_busy": 0}
+        self._executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt") if workers > 0 else None
+        )
+
+    def ensure_capacity(self) -> None:
+        """503 immédiat si la file est pleine (appelé aussi avant la lecture SQL de l'utilisateur)"""
+        if self._executor is not None and self.pending >= self.max_pending:
+            self.counters["rejected_busy"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many login attempts in progress",
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+            )
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        if self._executor is None:
+            return await run_in_threadpool(_verify_password, plain_password, hashed_password)
+        # compteur modifié uniquement depuis la boucle asyncio : pas de verrou
+        self.ensure_capacity()
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, _verify_password, plain_password, hashed_password)
+        finally:
+            self.pending -= 1
+            self.counters["verified"] += 1
+
+    def snapshot(self) -> dict:
+        return {"workers": self.workers, "max_pending": self.max_pending, "pending": self.pending, **self.counters}
+
+
+class FailureTracker:
+    """Échecs récents par clé (utilisateur ou IP) sur une fenêtre fixe"""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._failures: Dict[str, list] = {}     # clé → [nombre, début de fenêtre]
+
+    def retry_after(self, key: str) -> Optional[float]:
+        entry = self._failures.get(key)
+        if entry is None or entry[0] < self.limit:
+            return None
+        remaining = entry[1] + self.window - time.monotonic()
+        if remaining <= 0:
+            del self._failures[key]
+            return None
+        return remaining
+
+    def record(self, key: str) -> None:
+        now = time.monotonic()
+        entry = self._failures.get(key)
+        if entry is None or now - entry[1] >= self.window:
+            if len(self._failures) >= MAX_TRACKED:
+                self._failures = {k: e for k, e in self._failures.items() if now - e[1] < self.window}
+            self._failures[key] = [1, now]
+        else:
+            entry[0] += 1
+
+    def reset(self, key: str) -> None:
+        self._failures.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._failures)
+
+
+password_pool = PasswordPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE)
+user_failures = FailureTracker(settings.LOGIN_MAX_FAILURES_USER, settings.LOGIN_FAILURE_WINDOW)
+ip_failures = FailureTracker(settings.LOGIN_MAX_FAILURES_IP, settings.LOGIN_FAILURE_WINDOW)
+rejected_early = {"user": 0, "ip": 0}
+
+
+# ------------------------------------------------------------------
+# API utilisée par /auth/login
+# ------------------------------------------------------------------
+def check(username: str, client_ip: str) -> None:
+    """429 sans autre travail si l'utilisateur ou l'IP a trop échoué récemment, 503 si le pool est plein"""
+    for kind, tracker, key in (("user", user_failures, username.lower()), ("ip", ip_failures, client_ip)):
+        wait = tracker.retry_after(key)
+        if wait is not None:
+            rejected_early[kind] += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many failed login attempts",
+                headers={"Retry-After": str(max(1, int(wait + 0.999)))},
+            )
+    password_pool.ensure_capacity()
+
+
+def record_failure(username: str, client_ip: str) -> None:
+    user_failures.record(username.lower())
+    ip_failures.record(client_ip)
+
+
+def record_success(username: str) -> None:
+    user_failures.reset(username.lower())
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.verify(plain_password, hashed_password)
+
+
+def snapshot() -> dict:
+    return {
+        "password_pool": password_pool.snapshot(),
+        "tracked_users": len(user_failures),
+        "tracked_ips": len(ip_failures),
+        "rejected_early": dict(rejected_early),
+    }
+
+
+def _login_samples() -> list:
+    samples = [
+        ("password_pool_pending", "gauge", "Vérifications bcrypt en cours ou en attente", {}, password_pool.pending),
+    ]
+    for result, count in password_pool.counters.items():
+        samples.append(("password_pool_requests_total", "counter", "Vérifications bcrypt", {"result": result}, count))
+    for kind, count in rejected_early.items():
+        samples.append(("login_rejected_early_total", "counter", "Logins refusés après échecs répétés", {"key": kind}, count))
+    return samples
+
+
+instrumentation.COLLECTORS.append(_login_samples)
@@ -0,0 +1,208 @@
+"""
+middleware.py — middlewares ASGI purs de l'application
+RequestMiddleware : journalisation des requêtes et en-têtes de sécurité
+  • latence et statut relevés pour /metrics (app/core/instrumentation.py)
+  • scope de la requête exposé au profil SQL (app/core/query_profiler.py)
+  • remplace les deux @app.middleware("http") de main.py : pas de
+    BaseHTTPMiddleware, donc ni tâche ni flux de réponse intermédiaires
+  • en-têtes ajoutés au message http.response.start (octets préconstruits)
+  • une ligne de log par requête, formatée seulement si le niveau est actif
+CompressionMiddleware : gzip/brotli négocié au-delà d'un seuil de taille,
+  et au fil de l'eau pour les réponses en flux (export CSV)
+"""
+
+import gzip
+import logging
+import time
+import zlib
+
+from starlette.datastructures import MutableHeaders
+
+from app.core import instrumentation
+from app.core.config import settings
+from app.core.query_profiler import request_scope
+
+logger = logging.getLogger(__name__)
+
+# En-têtes de sécurité standard
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+]
+# HSTS en production uniquement
+HSTS_HEADER = (b"strict-transport-security", b"max-age=31536000; includeSubDomains")
+LOCAL_HOSTS = {"localhost", "127.0.0.1"}
+
+
+def _hostname(scope) -> str:
+    for name, value in scope["headers"]:
+        if name == b"host":
+            host = value.decode("latin-1")
+            # IPv6 entre crochets, sinon suppression du port
+            return host[1:host.index("]")] if host.startswith("[") else host.split(":", 1)[0]
+    server = scope.get("server")
+    return server[0] if server else ""
+
+
+class RequestMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        extra_headers = SECURITY_HEADERS if _hostname(scope) in LOCAL_HOSTS else SECURITY_HEADERS + [HSTS_HEADER]
+
+        async def send_with_headers(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", ()), *extra_headers]
+            await send(message)
+
+        token = request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send_with_headers)
+        except Exception as e:
+            logger.error(
+                f"💥 {scope['method']} {scope['path']} - ERROR: {e} - "
+                f"Time: {time.perf_counter() - start:.2f}s"
+            )
+            if settings.METRICS_ENABLED:
+                instrumentation.observe_request(scope, 500, time.perf_counter() - start)
+            raise
+        finally:
+            request_scope.reset(token)
+
+        if settings.METRICS_ENABLED:
+            instrumentation.observe_request(scope, status, time.perf_counter() - start)
+        level = logging.WARNING if status >= 400 else logging.INFO
+        if logger.isEnabledFor(level):
+            client = scope.get("client")
+            logger.log(
+                level,
+                f"📤 {scope['method']} {scope['path']} from {client[0] if client else 'unknown'} - "
+                f"Status: {status} - Time: {time.perf_counter() - start:.2f}s",
+            )
+
+
+# ------------------------------------------------------------------
+# Compression des réponses (gzip, brotli si le module est installé)
+# ------------------------------------------------------------------
+try:
+    import brotli
+except ImportError:     # dépendance optionnelle : gzip seulement
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def _accepted_encoding(scope) -> str | None:
+    """Meilleur encodage accepté par le client parmi br (si disponible) et gzip"""
+    for name, value in scope["headers"]:
+        if name == b"accept-encoding":
+            accepted = {}
+            for part in value.decode("latin-1").lower().split(","):
+                coding, _, params = part.strip().partition(";")
+                q = params.strip()[2:] if params.strip().startswith("q=") else "1"
+                try:
+                    accepted[coding.strip()] = float(q)
+                except ValueError:
+                    continue
+            wildcard = accepted.get("*", 0)
+            for coding in (("br", "gzip") if brotli is not None else ("gzip",)):
+                if accepted.get(coding, wildcard) > 0:
+                    return coding
+            return None
+    return None
+
+
+class _StreamCompressor:
+    """Compresseur d'une réponse en flux : chaque bloc est vidé (flush) dès son arrivée"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._br = None
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)    # en-tête gzip
+
+    def compress(self, data: bytes, last: bool) -> bytes:
+        if self._br is not None:
+            return self._br.process(data) + (self._br.finish() if last else self._br.flush())
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    Compresse les réponses en un seul message au-delà de `minimum_size` octets.
+    Les réponses en flux (StreamingResponse, export CSV) sont compressées bloc
+    par bloc, sans Content-Length : le premier octet n'attend pas la fin du
+    corps. Les types déjà compressés (export Parquet) passent tels quels.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 5, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope, receive, send):
+        encoding = _accepted_encoding(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        pending = None
+        stream = None
+
+        async def send_compressed(message):
+            nonlocal pending, stream
+            if message["type"] == "http.response.start":
+                pending = message           # en-têtes retenus jusqu'au premier bloc du corps
+                return
+            if pending is None:
+                if stream is not None and message["type"] == "http.response.body":
+                    more_body = message.get("more_body", False)
+                    message["body"] = stream.compress(message.get("body", b""), last=not more_body)
+                await send(message)
+                return
+
+            start, pending = pending, None
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(raw=start.setdefault("headers", []))
+            if (
+                (not more_body and len(body) < self.minimum_size)
+                or "content-encoding" in headers
+                or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            if more_body:
+                stream = _StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+                message["body"] = stream.compress(body, last=False)
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+            else:
+                message["body"] = self._compress(body, encoding)
+                headers["Content-Length"] = str(len(message["body"]))
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
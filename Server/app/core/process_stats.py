@@ -0,0 +1,60 @@
+"""
+process_stats.py — mémoire et temps de démarrage du processus courant
+  • RSS, PSS, partagé et privé lus dans /proc/self/smaps_rollup (Linux) :
+    la part « partagée » mesure ce que les workers gunicorn héritent du
+    maître en copy-on-write (modèle, modules importés)
+  • repli sur le pic RSS de getrusage hors Linux
+  • utilisé par gunicorn.conf.py (maître) et par le lifespan de main.py (workers)
+"""
+
+import logging
+import os
+import resource
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+_started = time.monotonic()
+
+SMAPS_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared",
+    "Shared_Dirty": "shared",
+    "Private_Clean": "private",
+    "Private_Dirty": "private",
+}
+
+
+def mark_started() -> None:
+    """Point de départ du chronomètre (appelé juste après le fork du worker)"""
+    global _started
+    _started = time.monotonic()
+
+
+def elapsed() -> float:
+    return time.monotonic() - _started
+
+
+def memory_usage() -> dict:
+    """Mémoire du processus en Mo"""
+    usage = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in SMAPS_FIELDS:
+                    key = SMAPS_FIELDS[name]
+                    usage[key] = usage.get(key, 0) + int(value.split()[0]) / 1024
+    except OSError:
+        # ru_maxrss : Ko sous Linux, octets sous macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage["rss"] = peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return {key: round(value, 1) for key, value in usage.items()}
+
+
+def log_ready(role: str) -> None:
+    usage = memory_usage()
+    details = ", ".join(f"{key}={value}MB" for key, value in usage.items())
+    logger.info(f"🧮 {role} {os.getpid()} ready in {elapsed():.2f}s - {details}")
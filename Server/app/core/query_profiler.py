@@ -0,0 +1,190 @@
+"""
+query_profiler.py — profil des requêtes SQL par empreinte (GET /db/queries, ADMIN)
+  • empreinte : instruction normalisée (littéraux et paramètres → ?, listes
+    IN (...) repliées, espaces compactés), calculée une fois par texte SQL
+  • par empreinte : nombre, temps total, max, p95 sur les dernières
+    exécutions, et routes HTTP qui l'ont émise
+  • au-delà de SLOW_QUERY_MS : échantillons avec paramètres ; le plan
+    (EXPLAIN) n'est calculé qu'à la lecture du rapport, sur une autre connexion
+  • paramètres masqués pour les tables d'utilisateurs et de sessions
+  • état propre à chaque worker, remis à zéro par DELETE /db/queries
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import event
+
+from app.core import instrumentation
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# scope ASGI de la requête en cours (posé par RequestMiddleware, copié dans le threadpool)
+request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+RECENT_TIMINGS = 256
+SLOW_SAMPLES = 5
+MAX_ROUTES = 20
+SENSITIVE_TABLES = re.compile(r"\b(users|user_sessions)\b", re.IGNORECASE)
+EXPLAIN_PREFIX = {"mysql": "EXPLAIN ", "sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN "}
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER = re.compile(r"(?<![\w`\"])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.IGNORECASE)
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(VALUES\s*\(\?[^)]*\))(?:\s*,\s*\(\?[^)]*\))+", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+_fingerprints = {}
+
+
+def fingerprint(statement: str) -> str:
+    cached = _fingerprints.get(statement)
+    if cached is not None:
+        return cached
+    text = _STRING.sub("?", statement)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _IN_LIST.sub("(...)", text)
+    text = _VALUES_LIST.sub(r"\1, ...", text)
+    text = _SPACES.sub(" ", text).strip()
+    if len(_fingerprints) < settings.QUERY_PROFILER_MAX_FINGERPRINTS * 4:
+        _fingerprints[statement] = text
+    return text
+
+
+class _QueryStats:
+    __slots__ = ("statement", "count", "total", "max", "recent", "routes", "slow", "last_seen")
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RECENT_TIMINGS)
+        self.routes = Counter()
+        self.slow = deque(maxlen=SLOW_SAMPLES)
+        self.last_seen = None
+
+
+class QueryProfiler:
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._engines = {}
+        self.dropped = 0
+
+    # ---------- collecte ----------
+    def attach(self, engine, name: str = "primary") -> None:
+        if name in self._engines:
+            return
+        self._engines[name] = engine
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            context._profile_start = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            start = getattr(context, "_profile_start", None)
+            if start is not None:
+                self.record(name, statement, parameters, time.perf_counter() - start)
+
+    def record(self, engine_name: str, statement: str, parameters, seconds: float) -> None:
+        key = fingerprint(statement)
+        scope = request_scope.get()
+        route = f"{scope['method']} {instrumentation.route_label(scope)}" if scope else "background"
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= settings.QUERY_PROFILER_MAX_FINGERPRINTS:
+                    self.dropped += 1
+                    return
+                stats = self._stats[key] = _QueryStats(key)
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.recent.append(seconds)
+            if route in stats.routes or len(stats.routes) < MAX_ROUTES:
+                stats.routes[route] += 1
+            stats.last_seen = datetime.utcnow()
+            if seconds * 1000 >= settings.SLOW_QUERY_MS:
+                stats.slow.append({
+                    "at": stats.last_seen,
+                    "ms": round(seconds * 1000, 2),
+                    "route": route,
+                    "engine": engine_name,
+                    "statement": statement,
+                    # executemany : seul le premier jeu de paramètres est conservé
+                    "parameters": parameters[:1] if isinstance(parameters, list) else parameters,
+                    "explain": None,
+                })
+        if seconds * 1000 >= settings.SLOW_QUERY_MS:
+            logger.warning(f"🐢 Slow query {seconds * 1000:.0f}ms on {route}: {key[:200]}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+            self.dropped = 0
+
+    # ---------- rapport ----------
+    def _explain(self, sample: dict) -> list:
+        engine = self._engines.get(sample["engine"])
+        prefix = EXPLAIN_PREFIX.get(engine.dialect.name) if engine is not None else None
+        if prefix is None or not sample["statement"].lstrip()[:6].lower().startswith(("select", "with")):
+            return []
+        parameters = sample["parameters"]
+        if isinstance(parameters, list):      # executemany : premier jeu de paramètres
+            parameters = parameters[0] if parameters else None
+        try:
+            with engine.connect() as conn:
+                result = conn.exec_driver_sql(prefix + sample["statement"], parameters or ())
+                return [dict(row._mapping) for row in result]
+        except Exception as e:
+            return [{"error": str(e)[:300]}]
+
+    def report(self, sort: str = "total", limit: int = 20, explain: bool = True) -> List[dict]:
+        with self._lock:
+            snapshot = [
+                (s.statement, s.count, s.total, s.max, sorted(s.recent), s.routes.most_common(5), list(s.slow), s.last_seen)
+                for s in self._stats.values()
+            ]
+        rows = []
+        for statement, count, total, max_s, recent, routes, slow, last_seen in snapshot:
+            p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+            rows.append({
+                "fingerprint": statement,
+                "count": count,
+                "total_ms": round(total * 1000, 2),
+                "mean_ms": round(total / count * 1000, 3),
+                "p95_ms": round(p95 * 1000, 3),
+                "max_ms": round(max_s * 1000, 3),
+                "routes": dict(routes),
+                "last_seen": last_seen,
+                "slow_samples": slow,
+            })
+        rows.sort(key=lambda r: r[f"{sort}_ms" if sort != "count" else "count"], reverse=True)
+        rows = rows[:limit]
+
+        for row in rows:
+            sensitive = SENSITIVE_TABLES.search(row["fingerprint"]) is not None
+            samples = []
+            for sample in row["slow_samples"]:
+                if explain and sample["explain"] is None:
+                    sample["explain"] = self._explain(sample)    # mis en cache dans l'échantillon
+                samples.append({
+                    **{k: v for k, v in sample.items() if k not in ("statement", "parameters", "engine")},
+                    "parameters": "[redacted]" if sensitive else repr(sample["parameters"])[:500],
+                })
+            row["slow_samples"] = samples
+        return rows
+
+
+query_profiler = QueryProfiler()
@@ -0,0 +1,21 @@
+"""
+responses.py — réponse JSON rapide pour les endpoints à gros volume
+  • orjson sérialise directement listes/dicts (et types NumPy) en bytes
+  • à retourner telle quelle depuis l'endpoint : FastAPI ne repasse alors ni
+    par la validation du response_model ni par jsonable_encoder
+  • repli sur le JSONResponse standard si orjson n'est pas installé
+"""
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:     # dépendance optionnelle
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
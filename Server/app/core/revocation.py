@@ -0,0 +1,100 @@
+"""
+revocation.py — tokens révoqués (logout, révocation admin) vérifiés sans requête SQL
+  • source de vérité : user_sessions (is_revoked, revoked_at) ; chaque worker en
+    garde en mémoire les jti révoqués et non expirés (dict jti → expiration)
+  • contrôle par requête : une recherche dans le dict, O(1), aucun accès base
+  • synchronisation incrémentale en tâche de fond toutes les
+    REVOCATION_SYNC_SECONDS : seules les lignes révoquées depuis le dernier
+    passage (moins une marge pour les horloges et les commits tardifs) sont relues
+  • une révocation faite par ce worker est visible immédiatement, par les autres
+    workers au plus tard après un intervalle de synchronisation
+  • les entrées expirées sont purgées : le token serait de toute façon refusé
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.repositories import session_repo
+
+logger = logging.getLogger(__name__)
+
+# relecture des révocations juste avant le curseur (horloges des workers, transactions lentes)
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class RevocationCache:
+    def __init__(self):
+        self._revoked = {}
+        self._cursor: Optional[datetime] = None
+        self._synced_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------- contrôle ----------
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._revoked
+
+    def add(self, revoked: Iterable[Tuple[str, datetime]]) -> None:
+        """Révocations faites par ce worker : effectives sans attendre la synchronisation"""
+        with self._lock:
+            for jti, expires_at in revoked:
+                self._revoked[jti] = expires_at
+
+    # ---------- synchronisation ----------
+    def sync(self) -> int:
+        """Relit les révocations récentes ; renvoie le nombre de lignes lues"""
+        with self._lock:
+            since = self._cursor - SYNC_OVERLAP if self._cursor is not None else None
+            db = SessionLocal()
+            try:
+                rows = session_repo.revoked_since(db, since)
+            finally:
+                db.close()
+            now = datetime.utcnow()
+            revoked = {jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > now}
+            for jti, expires_at, revoked_at in rows:
+                revoked[jti] = expires_at
+                if revoked_at is not None and (self._cursor is None or revoked_at > self._cursor):
+                    self._cursor = revoked_at
+            # remplacement en bloc : les lecteurs voient l'ancien ou le nouveau dict, jamais un état partiel
+            self._revoked = revoked
+            self._synced_at = now
+            return len(rows)
+
+    def start(self) -> None:
+        try:
+            self.sync()
+            logger.info(f"Revocation cache loaded: {len(self._revoked)} revoked token(s)")
+        except Exception as e:
+            logger.error(f"Revocation cache initial load failed: {e}")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="revocation-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(settings.REVOCATION_SYNC_SECONDS):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning(f"Revocation sync failed: {e}")
+
+    def snapshot(self) -> dict:
+        return {
+            "revoked_tokens": len(self._revoked),
+            "synced_at": self._synced_at,
+            "cursor": self._cursor,
+            "sync_seconds": settings.REVOCATION_SYNC_SECONDS,
+        }
+
+
+revocation_cache = RevocationCache()
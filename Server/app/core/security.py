@@ -2,8 +2,6 @@ import os
 import secrets
 from datetime import datetime, timedelta
 from typing import Optional
-from passlib.context import CryptContext
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
@@ -15,19 +13,28 @@ if JWT_SECRET_KEY == secrets.token_urlsafe(32):
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Contexte de hashage des mots de passe
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Contexte de hashage des mots de passe (passlib/bcrypt chargés au premier usage)
+_pwd_context = None
+
+def _get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Vérifier un mot de passe"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hasher un mot de passe"""
-    return pwd_context.hash(password)
+    return _get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Créer un token JWT"""
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -37,13 +44,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode.update({
         "exp": expire,
         "iat": datetime.utcnow(),
-        "jti": secrets.token_urlsafe(16)  # Unique token ID
     })
+    to_encode.setdefault("jti", secrets.token_urlsafe(16))  # Unique token ID (fourni par /login pour user_sessions)
     encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def verify_token(token: str) -> dict:
     """Vérifier et décoder un token JWT"""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM])
         username = payload.get("sub")
@@ -59,6 +68,15 @@ def verify_token(token: str) -> dict:
             detail=f"Invalid token: {str(e)}"
         )
 
+def token_subject(token: str) -> Optional[str]:
+    """Sujet d'un token valide, None sinon (sans HTTPException : usage hors endpoint)"""
+    from jose import JWTError, jwt
+
+    try:
+        return jwt.decode(token, JWT_SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
 def validate_password_strength(password: str) -> bool:
     """Valider la force du mot de passe"""
     if len(password) < 8:
@@ -0,0 +1,138 @@
+"""
+columnar.py — cache Arrow IPC des CSV de référence
+  • convert   : écrit <fichier>.arrow à côté de chaque CSV (IPC non compressé)
+  • read_*    : mmap du .arrow s'il est à jour (colonnes lues sans copie),
+                sinon repli sur pandas.read_csv
+  • benchmark : temps de chargement à froid CSV vs Arrow (rapport ; le
+                comportement du cache est vérifié par tests/test_columnar.py)
+
+Le format IPC non compressé est retenu plutôt que Parquet : c'est le seul
+qui se mappe en mémoire tel quel, sans décodage.
+
+Usage :
+    python -m app.data.columnar convert
+    python -m app.data.columnar benchmark
+"""
+
+import argparse
+import logging
+import pathlib
+import time
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SERVER_DIR = pathlib.Path(__file__).resolve().parent.parent.parent   # → Server
+
+# Jeux de données de référence (les absents sont ignorés)
+REFERENCE_CSVS = [
+    SERVER_DIR / "app" / "data" / "data_cleaned_used.csv",
+    SERVER_DIR / "training_sample.csv",
+    *sorted((SERVER_DIR / "batches").glob("*.csv")),
+]
+
+
+def arrow_path(csv_path) -> pathlib.Path:
+    csv_path = pathlib.Path(csv_path)
+    return csv_path.with_suffix(".arrow")
+
+
+def is_fresh(csv_path) -> bool:
+    """Le cache existe et n'est pas plus ancien que le CSV source"""
+    cache = arrow_path(csv_path)
+    if not cache.exists():
+        return False
+    csv_path = pathlib.Path(csv_path)
+    return not csv_path.exists() or cache.stat().st_mtime_ns >= csv_path.stat().st_mtime_ns
+
+
+# ---------- CONVERSION ----------
+def convert(csv_path) -> pathlib.Path:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    csv_path = pathlib.Path(csv_path)
+    table = pa_csv.read_csv(csv_path)
+    # dates gardées en texte, comme pandas.read_csv (repli de read_frame) : même DataFrame
+    for i, field in enumerate(table.schema):
+        if pa.types.is_temporal(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+    out = arrow_path(csv_path)
+    tmp = out.with_suffix(".arrow.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    tmp.replace(out)      # remplacement atomique : un lecteur ne voit jamais un fichier partiel
+    logger.info(f"{csv_path.name} → {out.name} ({table.num_rows} rows)")
+    return out
+
+
+def convert_all(paths=None) -> list[pathlib.Path]:
+    return [convert(p) for p in (paths or REFERENCE_CSVS) if pathlib.Path(p).exists()]
+
+
+# ---------- LECTURE ----------
+def read_table(csv_path, columns=None):
+    """
+    Table Arrow adossée au fichier mappé en mémoire : les buffers de colonnes
+    pointent dans le mmap, rien n'est copié tant qu'on ne convertit pas.
+    """
+    import pyarrow as pa
+
+    source = pa.memory_map(str(arrow_path(csv_path)), "r")
+    table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
+
+
+def read_frame(csv_path, columns=None) -> pd.DataFrame:
+    """DataFrame depuis le cache Arrow s'il est à jour, sinon depuis le CSV"""
+    if is_fresh(csv_path):
+        try:
+            return read_table(csv_path, columns).to_pandas()
+        except Exception as e:
+            logger.warning(f"Arrow cache unreadable for {csv_path}, falling back to CSV: {e}")
+    return pd.read_csv(csv_path, usecols=columns)
+
+
+# ---------- BENCHMARK ----------
+def benchmark(csv_path, repeat: int = 5) -> dict:
+    """Meilleur temps sur `repeat` chargements complets, CSV vs Arrow mmap"""
+    if not is_fresh(csv_path):
+        convert(csv_path)
+
+    def best(fn):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    csv_s = best(lambda: pd.read_csv(csv_path))
+    arrow_s = best(lambda: read_table(csv_path).to_pandas())
+    mmap_s = best(lambda: read_table(csv_path))
+    return {
+        "file": pathlib.Path(csv_path).name,
+        "csv_ms": round(csv_s * 1000, 2),
+        "arrow_to_pandas_ms": round(arrow_s * 1000, 2),
+        "arrow_mmap_ms": round(mmap_s * 1000, 2),
+        "speedup": round(csv_s / arrow_s, 1) if arrow_s else None,
+    }
+
+
+# ─── Entrée en CLI ───────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Cache Arrow IPC des CSV de référence")
+    parser.add_argument("command", choices=["convert", "benchmark"])
+    parser.add_argument("paths", nargs="*", help="CSV à traiter (défaut : jeux de référence)")
+    args = parser.parse_args()
+
+    paths = [pathlib.Path(p) for p in args.paths] or [p for p in REFERENCE_CSVS if p.exists()]
+    if args.command == "convert":
+        for out in convert_all(paths):
+            print(f"✅ {out}")
+    else:
+        for path in paths:
+            print(benchmark(path))
@@ -0,0 +1,143 @@
+"""
+export.py — export en flux de `covid_stats` (CSV ou Parquet)
+  • curseur côté serveur (stream_results + yield_per) : les lignes arrivent
+    par partitions, jamais la table entière en mémoire
+  • chaque partition est encodée puis rendue aussitôt (bloc CSV ou row group
+    Parquet) : les premiers octets partent dès la première partition
+  • lecture sur le réplica s'il est configuré et à jour des écritures du
+    client (app/db/replica.py) : un export complet ne charge pas le primaire
+  • utilisé par GET /covid/export (app/api/endpoints/export.py)
+"""
+
+import csv
+import io
+import logging
+from datetime import date, timedelta
+from typing import Iterator, List, Optional
+
+from sqlalchemy import BigInteger, Float, Integer, select
+from sqlalchemy.orm import Session
+
+from app.db.models.covid import CovidStat
+from app.db.replica import replica_router
+from app.db.repositories.covid_repo import day_start_ms
+
+logger = logging.getLogger(__name__)
+
+# toutes les colonnes sauf la clé interne
+EXPORT_COLUMNS = [c for c in CovidStat.__table__.columns if c.name != "id"]
+
+
+def _export_query(countries: Optional[List[str]], start: Optional[date], end: Optional[date]):
+    table = CovidStat.__table__
+    query = select(*EXPORT_COLUMNS)
+    if countries:
+        query = query.where(table.c.country_slug.in_([c.lower() for c in countries]))
+    if start is not None:
+        query = query.where(table.c.date_timestamp >= day_start_ms(start))
+    if end is not None:
+        query = query.where(table.c.date_timestamp < day_start_ms(end + timedelta(days=1)))
+    # ordre de la clé unique (country, date_timestamp) : parcours d'index, pas de tri
+    return query.order_by(table.c.country, table.c.date_timestamp)
+
+
+def iter_partitions(
+    countries: Optional[List[str]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    partition_size: int = 5000,
+    engine=None,
+    min_version: int = 0,
+) -> Iterator[list]:
+    """
+    Partitions de lignes lues sur une session dédiée, ouverte à la première
+    partition (la session de la requête est déjà fermée) : réplica, sinon
+    primaire ; `engine` force une base donnée.
+    """
+    rows = 0
+    db = Session(engine) if engine is not None else replica_router.read_session(min_version)
+    try:
+        result = db.execute(
+            _export_query(countries, start, end),
+            execution_options={"stream_results": True, "yield_per": partition_size},
+        )
+        for partition in result.partitions():
+            rows += len(partition)
+            yield partition
+    finally:
+        db.close()
+    logger.info(f"covid_stats export finished: {rows} rows")
+
+
+# ------------------------------------------------------------------
+# CSV
+# ------------------------------------------------------------------
+def stream_csv(partitions: Iterator[list]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([c.name for c in EXPORT_COLUMNS])
+    yield buffer.getvalue().encode()
+    for partition in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(partition)
+        yield buffer.getvalue().encode()
+
+
+# ------------------------------------------------------------------
+# Parquet : un row group par partition
+# ------------------------------------------------------------------
+class _DrainableSink(io.RawIOBase):
+    """Fichier en écriture seule dont on récupère les octets au fil de l'eau"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    def arrow_type(column):
+        if isinstance(column.type, (BigInteger, Integer)):
+            return pa.int64()
+        if isinstance(column.type, Float):
+            return pa.float64()
+        return pa.string()
+
+    return pa.schema([(c.name, arrow_type(c)) for c in EXPORT_COLUMNS])
+
+
+def stream_parquet(partitions: Iterator[list]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema()
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for partition in partitions:
+            columns = list(zip(*partition))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()          # pied de fichier Parquet
+    yield sink.drain()
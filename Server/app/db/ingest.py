@@ -0,0 +1,216 @@
+"""
+ingest.py — chargement en masse d'un CSV dans `covid_stats`
+  • lecture par blocs (pandas chunksize), mémoire constante
+  • INSERT multi-lignes + upsert sur (country, date_timestamp) : idempotent
+  • colonne indexée `country_slug` calculée ici (schéma mis à niveau par
+    app/db/migrations.py si la base est antérieure)
+  • tables dérivées rafraîchies dans la même transaction (DERIVED_REFRESHERS) :
+    journal covid_changes, features du modèle (covid_features)
+  • rapport lignes/s
+
+Usage :
+    python -m app.db.ingest app/data/data_cleaned_used.csv --chunksize 5000
+"""
+
+import argparse
+import logging
+import time
+from typing import Callable, Iterable
+
+import pandas as pd
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from app.db import migrations
+from app.db.database import SessionLocal
+from app.db.models.covid import CovidStat, slugify_country
+from app.db.repositories import change_repo
+
+logger = logging.getLogger(__name__)
+
+# Colonnes CSV → attributs CovidStat. Les fichiers quotidiens (format
+# data_cleaned_used.csv) ne portent que des cumuls : ils alimentent à la
+# fois les colonnes brutes et les colonnes `total_*` lues par l'API.
+CSV_COLUMNS = {
+    "Country": ["country"],
+    "Confirmed": ["confirmed", "total_confirmed"],
+    "Deaths": ["deaths", "total_deaths"],
+    "Recovered": ["recovered", "total_recovered"],
+    "Active": ["active", "active_cases"],
+    "New cases": ["new_cases"],
+    "New deaths": ["new_deaths"],
+    "New recovered": ["new_recovered"],
+    "WHO Region": ["continent"],
+    "Continent": ["continent"],
+    "Serious,Critical": ["serious_or_critical"],
+    "Total Tests": ["total_tests"],
+    "Population": ["population"],
+}
+
+KEY_ATTRS = ("country", "date_timestamp")
+
+# Rafraîchissement des tables dérivées, appelé dans la transaction du chargement
+# avec le résumé de chaque bloc : {"countries": set, "min_ts": int, "max_ts": int}
+DERIVED_REFRESHERS: list[Callable[[Session, dict], None]] = []
+
+
+def register_refresher(fn: Callable[[Session, dict], None]):
+    DERIVED_REFRESHERS.append(fn)
+    return fn
+
+
+@register_refresher
+def _record_changes(db: Session, summary: dict) -> None:
+    # journal covid_changes : les caches des workers API rechargent ces pays
+    change_repo.record_changes(db, sorted(summary["countries"]), "ingest")
+
+
+@register_refresher
+def _refresh_features(db: Session, summary: dict) -> None:
+    # table covid_features : seuls les jours touchés par le bloc (et leurs fenêtres) sont recalculés
+    from app.monitoring.features import refresh_features
+    refresh_features(db, summary["countries"], summary["min_ts"], summary["max_ts"])
+
+
+# ------------------------------------------------------------------
+# Mapping d'un bloc CSV → lignes prêtes pour l'INSERT
+# ------------------------------------------------------------------
+def _column_key(attr: str) -> str:
+    # clé de colonne de la table (ex. "New cases" pour l'attribut new_cases)
+    return CovidStat.__mapper__.columns[attr].key
+
+
+def map_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame(index=df.index)
+    for csv_col, attrs in CSV_COLUMNS.items():
+        if csv_col in df.columns:
+            for attr in attrs:
+                if attr not in out.columns:
+                    out[attr] = df[csv_col]
+
+    if "date_timestamp" in df.columns:
+        out["date_timestamp"] = df["date_timestamp"].astype("int64")
+    elif "Date" in df.columns:
+        # millisecondes, comme le reste de la base (cf. FROM_UNIXTIME(date_timestamp/1000))
+        out["date_timestamp"] = pd.to_datetime(df["Date"], utc=True).astype("int64") // 10**6
+    else:
+        raise ValueError("CSV must contain a 'Date' or 'date_timestamp' column")
+
+    out = out.dropna(subset=["country"])
+    out["country_slug"] = out["country"].map(slugify_country)
+    return out.rename(columns={attr: _column_key(attr) for attr in out.columns})
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    # NaN → NULL
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+# ------------------------------------------------------------------
+# Upsert multi-lignes (dialecte de la base cible)
+# ------------------------------------------------------------------
+def upsert_statement(dialect: str, records: list[dict], table=None, keys=None):
+    """
+    Upsert sur `keys` : les autres colonnes de `records` sont mises à jour.
+    Les valeurs ne sont pas incluses : exécuter avec db.execute(stmt, records)
+    (executemany, regroupé en INSERT multi-lignes par SQLAlchemy ; la requête
+    compilée est réutilisée d'un lot à l'autre).
+    """
+    table = CovidStat.__table__ if table is None else table
+    keys = {_column_key(a) for a in KEY_ATTRS} if keys is None else set(keys)
+    update_cols = [k for k in records[0] if k not in keys]
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        return stmt.on_duplicate_key_update({k: stmt.inserted[k] for k in update_cols})
+
+    if dialect in ("sqlite", "postgresql"):
+        module = __import__(f"sqlalchemy.dialects.{dialect}", fromlist=["insert"])
+        stmt = module.insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c[k] for k in keys],
+            set_={k: stmt.excluded[k] for k in update_cols},
+        )
+
+    raise ValueError(f"Unsupported dialect for upsert: {dialect}")
+
+
+def ensure_unique_key(db: Session) -> None:
+    """Crée la clé unique (country, date_timestamp) si la table n'en a pas encore."""
+    bind = db.get_bind()
+    existing = inspect(bind).get_unique_constraints("covid_stats") + [
+        ix for ix in inspect(bind).get_indexes("covid_stats") if ix.get("unique")
+    ]
+    if any(list(c["column_names"]) == list(KEY_ATTRS) for c in existing):
+        return
+    logger.warning("Adding unique key uq_covid_stats_country_date on covid_stats")
+    db.execute(text(
+        "CREATE UNIQUE INDEX uq_covid_stats_country_date ON covid_stats (country, date_timestamp)"
+    ))
+    db.commit()
+
+
+# ------------------------------------------------------------------
+# Chargement
+# ------------------------------------------------------------------
+def ingest_frames(db: Session, chunks: Iterable[pd.DataFrame], batch_size: int = 1000) -> dict:
+    dialect = db.get_bind().dialect.name
+    country_key = _column_key("country")
+    stats = {"rows": 0, "chunks": 0}
+    start = time.perf_counter()
+
+    try:
+        for chunk in chunks:
+            mapped = map_chunk(chunk)
+            if mapped.empty:
+                continue
+            records = _records(mapped)
+            stmt = upsert_statement(dialect, records)
+            for i in range(0, len(records), batch_size):
+                db.execute(stmt, records[i:i + batch_size])
+
+            summary = {
+                "countries": set(mapped[country_key].unique()),
+                "min_ts": int(mapped["date_timestamp"].min()),
+                "max_ts": int(mapped["date_timestamp"].max()),
+            }
+            for refresh in DERIVED_REFRESHERS:
+                refresh(db, summary)
+
+            stats["rows"] += len(records)
+            stats["chunks"] += 1
+            elapsed = time.perf_counter() - start
+            logger.info(f"Chunk {stats['chunks']}: {stats['rows']} rows ({stats['rows'] / elapsed:.0f} rows/s)")
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    stats["rows_per_s"] = round(stats["rows"] / stats["seconds"], 1) if stats["seconds"] else 0.0
+    return stats
+
+
+def ingest_csv(path: str, chunksize: int = 5000, batch_size: int = 1000) -> dict:
+    db = SessionLocal()
+    try:
+        ensure_unique_key(db)
+        migrations.covid_stats_country_slug(db)
+        return ingest_frames(db, pd.read_csv(path, chunksize=chunksize), batch_size)
+    finally:
+        db.close()
+
+
+# ─── Entrée en CLI ───────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Chargement en masse d'un CSV dans covid_stats")
+    parser.add_argument("csv", help="Chemin du CSV (format data_cleaned_used.csv)")
+    parser.add_argument("--chunksize", type=int, default=5000, help="Lignes lues par bloc")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Lignes par INSERT multi-lignes")
+    args = parser.parse_args()
+
+    result = ingest_csv(args.csv, args.chunksize, args.batch_size)
+    print(f"✅ {result['rows']} lignes en {result['seconds']}s ({result['rows_per_s']} lignes/s)")
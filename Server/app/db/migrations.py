@@ -0,0 +1,172 @@
+"""
+migrations.py — mise à niveau idempotente du schéma au démarrage
+  • init.sql ne s'exécute qu'à la création du volume MySQL : une base existante
+    ne reçoit jamais les tables et colonnes ajoutées depuis
+  • migrate() : tables des modèles manquantes (CREATE si absente), puis chaque
+    étape de STEPS, qui vérifie l'état du schéma avant toute modification
+  • appelé par le maître gunicorn avant le fork (gunicorn.conf.py) puis par
+    le lifespan de chaque worker, où il ne fait plus qu'inspecter le schéma
+  • une étape en échec est journalisée sans empêcher le démarrage : les
+    fonctionnalités concernées se dégradent (voir /auth/login)
+
+Usage (depuis Server/) :
+    python -m app.db.migrations
+"""
+
+import importlib
+import logging
+import pkgutil
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from app.db.database import Base, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _columns(db: Session, table: str) -> set:
+    return {c["name"] for c in inspect(db.get_bind()).get_columns(table)}
+
+
+def _indexes(db: Session, table: str) -> set:
+    return {ix["name"] for ix in inspect(db.get_bind()).get_indexes(table)}
+
+
+def _add_column(db: Session, table: str, column: str, ddl: str) -> None:
+    if column not in _columns(db, table):
+        logger.warning(f"Adding column {column} on {table}")
+        db.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        db.commit()
+
+
+def _add_index(db: Session, table: str, name: str, columns: str, unique: bool = False) -> None:
+    if name not in _indexes(db, table):
+        logger.warning(f"Adding index {name} on {table}")
+        db.execute(text(f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} ({columns})"))
+        db.commit()
+
+
+# ------------------------------------------------------------------
+# Étapes
+# ------------------------------------------------------------------
+def create_missing_tables(db: Session) -> None:
+    """Tables des modèles absentes de la base (user_sessions, covid_changes, …)"""
+    import app.db.models
+
+    for module in pkgutil.iter_modules(app.db.models.__path__):
+        importlib.import_module(f"app.db.models.{module.name}")
+    Base.metadata.create_all(db.get_bind())
+
+
+def user_sessions_revocation(db: Session) -> None:
+    """user_sessions d'avant la révocation : curseur revoked_at et index par utilisateur"""
+    _add_column(db, "user_sessions", "revoked_at", "DATETIME NULL")
+    _add_index(db, "user_sessions", "ix_user_sessions_user_id", "user_id")
+    _add_index(db, "user_sessions", "ix_user_sessions_revoked_at", "revoked_at")
+
+
+# même règle que slugify_country (app/db/models/covid.py), en SQL
+SLUG_SQL = "LOWER(REPLACE(TRIM({country}), ' ', '-'))"
+
+_SLUG_TRIGGERS = {
+    "mysql": [
+        ("trg_covid_stats_slug_insert",
+         "CREATE TRIGGER trg_covid_stats_slug_insert BEFORE INSERT ON covid_stats FOR EACH ROW "
+         f"SET NEW.country_slug = COALESCE(NEW.country_slug, {SLUG_SQL.format(country='NEW.country')})"),
+        ("trg_covid_stats_slug_update",
+         "CREATE TRIGGER trg_covid_stats_slug_update BEFORE UPDATE ON covid_stats FOR EACH ROW "
+         f"SET NEW.country_slug = IF(NEW.country <=> OLD.country, "
+         f"COALESCE(NEW.country_slug, {SLUG_SQL.format(country='NEW.country')}), "
+         f"{SLUG_SQL.format(country='NEW.country')})"),
+    ],
+    "sqlite": [
+        ("trg_covid_stats_slug_insert",
+         "CREATE TRIGGER trg_covid_stats_slug_insert AFTER INSERT ON covid_stats "
+         "WHEN NEW.country_slug IS NULL AND NEW.country IS NOT NULL BEGIN "
+         f"UPDATE covid_stats SET country_slug = {SLUG_SQL.format(country='NEW.country')} WHERE id = NEW.id; END"),
+    ],
+}
+
+
+def _triggers(db: Session) -> set:
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        query = "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()"
+    elif dialect == "sqlite":
+        query = "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+    else:
+        return set()
+    return {row[0] for row in db.execute(text(query))}
+
+
+def covid_stats_country_slug(db: Session) -> None:
+    """
+    country_slug sur une base antérieure : colonne, index, lignes NULL remplies,
+    et trigger pour les lignes écrites hors de l'application (chargements SQL
+    directs) ; les écritures SQLAlchemy passent par le défaut du modèle.
+    """
+    _add_column(db, "covid_stats", "country_slug", "VARCHAR(100)")
+    _add_index(db, "covid_stats", "ix_covid_stats_country_slug", "country_slug")
+    result = db.execute(text(
+        f"UPDATE covid_stats SET country_slug = {SLUG_SQL.format(country='country')} "
+        "WHERE country_slug IS NULL AND country IS NOT NULL"
+    ))
+    db.commit()
+    if result.rowcount:
+        logger.warning(f"Backfilled country_slug on {result.rowcount} covid_stats rows")
+    existing = _triggers(db)
+    for name, ddl in _SLUG_TRIGGERS.get(db.get_bind().dialect.name, []):
+        if name not in existing:
+            logger.warning(f"Adding trigger {name} on covid_stats")
+            db.execute(text(ddl))
+            db.commit()
+
+
+def covid_data_version(db: Session) -> None:
+    """Journal d'avant le compteur : colonne version (= id pour l'historique), ligne du compteur"""
+    _add_column(db, "covid_changes", "version", "BIGINT NULL")
+    _add_index(db, "covid_changes", "ix_covid_changes_version", "version")
+    db.execute(text("UPDATE covid_changes SET version = id WHERE version IS NULL"))
+    if db.execute(text("SELECT COUNT(*) FROM covid_data_version WHERE id = 1")).scalar() == 0:
+        db.execute(text(
+            "INSERT INTO covid_data_version (id, version, updated_at) "
+            "SELECT 1, COALESCE(MAX(version), 0), MAX(created_at) FROM covid_changes"
+        ))
+    db.commit()
+
+
+def monitoring_jobs_dedupe_key(db: Session) -> None:
+    """monitoring_jobs d'avant la planification multi-workers : clé unique des jobs planifiés"""
+    _add_column(db, "monitoring_jobs", "dedupe_key", "VARCHAR(64) NULL")
+    _add_index(db, "monitoring_jobs", "ux_monitoring_jobs_dedupe_key", "dedupe_key", unique=True)
+
+
+STEPS = [
+    user_sessions_revocation,
+    covid_stats_country_slug,
+    covid_data_version,
+    monitoring_jobs_dedupe_key,
+]
+
+
+def migrate() -> bool:
+    """Applique les étapes manquantes ; False si l'une d'elles a échoué"""
+    ok = True
+    db = SessionLocal()
+    try:
+        for step in [create_missing_tables, *STEPS]:
+            try:
+                step(db)
+            except Exception as e:
+                db.rollback()
+                ok = False
+                logger.error(f"Schema migration {step.__name__} failed: {e}")
+    finally:
+        db.close()
+    return ok
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(0 if migrate() else 1)
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, BigInteger, DateTime
+from app.db.database import Base
+
+
+class CovidChange(Base):
+    """Journal des écritures sur covid_stats (ingestion, édition, suppression)"""
+    __tablename__ = "covid_changes"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    country = Column(String(100), nullable=True)       # NULL = tous les pays
+    kind = Column(String(16), nullable=False)          # ingest | update | delete
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    # version de données attribuée par la transaction (covid_data_version) : ordre des commits
+    version = Column(BigInteger, nullable=True, index=True)
+
+
+class CovidDataVersion(Base):
+    """
+    Compteur unique (id = 1) incrémenté par chaque transaction qui écrit dans
+    covid_stats : le verrou de ligne pris par l'UPDATE est tenu jusqu'au commit,
+    les versions suivent donc l'ordre des commits (contrairement aux id
+    AUTO_INCREMENT du journal, attribués à l'insertion).
+    """
+    __tablename__ = "covid_data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,7 +1,17 @@
-from sqlalchemy import Column, Integer, Float, String, BigInteger
+from sqlalchemy import Column, Integer, Float, String, BigInteger, UniqueConstraint
 from app.db.database import Base
 
 
+def slugify_country(name: str) -> str:
+    """Identifiant d'URL d'un pays (« United States » → « united-states »)"""
+    return name.strip().lower().replace(" ", "-")
+
+
+def _slug_default(context):
+    country = context.get_current_parameters().get("country")
+    return slugify_country(country) if country else None
+
+
 class CovidStat(Base):
     __tablename__ = "covid_stats"
 
@@ -10,6 +20,9 @@ class CovidStat(Base):
 
     # colonnes (adaptées à la capture d’écran)
     country = Column(String(100))
+    # slugify_country(country) : recherches indexées de /manage ; défaut de toute
+    # insertion SQLAlchemy, trigger pour les autres (app/db/migrations.py)
+    country_slug = Column(String(100), index=True, default=_slug_default)
 
     confirmed = Column("Confirmed", Float)
     deaths = Column("Deaths", Float)
@@ -30,3 +43,8 @@ class CovidStat(Base):
     population = Column(Float)
 
     date_timestamp = Column(BigInteger)  # ex : 1716609282
+
+    # une ligne par pays et par jour : clé des upserts d'ingestion (app/db/ingest.py)
+    __table_args__ = (
+        UniqueConstraint("country", "date_timestamp", name="uq_covid_stats_country_date"),
+    )
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, Float, String, BigInteger, DateTime, UniqueConstraint
+from app.db.database import Base
+
+
+class CovidFeature(Base):
+    """Features du modèle par pays et par jour, calculées depuis covid_stats (app/monitoring/features.py)"""
+    __tablename__ = "covid_features"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    country = Column(String(100), nullable=False)
+    date_timestamp = Column(BigInteger, nullable=False)    # millisecondes, comme covid_stats
+
+    # noms de colonnes = noms des features du modèle (app/monitoring/monitor.py)
+    confirmed_log = Column("Confirmed_log", Float)
+    confirmed_log_ma_14 = Column("Confirmed_log_ma_14", Float)
+    deaths_log = Column("Deaths_log", Float)
+    cases_per_million = Column(Float)
+    tests_per_million = Column(Float)
+    population = Column(Float)
+
+    computed_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("country", "date_timestamp", name="uq_covid_features_country_date"),
+    )
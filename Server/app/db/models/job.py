@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from app.db.database import Base
+
+
+class MonitoringJob(Base):
+    __tablename__ = "monitoring_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(32), nullable=False, index=True)      # monitoring | drift | report
+    status = Column(String(16), nullable=False, default="queued", index=True)
+    params = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)                        # métriques + artefacts
+    error = Column(Text, nullable=True)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    timeout_seconds = Column(Integer, nullable=False, default=900)
+
+    submitted_by = Column(String(50), nullable=True)            # NULL = planificateur
+    # clé unique des jobs planifiés ("daily:drift:2024-05-25") : un seul job
+    # par clé, quel que soit le nombre de workers qui le planifient
+    dedupe_key = Column(String(64), nullable=True)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    run_after = Column(DateTime(timezone=True), default=datetime.utcnow, index=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ux_monitoring_jobs_dedupe_key", "dedupe_key", unique=True),
+    )
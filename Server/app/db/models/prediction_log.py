@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Float, BigInteger, DateTime, JSON, Index
+from app.db.database import Base
+
+
+class PredictionLog(Base):
+    __tablename__ = "prediction_log"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    country = Column(String(100), nullable=False)
+    who_region = Column(String(50))
+    # minuit UTC du jour prédit, en millisecondes (même unité que covid_stats.date_timestamp)
+    target_ts = Column(BigInteger, nullable=False)
+    pred_new_deaths = Column(Float, nullable=False)
+    model_version = Column(String(32), nullable=False)
+    features = Column(JSON)
+    username = Column(String(50))
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_prediction_log_country_target", "country", "target_ts"),
+        Index("ix_prediction_log_target", "target_ts"),
+    )
@@ -23,8 +23,10 @@ class UserSession(Base):
     __tablename__ = "user_sessions"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False, index=True)
     token_jti = Column(String(255), unique=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     expires_at = Column(DateTime(timezone=True), nullable=False)
-    is_revoked = Column(Boolean, default=False, nullable=False)
\ No newline at end of file
+    is_revoked = Column(Boolean, default=False, nullable=False)
+    # curseur de synchronisation incrémentale du cache de révocation (app/core/revocation.py)
+    revoked_at = Column(DateTime(timezone=True), nullable=True, index=True)
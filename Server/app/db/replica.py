@@ -0,0 +1,152 @@
+"""
+replica.py — lectures des endpoints GET sur un réplica, écritures sur le primaire
+  • REPLICA_DATABASE_URL : base en lecture seule (réplica MySQL) ; vide : tout
+    reste sur le primaire (app/db/database.py), comportement historique
+  • get_read_db : session des GET de covid, analytics et manage ; get_write_db :
+    session des écritures de manage, toujours sur le primaire ; l'export en
+    flux (app/data/export.py) lit lui aussi via replica_router
+  • lecture de ses propres écritures, quel que soit le worker qui répond :
+    un commit via get_write_db renvoie au client la version de données écrite
+    (cookie data_version et en-tête X-Data-Version, valables REPLICA_PIN_SECONDS) ;
+    une lecture qui la présente (cookie ou en-tête X-Data-Version) ne part sur
+    le réplica que si celui-ci a déjà rejoint cette version
+  • repli : si la connexion au réplica échoue, la lecture part sur le primaire
+    et le réplica est écarté pendant REPLICA_RETRY_SECONDS
+  • routage compté par cible et raison (snapshot(), /metrics, GET /db/replica)
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core import instrumentation
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.repositories import change_repo
+
+logger = logging.getLogger(__name__)
+
+VERSION_COOKIE = "data_version"
+VERSION_HEADER = "X-Data-Version"
+
+read_engine = create_engine(settings.REPLICA_DATABASE_URL, pool_pre_ping=True) if settings.REPLICA_DATABASE_URL else None
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine) if read_engine is not None else None
+
+
+class ReplicaRouter:
+    """Choix primaire / réplica pour chaque session de lecture"""
+
+    def __init__(self, retry_seconds: float):
+        self.retry_seconds = retry_seconds
+        self.down_until = 0.0
+        self.routes: Dict[tuple, int] = {}            # (cible, raison) → nombre de sessions
+        self._lock = threading.Lock()
+
+    def _count(self, target: str, reason: str) -> None:
+        with self._lock:
+            self.routes[(target, reason)] = self.routes.get((target, reason), 0) + 1
+
+    def _primary(self, reason: str) -> Session:
+        self._count("primary", reason)
+        return SessionLocal()
+
+    def read_session(self, min_version: int = 0) -> Session:
+        """Session du réplica s'il répond et a rejoint `min_version`, sinon du primaire"""
+        if ReadSessionLocal is None:
+            return self._primary("no_replica")
+        if time.monotonic() < self.down_until:
+            return self._primary("replica_down")
+
+        db = ReadSessionLocal()
+        try:
+            db.connection()         # connexion prise ici : l'échec se rattrape avant l'endpoint
+            lagging = min_version > 0 and change_repo.data_version(db) < min_version
+        except DBAPIError as e:
+            db.close()
+            self.down_until = time.monotonic() + self.retry_seconds
+            logger.warning(f"Read replica unavailable, using primary for {self.retry_seconds}s: {e}")
+            return self._primary("replica_down")
+        if lagging:
+            db.close()
+            return self._primary("read_your_writes")
+        self._count("replica", "read")
+        return db
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            "configured": read_engine is not None,
+            "available": now >= self.down_until,
+            "retry_in_seconds": round(max(0.0, self.down_until - now), 1),
+            "pin_seconds": settings.REPLICA_PIN_SECONDS,
+            "routes": {f"{target}:{reason}": count for (target, reason), count in sorted(self.routes.items())},
+        }
+
+
+replica_router = ReplicaRouter(settings.REPLICA_RETRY_SECONDS)
+
+
+def client_version(request: Request) -> int:
+    """Plus haute version écrite par ce client encore valable (cookie ou en-tête)"""
+    version = 0
+    for raw in (request.cookies.get(VERSION_COOKIE), request.headers.get(VERSION_HEADER)):
+        try:
+            version = max(version, int(raw))
+        except (TypeError, ValueError):
+            pass
+    return version
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _return_version(session) -> None:
+    # version attribuée par change_repo.record_changes dans la transaction qui vient d'être validée
+    version = session.info.pop("data_version", None)
+    response = session.info.get("response")
+    if version is not None and response is not None:
+        response.set_cookie(VERSION_COOKIE, str(version), max_age=int(settings.REPLICA_PIN_SECONDS),
+                            httponly=True, samesite="lax")
+        response.headers[VERSION_HEADER] = str(version)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_version(session) -> None:
+    session.info.pop("data_version", None)
+
+
+# ------------------------------------------------------------------
+# Dépendances FastAPI
+# ------------------------------------------------------------------
+def get_read_db(request: Request):
+    """Session de lecture : réplica, sauf s'il n'a pas rejoint les écritures du client ou ne répond pas"""
+    db = replica_router.read_session(client_version(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_write_db(response: Response):
+    """Session du primaire ; chaque commit renvoie au client la version écrite"""
+    db = SessionLocal()
+    db.info["response"] = response
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _replica_samples() -> list:
+    return [
+        ("db_read_sessions_total", "counter", "Sessions de lecture par cible et raison",
+         {"target": target, "reason": reason}, count)
+        for (target, reason), count in list(replica_router.routes.items())
+    ]
+
+
+instrumentation.COLLECTORS.append(_replica_samples)
@@ -0,0 +1,204 @@
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.repositories import change_repo
+
+# Métriques autorisées (sécurisé contre injection SQL) : (colonne cumul, colonne du jour)
+ALLOWED_METRICS = {
+    "cases": ("total_confirmed", "New cases"),
+    "deaths": ("total_deaths", "New deaths"),
+    "recovered": ("total_recovered", "New recovered"),
+}
+
+
+# ------------------------------------------------------------------
+# Dialectes : seules ces expressions diffèrent d'un moteur à l'autre
+# ------------------------------------------------------------------
+class SqlDialect:
+    name = "mysql"
+
+    def quote(self, column: str) -> str:
+        return f"`{column}`"
+
+    def to_int(self, expr: str) -> str:
+        return f"CAST({expr} AS SIGNED)"
+
+    def day(self, ts_ms: str) -> str:
+        return f"DATE(FROM_UNIXTIME({ts_ms}/1000))"
+
+    def days_ago(self, param: str) -> str:
+        return f"CURDATE() - INTERVAL :{param} DAY"
+
+
+class DuckDBDialect(SqlDialect):
+    name = "duckdb"
+
+    def quote(self, column: str) -> str:
+        return f'"{column}"'
+
+    def to_int(self, expr: str) -> str:
+        return f"CAST({expr} AS BIGINT)"
+
+    def day(self, ts_ms: str) -> str:
+        return f"CAST(epoch_ms(CAST({ts_ms} AS BIGINT)) AS DATE)"
+
+    def days_ago(self, param: str) -> str:
+        return f"CURRENT_DATE - CAST(:{param} AS INTEGER)"
+
+
+class SQLiteDialect(SqlDialect):
+    name = "sqlite"
+
+    def quote(self, column: str) -> str:
+        return f'"{column}"'
+
+    def to_int(self, expr: str) -> str:
+        return f"CAST(ROUND({expr}) AS INTEGER)"
+
+    def day(self, ts_ms: str) -> str:
+        return f"DATE({ts_ms}/1000, 'unixepoch')"
+
+    def days_ago(self, param: str) -> str:
+        return f"DATE('now', '-' || :{param} || ' days')"
+
+
+DIALECTS = {d.name: d for d in (SqlDialect(), DuckDBDialect(), SQLiteDialect())}
+
+
+# ------------------------------------------------------------------
+# Requêtes /analytics, écrites une fois pour tous les dialectes
+# ------------------------------------------------------------------
+class AnalyticsQueries:
+    """
+    Exécute les requêtes /analytics via une session SQLAlchemy. Les autres
+    moteurs SQL (app/analytics/duckdb_backend.py) surchargent `fetch` et
+    `dialect_for` et réutilisent le reste.
+    """
+
+    def dialect_for(self, db: Session) -> SqlDialect:
+        return DIALECTS.get(db.get_bind().dialect.name, DIALECTS["mysql"])
+
+    def fetch(self, db: Session, sql: str, params: dict) -> List[dict]:
+        return db.execute(text(sql), params).mappings().all()
+
+    def data_state(self, db: Session):
+        """(version, date de modification) des données interrogées (validateurs HTTP)"""
+        return change_repo.current_state(db)
+
+    # -------- TOP COUNTRIES / NEW CASES ------
+    def _latest_ranking(self, db: Session, column: str, limit: int) -> List[dict]:
+        d = self.dialect_for(db)
+        col = d.quote(column)
+        sql = f"""
+            WITH LastValues AS (
+                SELECT country, {col} as value, date_timestamp,
+                       ROW_NUMBER() OVER (PARTITION BY country ORDER BY date_timestamp DESC) as rn
+                FROM covid_stats
+                WHERE {col} > 0
+            )
+            SELECT country AS name, {d.to_int("value")} as value
+            FROM LastValues
+            WHERE rn = 1
+            ORDER BY value DESC
+            LIMIT :limit_val
+        """
+        rows = self.fetch(db, sql, {"limit_val": limit})
+        return [{"name": row["name"], "value": int(row["value"] or 0)} for row in rows]
+
+    def top_countries(self, db: Session, metric: str, limit: int) -> List[dict]:
+        return self._latest_ranking(db, ALLOWED_METRICS[metric][0], limit)
+
+    def newest_values(self, db: Session, metric: str, limit: int) -> List[dict]:
+        return self._latest_ranking(db, ALLOWED_METRICS[metric][1], limit)
+
+    # -------- TREND ------
+    def trend(self, db: Session, metric: str, days: int) -> List[dict]:
+        d = self.dialect_for(db)
+        col = d.quote(ALLOWED_METRICS[metric][1])
+        sql = f"""
+            SELECT {d.day("date_timestamp")} AS name,
+                   {d.to_int(f"SUM({col})")} AS value
+            FROM covid_stats
+            WHERE date_timestamp > 0
+              AND {d.day("date_timestamp")} > {d.days_ago("days_val")}
+              AND {col} >= 0
+            GROUP BY name
+            ORDER BY name
+        """
+        rows = self.fetch(db, sql, {"days_val": days})
+        return [{"name": str(row["name"]), "value": int(row["value"] or 0)} for row in rows]
+
+    # -------- MORTALITY VS RECOVERY ------
+    def mortality_recovery(self, db: Session, limit: int) -> List[dict]:
+        sql = """
+            WITH LastValues AS (
+                SELECT
+                    country,
+                    total_confirmed,
+                    total_deaths,
+                    total_recovered,
+                    date_timestamp,
+                    ROW_NUMBER() OVER (PARTITION BY country ORDER BY date_timestamp DESC) as rn
+                FROM covid_stats
+                WHERE total_confirmed > 0
+            )
+            SELECT
+                country AS name,
+                total_confirmed,
+                total_deaths,
+                total_recovered,
+                CASE
+                    WHEN total_confirmed > 0 THEN ROUND((total_deaths / total_confirmed) * 100, 2)
+                    ELSE 0
+                END as mortality_rate,
+                CASE
+                    WHEN total_confirmed > 0 THEN ROUND((total_recovered / total_confirmed) * 100, 2)
+                    ELSE 0
+                END as recovery_rate
+            FROM LastValues
+            WHERE rn = 1
+              AND total_confirmed >= 1000
+            ORDER BY total_confirmed DESC
+            LIMIT :limit_val
+        """
+        rows = self.fetch(db, sql, {"limit_val": limit})
+
+        result = []
+        for row in rows:
+            mortality_rate = min(100, max(0, float(row["mortality_rate"] or 0)))
+            recovery_rate = min(100, max(0, float(row["recovery_rate"] or 0)))
+
+            result.append({
+                "name": row["name"],
+                "Mortality %": mortality_rate,
+                "Recovery %": recovery_rate,
+                "confirmed": int(row["total_confirmed"] or 0),
+                "deaths": int(row["total_deaths"] or 0),
+                "recovered": int(row["total_recovered"] or 0)
+            })
+        return result
+
+    # -------- TOTAL GLOBAL ------
+    def total(self, db: Session, metric: str) -> int:
+        d = self.dialect_for(db)
+        col = d.quote(ALLOWED_METRICS[metric][1])
+        sql = f"""
+            SELECT {d.to_int(f"SUM({col})")} AS total_value
+            FROM covid_stats
+            WHERE {col} > 0
+        """
+        rows = self.fetch(db, sql, {})
+        return int((rows[0]["total_value"] if rows else 0) or 0)
+
+
+sql_analytics = AnalyticsQueries()
+
+# Interface module (utilisée par app/analytics/backend.py)
+top_countries = sql_analytics.top_countries
+newest_values = sql_analytics.newest_values
+trend = sql_analytics.trend
+mortality_recovery = sql_analytics.mortality_recovery
+total = sql_analytics.total
+data_state = sql_analytics.data_state
@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models.change import CovidChange, CovidDataVersion
+
+
+# ---------- WRITE (dans la transaction de l'appelant, pas de commit ici) ----------
+def _bump_version(db: Session, now: datetime) -> int:
+    """Incrémente le compteur ; son verrou de ligne sérialise les écrivains jusqu'à leur commit"""
+    table = CovidDataVersion.__table__
+    bumped = db.execute(
+        update(table).where(table.c.id == 1).values(version=table.c.version + 1, updated_at=now)
+    )
+    if bumped.rowcount == 0:        # base sans ligne initiale (app/db/migrations.py la crée)
+        db.execute(insert(table).values(id=1, version=1, updated_at=now))
+    return int(db.execute(select(table.c.version).where(table.c.id == 1)).scalar())
+
+
+def record_changes(db: Session, countries: Iterable[str], kind: str) -> None:
+    now = datetime.utcnow()
+    rows = [{"country": country, "kind": kind, "created_at": now} for country in countries]
+    if rows:
+        version = _bump_version(db, now)
+        db.info["data_version"] = version       # renvoyé au client après le commit (app/db/replica.py)
+        db.execute(insert(CovidChange), [{**row, "version": version} for row in rows])
+
+
+# ---------- READ ----------
+def data_version(db: Session) -> int:
+    """Version des données : avance à chaque commit d'écriture, dans l'ordre des commits"""
+    return int(db.query(CovidDataVersion.version).filter(CovidDataVersion.id == 1).scalar() or 0)
+
+
+def current_state(db: Session) -> Tuple[int, Optional[datetime]]:
+    """(version, date de la dernière écriture) : validateur HTTP des endpoints de données"""
+    row = db.query(CovidDataVersion.version, CovidDataVersion.updated_at).filter(CovidDataVersion.id == 1).first()
+    return (int(row.version), row.updated_at) if row else (0, None)
+
+
+def changes_since(db: Session, last_version: int) -> List[Tuple[int, str]]:
+    """(version, pays) écrits après `last_version` : aucun commit tardif n'est sauté"""
+    return [
+        (row.version, row.country)
+        for row in db.query(CovidChange.version, CovidChange.country)
+        .filter(CovidChange.version > last_version)
+        .order_by(CovidChange.version)
+        .all()
+    ]
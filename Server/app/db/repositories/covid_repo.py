@@ -1,11 +1,14 @@
-from datetime import datetime
-from typing import List
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 
+import numpy as np
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.analytics.downsample import lttb
 from app.db.models.covid import CovidStat
-from app.schemas.covid import GlobalStats, CountrySummary
+from app.db.repositories.latest_repo import latest_page
+from app.schemas.covid import GlobalStats
 
 
 # ------------------------------------------------------------------
@@ -47,41 +50,116 @@ def get_global_stats(db: Session) -> GlobalStats:
     )
 
     data = dict(row._mapping)
-    # 👉 Divise par 1000 si date_timestamp est en millisecondes
-    data["last_updated"] = datetime.fromtimestamp(int(data.pop("max_ts")))
+    # date_timestamp est en millisecondes (cf. app/db/ingest.py)
+    data["last_updated"] = datetime.fromtimestamp(int(data.pop("max_ts")) / 1000)
     return GlobalStats(**data)
 
 
 # ------------------------------------------------------------------
-# PAR PAYS
+# PAR PAYS (instantané partagé, app/db/repositories/latest_repo.py)
 # ------------------------------------------------------------------
-def get_countries_summary(db: Session) -> List[CountrySummary]:
-    latest = _latest_per_country(db)
+# champ de CountrySummary → champ trié de l'instantané
+SUMMARY_SORT_FIELDS = {
+    "country": "country",
+    "confirmed_total": "total_confirmed",
+    "confirmed_new": "new_cases",
+    "deaths_total": "total_deaths",
+    "deaths_new": "new_deaths",
+}
 
-    rows = (
-        db.query(
-            CovidStat.country.label("country"),
-            CovidStat.total_confirmed.label("confirmed_total"),
-            CovidStat.new_cases.label("confirmed_new"),
-            CovidStat.total_deaths.label("deaths_total"),
-            CovidStat.new_deaths.label("deaths_new"),
-        )
-        .join(
-            latest,
-            (CovidStat.country == latest.c.country)
-            & (CovidStat.date_timestamp == latest.c.max_ts),
-        )
-        .all()
-    )
 
+def get_countries_summary(
+    db: Session,
+    sort: str = "country",
+    order: str = "asc",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str], int]:
+    rows, next_cursor, total = latest_page(db, SUMMARY_SORT_FIELDS[sort], order, limit, cursor, q)
+
+    # dicts à la forme de CountrySummary, sérialisés tels quels (FastJSONResponse) :
+    # NULL → 0.0 comme le faisait la validation du response_model
     return [
-        CountrySummary(
-            id=row.country.lower().replace(" ", "-"),
-            country=row.country,
-            confirmed_total=row.confirmed_total,
-            confirmed_new=row.confirmed_new,
-            deaths_total=row.deaths_total,
-            deaths_new=row.deaths_new,
-        )
+        {
+            "id": row["country_slug"],
+            "country": row["country"],
+            "confirmed_total": float(row["total_confirmed"] or 0),
+            "confirmed_new": float(row["new_cases"] or 0),
+            "deaths_total": float(row["total_deaths"] or 0),
+            "deaths_new": float(row["new_deaths"] or 0),
+        }
         for row in rows
-    ]
+    ], next_cursor, total
+
+
+# ------------------------------------------------------------------
+# SÉRIE D'UN PAYS
+# ------------------------------------------------------------------
+# métrique publique → colonne (quotidienne pour cases/deaths/recovered, comme /analytics)
+SERIES_METRICS = {
+    "cases": CovidStat.new_cases,
+    "deaths": CovidStat.new_deaths,
+    "recovered": CovidStat.new_recovered,
+    "total_cases": CovidStat.total_confirmed,
+    "total_deaths": CovidStat.total_deaths,
+    "total_recovered": CovidStat.total_recovered,
+}
+
+
+def day_start_ms(day: date) -> int:
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def get_country_series(
+    db: Session,
+    cid: str,
+    metrics: List[str],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    points: Optional[int] = None,
+) -> Optional[dict]:
+    """Historique d'un pays (index country_slug), réduit par LTTB si `points` est donné"""
+    unknown = [m for m in metrics if m not in SERIES_METRICS]
+    if unknown or not metrics:
+        raise ValueError(f"Invalid metrics: {', '.join(unknown) or 'none given'}")
+    slug = cid.lower()
+    country = db.query(CovidStat.country).filter(CovidStat.country_slug == slug).limit(1).scalar()
+    if country is None:
+        return None
+
+    query = db.query(CovidStat.date_timestamp, *[SERIES_METRICS[m] for m in metrics]).filter(
+        CovidStat.country_slug == slug,
+        CovidStat.date_timestamp.isnot(None),
+    )
+    if start is not None:
+        query = query.filter(CovidStat.date_timestamp >= day_start_ms(start))
+    if end is not None:
+        query = query.filter(CovidStat.date_timestamp < day_start_ms(end + timedelta(days=1)))
+    rows = query.order_by(CovidStat.date_timestamp).all()
+
+    columns = list(zip(*rows)) if rows else [()] * (len(metrics) + 1)
+    ts = np.array(columns[0], dtype=np.int64)
+    series, raw_points = {}, {}
+    for i, metric in enumerate(metrics):
+        values = np.array(columns[i + 1], dtype=np.float64)    # NULL → NaN
+        keep = ~np.isnan(values)
+        x, y = ts[keep], values[keep]
+        raw_points[metric] = len(x)
+        if points is not None:
+            picked = lttb(x, y, points)
+            x, y = x[picked], y[picked]
+        # dates ISO calculées en bloc (datetime64), valeurs en float Python
+        days = (x // 86_400_000).astype("datetime64[D]").astype(str)
+        series[metric] = [{"date": day, "value": value} for day, value in zip(days.tolist(), y.tolist())]
+
+    # même forme que CountrySeries, sans instancier un modèle par point
+    return {
+        "id": slug,
+        "country": country,
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
+        "points": points,
+        "raw_points": raw_points,
+        "metrics": series,
+    }
@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.models.job import MonitoringJob
+
+# Délai avant nouvelle tentative : 30 s, 60 s, 120 s, …
+RETRY_BACKOFF_SECONDS = 30
+
+
+# ---------- CREATE ----------
+def create_job(
+    db: Session,
+    kind: str,
+    params: Optional[dict] = None,
+    *,
+    submitted_by: Optional[str] = None,
+    max_attempts: int = 3,
+    timeout_seconds: int = 900,
+    dedupe_key: Optional[str] = None,
+) -> MonitoringJob:
+    """
+    Ajoute un job en file. Avec `dedupe_key`, la clé unique de la table fait
+    office d'INSERT IGNORE : si le job existe déjà (autre process, autre
+    appel), c'est lui qui est renvoyé.
+    """
+    now = datetime.utcnow()
+    job = MonitoringJob(
+        kind=kind,
+        status="queued",
+        params=params or {},
+        submitted_by=submitted_by,
+        max_attempts=max_attempts,
+        timeout_seconds=timeout_seconds,
+        dedupe_key=dedupe_key,
+        created_at=now,
+        run_after=now,
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        if dedupe_key is None:
+            raise
+        db.rollback()
+        return get_job_by_dedupe_key(db, dedupe_key)
+    db.refresh(job)
+    return job
+
+
+# ---------- READ ----------
+def get_job(db: Session, job_id: int) -> Optional[MonitoringJob]:
+    return db.get(MonitoringJob, job_id)
+
+
+def get_job_by_dedupe_key(db: Session, dedupe_key: str) -> Optional[MonitoringJob]:
+    return db.query(MonitoringJob).filter(MonitoringJob.dedupe_key == dedupe_key).first()
+
+
+def list_jobs(db: Session, *, limit: int = 50, kind: Optional[str] = None) -> List[MonitoringJob]:
+    query = db.query(MonitoringJob)
+    if kind:
+        query = query.filter(MonitoringJob.kind == kind)
+    return query.order_by(MonitoringJob.id.desc()).limit(limit).all()
+
+
+def has_job_since(db: Session, kind: str, since: datetime) -> bool:
+    return (
+        db.query(MonitoringJob.id)
+        .filter(MonitoringJob.kind == kind, MonitoringJob.created_at >= since)
+        .first()
+        is not None
+    )
+
+
+# ---------- CLAIM ----------
+def claim_next_job(db: Session) -> Optional[MonitoringJob]:
+    """
+    Réserve le plus ancien job prêt. L'UPDATE conditionnel sur `status`
+    garantit qu'un seul worker l'obtient, même avec plusieurs process API.
+    """
+    now = datetime.utcnow()
+    candidate = (
+        db.query(MonitoringJob.id)
+        .filter(MonitoringJob.status == "queued", MonitoringJob.run_after <= now)
+        .order_by(MonitoringJob.id)
+        .first()
+    )
+    if candidate is None:
+        return None
+
+    claimed = db.execute(
+        update(MonitoringJob)
+        .where(MonitoringJob.id == candidate.id, MonitoringJob.status == "queued")
+        .values(status="running", started_at=now, attempts=MonitoringJob.attempts + 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if claimed.rowcount != 1:
+        return None
+    return db.get(MonitoringJob, candidate.id)
+
+
+# ---------- TERMINAISON ----------
+def finish_job(db: Session, job_id: int, result: dict) -> None:
+    db.execute(
+        update(MonitoringJob)
+        .where(MonitoringJob.id == job_id)
+        .values(status="succeeded", result=result, error=None, finished_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def fail_job(db: Session, job_id: int, error: str) -> str:
+    """Replanifie le job s'il reste des tentatives, sinon le marque en échec."""
+    job = db.get(MonitoringJob, job_id)
+    if job is None:
+        return "missing"
+
+    now = datetime.utcnow()
+    job.error = error
+    if job.attempts < job.max_attempts:
+        job.status = "queued"
+        job.run_after = now + timedelta(seconds=RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1))
+    else:
+        job.status = "failed"
+        job.finished_at = now
+    db.commit()
+    return job.status
+
+
+def requeue_stale_jobs(db: Session) -> int:
+    """Jobs restés `running` après un crash du process qui les exécutait."""
+    now = datetime.utcnow()
+    stale = (
+        db.query(MonitoringJob)
+        .filter(MonitoringJob.status == "running")
+        .all()
+    )
+    count = 0
+    for job in stale:
+        # marge d'une minute au-delà du timeout avant de considérer le job perdu
+        started_at = job.started_at.replace(tzinfo=None) if job.started_at else now
+        if started_at + timedelta(seconds=job.timeout_seconds + 60) < now:
+            job.status = "queued" if job.attempts < job.max_attempts else "failed"
+            job.error = "worker lost"
+            job.run_after = now
+            if job.status == "failed":
+                job.finished_at = now
+            count += 1
+    if count:
+        db.commit()
+    return count
@@ -0,0 +1,160 @@
+"""
+latest_repo.py — dernière ligne de chaque pays (listes /covid/countries/summary et /manage)
+  • instantané reconstruit seulement quand la version de données avance
+    (change_repo.data_version : chaque commit d'écriture, dans l'ordre des commits)
+  • un ordre trié par (champ, sens), calculé à la première demande puis conservé
+  • pagination par curseur (keyset) : le curseur porte la clé de tri de la
+    dernière ligne servie, une écriture entre deux pages ne décale rien
+"""
+
+import base64
+import bisect
+import json
+import threading
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core import instrumentation
+from app.db.models.covid import CovidStat, slugify_country
+from app.db.repositories import change_repo
+
+# champs triables (attributs CovidStat)
+SORT_FIELDS = (
+    "country",
+    "total_confirmed",
+    "total_deaths",
+    "total_recovered",
+    "new_cases",
+    "new_deaths",
+    "new_recovered",
+)
+
+_lock = threading.Lock()
+# (lignes, ordres triés) remplacés ensemble : un lecteur ne mélange pas deux versions
+_snapshot = {"version": None, "data": ([], {})}
+
+
+# ------------------------------------------------------------------
+# Instantané
+# ------------------------------------------------------------------
+def _load_rows(db: Session) -> List[dict]:
+    latest = (
+        db.query(
+            CovidStat.country.label("country"),
+            func.max(CovidStat.date_timestamp).label("max_ts"),
+        )
+        .group_by(CovidStat.country)
+        .subquery()
+    )
+    rows = (
+        db.query(
+            CovidStat.country,
+            CovidStat.country_slug,
+            *[getattr(CovidStat, field) for field in SORT_FIELDS[1:]],
+        )
+        .join(
+            latest,
+            (CovidStat.country == latest.c.country)
+            & (CovidStat.date_timestamp == latest.c.max_ts),
+        )
+        .all()
+    )
+    return [
+        {
+            **row._asdict(),
+            "country_slug": row.country_slug or slugify_country(row.country),
+        }
+        for row in rows
+    ]
+
+
+def _rows(db: Session) -> Tuple[List[dict], dict]:
+    version = change_repo.data_version(db)
+    instrumentation.cache_hit("latest_snapshot", _snapshot["version"] == version)
+    if _snapshot["version"] != version:
+        with _lock:
+            if _snapshot["version"] != version:
+                _snapshot["data"] = (_load_rows(db), {})
+                _snapshot["version"] = version
+    return _snapshot["data"]
+
+
+def _sort_key(row: dict, sort: str) -> list:
+    if sort == "country":
+        return [row["country_slug"], row["country"]]
+    value = row[sort]
+    # NULL plus petit que toute valeur, comme en SQL (en tête en asc, en fin en desc)
+    return [value is not None, value or 0.0, row["country_slug"]]
+
+
+def _ordered(db: Session, sort: str) -> Tuple[List[list], List[dict]]:
+    """(clés croissantes, lignes dans le même ordre) ; le sens desc parcourt à rebours"""
+    rows, orders = _rows(db)
+    if sort not in orders:
+        pairs = sorted(((_sort_key(row, sort), row) for row in rows), key=lambda p: p[0])
+        orders[sort] = ([key for key, _ in pairs], [row for _, row in pairs])
+    return orders[sort]
+
+
+# ------------------------------------------------------------------
+# Curseur opaque : base64 de [champ, sens, clé de la dernière ligne]
+# ------------------------------------------------------------------
+def encode_cursor(sort: str, order: str, key: list) -> str:
+    raw = json.dumps([sort, order, key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, order: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        c_sort, c_order, key = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if (c_sort, c_order) != (sort, order):
+        raise ValueError("Cursor does not match sort/order")
+    return key
+
+
+# ------------------------------------------------------------------
+# Page
+# ------------------------------------------------------------------
+def latest_page(
+    db: Session,
+    sort: str = "country",
+    order: str = "asc",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str], int]:
+    """
+    Retourne (lignes, curseur suivant ou None, nombre total de lignes filtrées).
+    Sans `limit`, toutes les lignes (comportement historique des deux listes).
+    """
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"Invalid sort field: {sort}")
+    keys, rows = _ordered(db, sort)
+    prefix = slugify_country(q) if q else ""
+
+    try:
+        if order == "asc":
+            start = bisect.bisect_right(keys, decode_cursor(cursor, sort, order)) if cursor else 0
+            positions = range(start, len(rows))
+        else:
+            stop = bisect.bisect_left(keys, decode_cursor(cursor, sort, order)) if cursor else len(rows)
+            positions = range(stop - 1, -1, -1)
+    except TypeError:               # clé de curseur d'un autre type que les clés triées
+        raise ValueError("Invalid cursor")
+
+    page, next_cursor = [], None
+    for i in positions:
+        if prefix and not rows[i]["country_slug"].startswith(prefix):
+            continue
+        if limit is not None and len(page) == limit:
+            next_cursor = encode_cursor(sort, order, keys[page[-1]])
+            break
+        page.append(i)
+
+    total = sum(1 for row in rows if row["country_slug"].startswith(prefix)) if prefix else len(rows)
+    return [rows[i] for i in page], next_cursor, total
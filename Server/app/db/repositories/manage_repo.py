@@ -1,82 +1,115 @@
-from typing import List
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, update, delete
+from sqlalchemy import bindparam, update, delete
 
 from app.db.models.covid import CovidStat
+from app.db.repositories.latest_repo import latest_page
+from app.db.repositories.change_repo import record_changes
 from app.schemas.manage import CountryManage
 
 
 # ---------- READ  (1 seule ligne – la plus récente – par pays) ----------
-def list_country_totals(db: Session) -> List[CountryManage]:
+# champ de CountryManage → champ trié de l'instantané (app/db/repositories/latest_repo.py)
+MANAGE_SORT_FIELDS = {
+    "country": "country",
+    "total_cases": "total_confirmed",
+    "total_deaths": "total_deaths",
+    "total_recovered": "total_recovered",
+}
+
+
+def list_country_totals(
+    db: Session,
+    sort: str = "country",
+    order: str = "asc",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+) -> Tuple[List[dict], Optional[str], int]:
     """
     Retourne le « snapshot » le plus récent pour chaque pays.
     `total_confirmed`, `total_deaths`, … sont déjà cumulatifs, on ne les somme plus.
     """
+    rows, next_cursor, total = latest_page(db, MANAGE_SORT_FIELDS[sort], order, limit, cursor, q)
 
-    # Sous-requête : timestamp max pour chaque pays
-    latest_per_country = (
-        db.query(
-            CovidStat.country.label("country"),
-            func.max(CovidStat.date_timestamp).label("max_ts"),
-        )
-        .group_by(CovidStat.country)
-        .subquery()
-    )
+    # dicts à la forme de CountryManage (entiers) : sérialisés tels quels (FastJSONResponse)
+    return [
+        {
+            "id": row["country_slug"],
+            "country": row["country"],
+            "total_cases": int(row["total_confirmed"] or 0),
+            "total_deaths": int(row["total_deaths"] or 0),
+            "total_recovered": int(row["total_recovered"] or 0),
+        }
+        for row in rows
+    ], next_cursor, total
 
-    # On joint pour récupérer la ligne complète correspondant à ce max_ts
-    rows = (
-        db.query(
-            CovidStat.country.label("country"),
-            CovidStat.total_confirmed.label("total_cases"),
-            CovidStat.total_deaths.label("total_deaths"),
-            CovidStat.total_recovered.label("total_recovered"),
-        )
-        .join(
-            latest_per_country,
-            (CovidStat.country == latest_per_country.c.country)
-            & (CovidStat.date_timestamp == latest_per_country.c.max_ts),
-        )
-        .all()
-    )
 
-    # Mapping → schéma Pydantic
+def _countries_matching(db: Session, slugs: List[str]) -> List[str]:
     return [
-        CountryManage(
-            id=row.country.lower().replace(" ", "-"),
-            country=row.country,
-            total_cases=row.total_cases,
-            total_deaths=row.total_deaths,
-            total_recovered=row.total_recovered,
-        )
-        for row in rows
+        row.country
+        for row in db.query(CovidStat.country)
+        .filter(CovidStat.country_slug.in_(slugs))
+        .distinct()
     ]
 
 
-# ---------- UPDATE  (inchangé) ----------
+# ---------- UPDATE ----------
 def update_country_totals(db: Session, cid: str, data: CountryManage) -> CountryManage:
-    slug_to_match = cid.replace("-", " ").lower()
+    return update_many_country_totals(db, [data])[0]
+
+
+def update_many_country_totals(db: Session, items: List[CountryManage]) -> List[CountryManage]:
+    """Une seule transaction : un UPDATE exécuté en lot (executemany) sur l'index country_slug"""
+    if not items:
+        return items
+    slugs = [item.id.lower() for item in items]
 
+    countries = _countries_matching(db, slugs)
+    record_changes(db, countries, "update")
+    table = CovidStat.__table__
     db.execute(
-        update(CovidStat)
-        .where(func.lower(CovidStat.country) == slug_to_match)
+        update(table)
+        .where(table.c.country_slug == bindparam("b_slug"))
         .values(
-            total_confirmed=data.total_cases,
-            total_deaths=data.total_deaths,
-            total_recovered=data.total_recovered,
-        )
-        .execution_options(synchronize_session=False)
+            total_confirmed=bindparam("b_cases"),
+            total_deaths=bindparam("b_deaths"),
+            total_recovered=bindparam("b_recovered"),
+        ),
+        [
+            {
+                "b_slug": slug,
+                "b_cases": item.total_cases,
+                "b_deaths": item.total_deaths,
+                "b_recovered": item.total_recovered,
+            }
+            for slug, item in zip(slugs, items)
+        ],
     )
+    # pandas n'est chargé qu'à la première écriture (démarrage de l'API plus léger)
+    from app.monitoring.features import refresh_features
+    refresh_features(db, countries)
     db.commit()
-    return data
+    return items
 
 
-# ---------- DELETE  (inchangé) ----------
+# ---------- DELETE ----------
 def delete_country(db: Session, cid: str) -> None:
-    slug_to_match = cid.replace("-", " ").lower()
+    delete_countries(db, [cid])
+
+
+def delete_countries(db: Session, cids: List[str]) -> None:
+    slugs = [cid.lower() for cid in cids]
+    if not slugs:
+        return
 
+    countries = _countries_matching(db, slugs)
+    record_changes(db, countries, "delete")
+    from app.monitoring.features import drop_features
+    drop_features(db, countries)
     db.execute(
         delete(CovidStat)
-        .where(func.lower(CovidStat.country) == slug_to_match)
+        .where(CovidStat.country_slug.in_(slugs))
         .execution_options(synchronize_session=False)
     )
     db.commit()
@@ -0,0 +1,64 @@
+import math
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models.covid import CovidStat
+from app.db.models.prediction_log import PredictionLog
+
+DAY_MS = 86_400_000
+
+
+# ------------------------------------------------------------------
+# RMSE glissante : prédictions servies × `New deaths` réels
+# ------------------------------------------------------------------
+def rolling_rmse(db: Session, days: int = 14, country: Optional[str] = None) -> List[dict]:
+    """
+    RMSE par pays et par version de modèle sur les `days` derniers jours
+    pour lesquels des prédictions ont été servies. Seules les prédictions
+    dont le réel est déjà présent dans `covid_stats` sont comptées.
+    """
+    latest = db.query(func.max(PredictionLog.target_ts)).scalar()
+    if latest is None:
+        return []
+    since = int(latest) - days * DAY_MS
+
+    # expressions SQLAlchemy : MySQL en production, SQLite dans les tests ;
+    # SQRT n'est pas portable, la racine est prise ici sur la moyenne des carrés
+    error = PredictionLog.pred_new_deaths - CovidStat.new_deaths
+    mse = func.avg(error * error)
+    query = (
+        db.query(
+            PredictionLog.country,
+            PredictionLog.model_version,
+            func.count().label("n"),
+            mse.label("mse"),
+            func.avg(error).label("bias"),
+            func.min(PredictionLog.target_ts).label("first_ts"),
+            func.max(PredictionLog.target_ts).label("last_ts"),
+        )
+        .join(
+            CovidStat,
+            (CovidStat.country == PredictionLog.country)
+            & (CovidStat.date_timestamp >= PredictionLog.target_ts)
+            & (CovidStat.date_timestamp < PredictionLog.target_ts + DAY_MS),
+        )
+        .filter(PredictionLog.target_ts > since, CovidStat.new_deaths.isnot(None))
+    )
+    if country:
+        query = query.filter(PredictionLog.country == country)
+
+    rows = query.group_by(PredictionLog.country, PredictionLog.model_version).order_by(mse.desc()).all()
+    return [
+        {
+            "country": row.country,
+            "model_version": row.model_version,
+            "n": int(row.n),
+            "rmse": round(math.sqrt(float(row.mse)), 4),
+            "bias": round(float(row.bias), 4),
+            "first_ts": int(row.first_ts),
+            "last_ts": int(row.last_ts),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+
+from app.db.models.user import UserSession
+
+
+# ---------- WRITE ----------
+def create_session(db: Session, user_id: int, jti: str, expires_at: datetime) -> None:
+    """Une ligne par token émis ; les sessions expirées de l'utilisateur sont purgées au passage"""
+    now = datetime.utcnow()
+    db.execute(delete(UserSession).where(UserSession.user_id == user_id, UserSession.expires_at < now))
+    db.add(UserSession(user_id=user_id, token_jti=jti, expires_at=expires_at))
+    db.commit()
+
+
+def _revoke(db: Session, *criteria) -> List[Tuple[str, datetime]]:
+    now = datetime.utcnow()
+    rows = (
+        db.query(UserSession.token_jti, UserSession.expires_at)
+        .filter(*criteria, UserSession.is_revoked.is_(False), UserSession.expires_at > now)
+        .all()
+    )
+    if rows:
+        db.execute(
+            update(UserSession)
+            .where(UserSession.token_jti.in_([jti for jti, _ in rows]))
+            .values(is_revoked=True, revoked_at=now)
+        )
+        db.commit()
+    return [(jti, expires_at) for jti, expires_at in rows]
+
+
+def revoke_token(db: Session, user_id: int, jti: str, expires_at: datetime) -> None:
+    """Révoque un token précis ; un token émis sans session (avant le suivi) reçoit une ligne révoquée"""
+    if _revoke(db, UserSession.token_jti == jti):
+        return
+    if db.query(UserSession.id).filter(UserSession.token_jti == jti).first() is None:
+        db.add(UserSession(user_id=user_id, token_jti=jti, expires_at=expires_at,
+                           is_revoked=True, revoked_at=datetime.utcnow()))
+        db.commit()
+
+
+def revoke_session(db: Session, session_id: int) -> List[Tuple[str, datetime]]:
+    return _revoke(db, UserSession.id == session_id)
+
+
+def revoke_user_sessions(db: Session, user_id: int) -> List[Tuple[str, datetime]]:
+    return _revoke(db, UserSession.user_id == user_id)
+
+
+# ---------- READ ----------
+def revoked_since(db: Session, since: Optional[datetime]) -> List[Tuple[str, datetime, datetime]]:
+    """(jti, expiration, révocation) des tokens révoqués encore valides, depuis `since` (tout si None)"""
+    query = db.query(UserSession.token_jti, UserSession.expires_at, UserSession.revoked_at).filter(
+        UserSession.is_revoked.is_(True), UserSession.expires_at > datetime.utcnow()
+    )
+    if since is not None:
+        query = query.filter(UserSession.revoked_at >= since)
+    return query.all()
+
+
+def active_sessions(db: Session, user_id: Optional[int] = None) -> List[UserSession]:
+    query = db.query(UserSession).filter(
+        UserSession.is_revoked.is_(False), UserSession.expires_at > datetime.utcnow()
+    )
+    if user_id is not None:
+        query = query.filter(UserSession.user_id == user_id)
+    return query.order_by(UserSession.id.desc()).all()
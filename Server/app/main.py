@@ -2,12 +2,26 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
-import time
+from fastapi.responses import JSONResponse, Response
+from contextlib import asynccontextmanager
 import logging
 
-from app.api.endpoints import covid, manage, analytics, metadata, auth
+from app.api.endpoints import covid, manage, analytics, metadata, auth, jobs, export, admission, prometheus, queries
 from app.api import predict
+from app.core.config import settings
+from app.core.http_cache import NotModified
+from app.core.admission import AdmissionMiddleware
+from app.core.middleware import CompressionMiddleware, RequestMiddleware
+from app.core import instrumentation, load_model, process_stats
+from app.core.query_profiler import query_profiler
+from app.core.revocation import revocation_cache
+from app.db import migrations
+from app.db.database import engine
+from app.db.replica import read_engine
+from app.monitoring.runner import job_runner
+from app.monitoring.prediction_log import prediction_log
+from app.analytics.memory import memory_engine
+from app.analytics.duckdb_backend import duckdb_analytics
 
 
 # Configuration des logs
@@ -17,10 +31,65 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Latence SQL exposée sur /metrics, empreintes des requêtes lentes sur /db/queries
+if settings.METRICS_ENABLED:
+    instrumentation.instrument_engine(engine)
+    if read_engine is not None:
+        instrumentation.instrument_engine(read_engine, "replica")
+if settings.QUERY_PROFILER_ENABLED:
+    query_profiler.attach(engine)
+    if read_engine is not None:
+        query_profiler.attach(read_engine, "replica")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Tables et colonnes ajoutées depuis la création de la base (init.sql ne rejoue pas)
+    migrations.migrate()
+    # Jobs de monitoring exécutés hors des threads de requête
+    if settings.JOBS_ENABLED:
+        job_runner.start()
+    if settings.PREDICTION_LOG_ENABLED:
+        prediction_log.start()
+    # Modèle chargé ici plutôt qu'à l'import (déjà fait par le maître gunicorn si préchargé)
+    if settings.MODEL_PRELOAD:
+        load_model.warm_up()
+    # Index région → pays de /metadata construit avant la première requête
+    try:
+        metadata.get_metadata_index()
+    except Exception as e:
+        logger.warning(f"Metadata index not prebuilt: {e}")
+    # Moteur analytique en mémoire (sinon /analytics reste en SQL)
+    if settings.ANALYTICS_ENGINE == "memory":
+        try:
+            memory_engine.start()
+        except Exception as e:
+            logger.error(f"Analytics memory engine failed to load, using SQL: {e}")
+    # Instantané Parquet de DuckDB réexporté dès que la base avance (ingest, /manage)
+    if settings.ANALYTICS_ENGINE == "duckdb":
+        duckdb_analytics.start()
+    # État des métriques partagé avec les autres workers gunicorn
+    if settings.METRICS_ENABLED and settings.METRICS_DIR:
+        instrumentation.metrics_flusher.start()
+    # Tokens révoqués (logout, admin) gardés en mémoire et resynchronisés en tâche de fond
+    revocation_cache.start()
+    # Temps de démarrage et mémoire du worker (partagée avec le maître si préchargé)
+    process_stats.log_ready("Worker")
+    yield
+    if settings.METRICS_ENABLED and settings.METRICS_DIR:
+        instrumentation.metrics_flusher.stop()
+    revocation_cache.stop()
+    memory_engine.stop()
+    duckdb_analytics.stop()
+    if settings.PREDICTION_LOG_ENABLED:
+        prediction_log.stop()
+    if settings.JOBS_ENABLED:
+        job_runner.stop()
+
 app = FastAPI(
     title="COVID-19 Analytics API",
     description="Secure COVID-19 data analytics with admin authentication",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Middleware de sécurité - Hosts autorisés
@@ -29,6 +98,10 @@ app.add_middleware(
     allowed_hosts=["localhost", "0.0.0.0", "*.votre-domaine.com"]
 )
 
+# Contrôle d'admission des routes coûteuses (sous CORS : les 429/503 restent lisibles par le navigateur)
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+
 # CORS sécurisé
 app.add_middleware(
     CORSMiddleware,
@@ -41,68 +114,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # pagination des listes de pays + validateurs des requêtes conditionnelles
+    # + version écrite (lecture de ses écritures, app/db/replica.py)
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag", "Last-Modified", "Retry-After", "X-Data-Version"],
 )
 
-# Middleware de logging des requêtes sécurisé
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    start_time = time.time()
-    
-    # Ne pas logger les mots de passe
-    log_body = True
-    if "/auth/login" in str(request.url):
-        log_body = False
-    
-    # Log de la requête (sans données sensibles)
-    client_ip = request.client.host if request.client else "unknown"
-    logger.info(f"📥 {request.method} {request.url.path} from {client_ip}")
-    
-    try:
-        response = await call_next(request)
-        
-        process_time = time.time() - start_time
-        
-        # Log de la réponse
-        if response.status_code >= 400:
-            logger.warning(
-                f"📤 {request.method} {request.url.path} - "
-                f"Status: {response.status_code} - "
-                f"Time: {process_time:.2f}s"
-            )
-        else:
-            logger.info(
-                f"📤 {request.method} {request.url.path} - "
-                f"Status: {response.status_code} - "
-                f"Time: {process_time:.2f}s"
-            )
-        
-        return response
-        
-    except Exception as e:
-        process_time = time.time() - start_time
-        logger.error(
-            f"💥 {request.method} {request.url.path} - "
-            f"ERROR: {str(e)} - "
-            f"Time: {process_time:.2f}s"
-        )
-        raise
-
-# Headers de sécurité
-@app.middleware("http")
-async def security_headers(request: Request, call_next):
-    response = await call_next(request)
-    
-    # Headers de sécurité standard
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    
-    # HSTS en production uniquement
-    if not request.url.hostname in ["localhost", "127.0.0.1"]:
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    
-    return response
+# Compression des grosses réponses JSON et des exports CSV en flux (bloc par bloc)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# Logging des requêtes + headers de sécurité (un seul middleware ASGI, app/core/middleware.py)
+app.add_middleware(RequestMiddleware)
 
 # Middleware de gestion globale des erreurs
 @app.exception_handler(HTTPException)
@@ -119,9 +140,15 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     
     return JSONResponse(
         status_code=exc.status_code,
-        content={"detail": exc.detail}
+        content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None)   # Retry-After des 429/503 de /auth/login
     )
 
+@app.exception_handler(NotModified)
+async def not_modified_handler(request: Request, exc: NotModified):
+    """Requête conditionnelle satisfaite : 304 sans corps (app/core/http_cache.py)"""
+    return Response(status_code=304, headers=exc.headers)
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Gestionnaire global des erreurs non gérées"""
@@ -141,5 +168,13 @@ app.include_router(manage.router, prefix="/api/v1")
 app.include_router(predict.router, prefix="/api/v1")
 app.include_router(metadata.router, prefix="/api/v1")
 app.include_router(analytics.router, prefix="/api/v1")
+app.include_router(jobs.router, prefix="/api/v1")
+app.include_router(export.router, prefix="/api/v1")
+app.include_router(admission.router, prefix="/api/v1")
+app.include_router(queries.router, prefix="/api/v1")
+
+# Métriques Prometheus : chemin conventionnel /metrics, hors préfixe d'API
+if settings.METRICS_ENABLED:
+    app.include_router(prometheus.router)
 
 
@@ -0,0 +1,181 @@
+"""
+features.py — matérialisation des features du modèle dans `covid_features`
+  • Confirmed_log / Deaths_log : log1p des cumuls (0 reste 0)
+  • Confirmed_log_ma_14         : moyenne glissante 14 jours calendaires de Confirmed_log
+  • cases_per_million / tests_per_million : cumuls rapportés à la population
+  • incrémental : l'ingestion (app/db/ingest.py) ne recalcule que les jours
+    du bloc chargé, plus les 13 jours suivants dont la fenêtre les contient
+  • lecture : load_features() rend un DataFrame aux noms de colonnes du modèle
+
+Usage (depuis Server/) :
+    python -m app.monitoring.features rebuild
+"""
+
+import argparse
+import logging
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.db.models.covid import CovidStat
+from app.db.models.feature import CovidFeature
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = 86_400_000
+WINDOW_DAYS = 14
+# historique nécessaire avant le premier jour recalculé (fenêtre de 14 jours, jour courant inclus)
+WINDOW_MS = (WINDOW_DAYS - 1) * DAY_MS
+
+FEATURE_COLUMNS = [c.name for c in CovidFeature.__table__.columns
+                   if c.name not in ("id", "country", "date_timestamp", "computed_at")]
+
+
+# ------------------------------------------------------------------
+# Calcul (vectorisé, tous pays d'un coup)
+# ------------------------------------------------------------------
+def compute_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    `df` : country, date_timestamp, total_confirmed, total_deaths, total_tests, population.
+    Retourne une ligne par (pays, jour), colonnes = noms des features du modèle.
+    """
+    df = df.sort_values(["country", "date_timestamp"], kind="stable").reset_index(drop=True)
+    population = df["population"].where(df["population"] > 0)
+
+    out = pd.DataFrame({"country": df["country"], "date_timestamp": df["date_timestamp"]})
+    out["Confirmed_log"] = np.log1p(df["total_confirmed"].clip(lower=0))
+    out["Deaths_log"] = np.log1p(df["total_deaths"].clip(lower=0))
+    out["cases_per_million"] = df["total_confirmed"] / population * 1e6
+    out["tests_per_million"] = df["total_tests"] / population * 1e6
+    out["population"] = df["population"]
+
+    # fenêtre en jours calendaires : un jour manquant ne décale pas la moyenne
+    by_day = out.set_index(pd.to_datetime(out["date_timestamp"], unit="ms"))
+    rolling = by_day.groupby("country", sort=True)["Confirmed_log"].rolling(f"{WINDOW_DAYS}D", min_periods=1)
+    # groupby trié par pays, lignes triées par (pays, date) : même ordre que `out`
+    out["Confirmed_log_ma_14"] = rolling.mean().to_numpy()
+    return out
+
+
+def _load_stats(db: Session, countries, start_ts: Optional[int], end_ts: Optional[int]) -> pd.DataFrame:
+    query = db.query(
+        CovidStat.country,
+        CovidStat.date_timestamp,
+        CovidStat.total_confirmed,
+        CovidStat.total_deaths,
+        CovidStat.total_tests,
+        CovidStat.population,
+    ).filter(CovidStat.country.in_(countries), CovidStat.date_timestamp.isnot(None))
+    if start_ts is not None:
+        query = query.filter(CovidStat.date_timestamp >= start_ts)
+    if end_ts is not None:
+        query = query.filter(CovidStat.date_timestamp <= end_ts)
+    rows = query.all()
+    frame = pd.DataFrame(rows, columns=["country", "date_timestamp", "total_confirmed",
+                                        "total_deaths", "total_tests", "population"])
+    # NULL → NaN pour les colonnes numériques
+    return frame.astype({c: "float64" for c in frame.columns[2:]})
+
+
+# ------------------------------------------------------------------
+# Rafraîchissement (dans la transaction de l'appelant, pas de commit ici)
+# ------------------------------------------------------------------
+def refresh_features(
+    db: Session,
+    countries: Iterable[str],
+    min_ts: Optional[int] = None,
+    max_ts: Optional[int] = None,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Recalcule les features des pays donnés sur [min_ts, max_ts + 13 jours].
+    Sans bornes : tout l'historique de ces pays (édition manuelle, reconstruction).
+    """
+    from app.db.ingest import upsert_statement
+
+    countries = sorted(set(countries))
+    if not countries:
+        return 0
+
+    load_from = None if min_ts is None else min_ts - WINDOW_MS
+    load_to = None if max_ts is None else max_ts + WINDOW_MS
+    features = compute_features(_load_stats(db, countries, load_from, load_to))
+    if min_ts is not None:
+        # les jours antérieurs ne servaient qu'à remplir les fenêtres
+        features = features[features["date_timestamp"] >= min_ts]
+    if features.empty:
+        return 0
+
+    features = features.astype({"date_timestamp": "int64"})
+    records = features.astype(object).where(features.notna(), None).to_dict(orient="records")
+    dialect = db.get_bind().dialect.name
+    stmt = upsert_statement(dialect, records, CovidFeature.__table__, ("country", "date_timestamp"))
+    for i in range(0, len(records), batch_size):
+        db.execute(stmt, records[i:i + batch_size])
+    return len(records)
+
+
+def drop_features(db: Session, countries: Iterable[str]) -> None:
+    countries = list(countries)
+    if countries:
+        db.execute(
+            delete(CovidFeature)
+            .where(CovidFeature.country.in_(countries))
+            .execution_options(synchronize_session=False)
+        )
+
+
+def rebuild_features(group_size: int = 50) -> dict:
+    """Reconstruction complète, par groupes de pays (mémoire bornée)"""
+    db = SessionLocal()
+    try:
+        countries = [c for (c,) in db.query(CovidStat.country).filter(CovidStat.country.isnot(None)).distinct()]
+        rows = 0
+        for i in range(0, len(countries), group_size):
+            rows += refresh_features(db, countries[i:i + group_size])
+            db.commit()
+        logger.info(f"covid_features rebuilt: {len(countries)} countries, {rows} rows")
+        return {"countries": len(countries), "rows": rows}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+# ------------------------------------------------------------------
+# Lecture (monitoring, prévision, scoring par lots)
+# ------------------------------------------------------------------
+def load_features(
+    db: Session,
+    countries: Optional[Iterable[str]] = None,
+    start_ts: Optional[int] = None,
+    end_ts: Optional[int] = None,
+) -> pd.DataFrame:
+    table = CovidFeature.__table__
+    columns = ["country", "date_timestamp", *FEATURE_COLUMNS]
+    query = db.query(*[table.c[c] for c in columns])
+    if countries is not None:
+        query = query.filter(table.c.country.in_(list(countries)))
+    if start_ts is not None:
+        query = query.filter(table.c.date_timestamp >= start_ts)
+    if end_ts is not None:
+        query = query.filter(table.c.date_timestamp <= end_ts)
+    rows = query.order_by(table.c.country, table.c.date_timestamp).all()
+    # NULL → NaN, comme les DataFrames de référence du monitoring
+    return pd.DataFrame(rows, columns=columns).astype({c: "float64" for c in FEATURE_COLUMNS})
+
+
+# ─── Entrée en CLI ───────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Features du modèle matérialisées dans covid_features")
+    parser.add_argument("command", choices=["rebuild"])
+    args = parser.parse_args()
+
+    result = rebuild_features()
+    print(f"✅ {result['rows']} lignes de features pour {result['countries']} pays")
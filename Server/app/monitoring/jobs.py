@@ -0,0 +1,74 @@
+"""
+jobs.py — tâches de monitoring exécutées par le runner (app/monitoring/runner.py)
+  • monitoring : RMSE & R² du batch, ajout dans metrics.csv
+  • drift      : rapport de dérive Evidently (features seulement)
+  • report     : évaluation complète + rapport Deepchecks
+  • parquet_export : instantané Parquet de covid_stats pour ANALYTICS_ENGINE=duckdb
+  • features : reconstruction complète de covid_features (app/monitoring/features.py)
+
+Chaque tâche tourne dans un processus fils : les imports lourds (deepchecks,
+evidently, xgboost) restent hors du processus API.
+"""
+
+import datetime
+
+
+def _resolve_batch(batch: str | None):
+    from app.monitoring import monitor
+
+    return batch or monitor.default_batch()
+
+
+def run_monitoring_job(batch: str | None = None, rmse_threshold: float = 0.12) -> dict:
+    from app.monitoring import monitor
+
+    return monitor.run(_resolve_batch(batch), rmse_threshold, report=False)
+
+
+def run_drift_job(batch: str | None = None) -> dict:
+    from evidently.report import Report
+    from evidently.metric_preset import DataDriftPreset
+    from app.monitoring import monitor
+
+    batch = _resolve_batch(batch)
+    ref_df = monitor.load_reference()
+    if ref_df is None:
+        raise FileNotFoundError(f"Référence absente : {monitor.REF_DATA}")
+
+    cur_df = monitor.load_batch(batch)
+    date_str = datetime.date.today().isoformat()
+
+    report = Report(metrics=[DataDriftPreset()])
+    report.run(reference_data=ref_df, current_data=cur_df)
+    monitor.REPORT_DIR.mkdir(exist_ok=True)
+    out_path = monitor.REPORT_DIR / f"drift_{date_str}.html"
+    report.save_html(str(out_path))
+
+    return {"date": date_str, "batch": batch, "artifacts": [out_path.name]}
+
+
+def run_report_job(batch: str | None = None, rmse_threshold: float = 0.12) -> dict:
+    from app.monitoring import monitor
+
+    return monitor.run(_resolve_batch(batch), rmse_threshold, report=True)
+
+
+def run_parquet_export_job() -> dict:
+    from app.analytics.duckdb_backend import export_parquet
+
+    return export_parquet()
+
+
+def run_features_job() -> dict:
+    from app.monitoring.features import rebuild_features
+
+    return rebuild_features()
+
+
+JOB_HANDLERS = {
+    "monitoring": run_monitoring_job,
+    "drift": run_drift_job,
+    "report": run_report_job,
+    "parquet_export": run_parquet_export_job,
+    "features": run_features_job,
+}
@@ -4,6 +4,12 @@ monitor.py — monitoring quotidien avec Deepchecks
   • alerte si RMSE dépasse le seuil
   • sauvegarde metrics.csv
   • génère un rapport HTML Deepchecks (drift + perf)
+  • batch : features matérialisées dans covid_features ("store", par défaut
+    dès que la table est remplie) ou fichier CSV de Server/batches
+
+Usage (depuis Server/) :
+    python -m app.monitoring.monitor --data batches/batch_2025-05-18.csv
+    python -m app.monitoring.monitor --data store:2025-05-18
 """
 
 import argparse
@@ -15,15 +21,8 @@ import pandas as pd
 import numpy as np
 from sklearn.metrics import mean_squared_error, r2_score
 
-from deepchecks.tabular import Dataset
-from deepchecks.tabular.suites import regression_model_validation
-
-# ─── Chemins ────────────────────────────────────────────────────────────────
-BASE_DIR     = pathlib.Path(__file__).resolve().parent
-MODEL_PATH   = BASE_DIR / "app" / "models" / "covid_deaths_xgb.joblib"
-METRICS_PATH = BASE_DIR / "app" / "monitoring" / "metrics.csv"
-REPORT_DIR   = BASE_DIR / "app" / "monitoring"
-REF_DATA     = BASE_DIR / "training_sample.csv"   # échantillon de référence
+from app.data.columnar import read_frame, is_fresh
+from app.monitoring.paths import BASE_DIR, MODEL_PATH, METRICS_PATH, REPORT_DIR, REF_DATA, BATCH_DIR, STORE_BATCH
 
 # ─── Variables du modèle ─────────────────────────────────────────────────────
 FEATURES = [
@@ -47,7 +46,11 @@ def append_metrics(date_str, rmse, r2):
         f.write(f"{date_str},{rmse:.4f},{r2:.4f}\n")
 
 # ─── Génération du rapport Deepchecks ────────────────────────────────────────
-def generate_report(ref_df: pd.DataFrame, cur_df: pd.DataFrame, model, date_str: str):
+def generate_report(ref_df: pd.DataFrame, cur_df: pd.DataFrame, model, date_str: str) -> pathlib.Path:
+    # Import local : deepchecks est lourd et inutile à l'API qui importe ce module
+    from deepchecks.tabular import Dataset
+    from deepchecks.tabular.suites import regression_model_validation
+
     # Préparer les datasets pour Deepchecks
     train_ds = Dataset(ref_df, label=TARGET, cat_features=[])
     test_ds  = Dataset(cur_df, label=TARGET, cat_features=[])
@@ -60,17 +63,74 @@ def generate_report(ref_df: pd.DataFrame, cur_df: pd.DataFrame, model, date_str:
     out_path = REPORT_DIR / f"report_{date_str}.html"
     result.save_as_html(str(out_path))
     print(f"✅ Rapport Deepchecks généré : {out_path}")
+    return out_path
+
+# ─── Chargement des données ──────────────────────────────────────────────────
+def latest_batch() -> pathlib.Path:
+    """Dernier batch déposé dans Server/batches (tri par nom = tri par date)"""
+    batches = sorted(BATCH_DIR.glob("batch_*.csv"))
+    if not batches:
+        raise FileNotFoundError(f"Aucun batch dans {BATCH_DIR}")
+    return batches[-1]
+
+def default_batch() -> str:
+    """Features du dernier jour de covid_features si la table est remplie, sinon dernier CSV"""
+    return STORE_BATCH if _store_last_day() is not None else str(latest_batch())
+
+def _store_last_day():
+    from sqlalchemy import func
+    from app.db.database import SessionLocal
+    from app.db.models.feature import CovidFeature
+
+    db = SessionLocal()
+    try:
+        return db.query(func.max(CovidFeature.date_timestamp)).scalar()
+    finally:
+        db.close()
+
+def load_store_batch(day: str | None = None) -> pd.DataFrame:
+    """Tous les pays d'un jour (dernier calculé par défaut), lus dans covid_features"""
+    from app.db.database import SessionLocal
+    from app.monitoring.features import load_features
+
+    if day:
+        ts = int(pd.Timestamp(day, tz="UTC").timestamp() * 1000)
+    else:
+        ts = _store_last_day()
+        if ts is None:
+            raise FileNotFoundError("covid_features est vide (python -m app.monitoring.features rebuild)")
+    db = SessionLocal()
+    try:
+        frame = load_features(db, start_ts=ts, end_ts=ts)
+    finally:
+        db.close()
+    if frame.empty:
+        raise FileNotFoundError(f"Aucune feature calculée pour {day}")
+    # density, Lat, Long ne sont pas dans covid_features : valeurs manquantes, comme dans les CSV
+    return frame.reindex(columns=FEATURES + [TARGET]).fillna(0)
+
+def load_batch(batch) -> pd.DataFrame:
+    batch = str(batch)
+    if batch == STORE_BATCH or batch.startswith(STORE_BATCH + ":"):
+        return load_store_batch(batch.partition(":")[2] or None)
+    # Cache Arrow mappé en mémoire si à jour (python -m app.data.columnar convert)
+    return read_frame(batch, columns=FEATURES + [TARGET]).fillna(0)
+
+def load_reference():
+    if not (REF_DATA.exists() or is_fresh(REF_DATA)):
+        return None
+    return read_frame(REF_DATA, columns=FEATURES + [TARGET]).fillna(0)
 
 # ─── Programme principal ─────────────────────────────────────────────────────
-def main(batch_csv: str, rmse_threshold: float = 0.12):
+def run(batch_csv: str, rmse_threshold: float = 0.12, report: bool = True) -> dict:
+    """Évaluation d'un batch ; renvoie les métriques et les artefacts produits"""
     date_str = datetime.date.today().isoformat()
 
     # 1) Charger le modèle
     model = joblib.load(MODEL_PATH)
 
     # 2) Charger le batch du jour
-    df = pd.read_csv(batch_csv)
-    df = df[FEATURES + [TARGET]].fillna(0)
+    df = load_batch(batch_csv)
 
     # 3) Prédiction & évaluation
     y_true = df[TARGET]
@@ -80,19 +140,33 @@ def main(batch_csv: str, rmse_threshold: float = 0.12):
     # 4) Sauvegarde métriques & log
     append_metrics(date_str, rmse, r2)
     print(f"✅ {date_str}  RMSE(log)={rmse:.4f}  R²={r2:.4f}")
+    artifacts = [METRICS_PATH.name]
 
     # 5) Rapport drift + performance, si référence dispo
-    if REF_DATA.exists():
-        ref_df = pd.read_csv(REF_DATA)[FEATURES + [TARGET]].fillna(0)
-        generate_report(ref_df, df, model, date_str)
+    ref_df = load_reference() if report else None
+    if ref_df is not None:
+        artifacts.append(generate_report(ref_df, df, model, date_str).name)
 
     # 6) Alerte si dégradation
-    if rmse > rmse_threshold:
+    alert = rmse > rmse_threshold
+    if alert:
         print("🚨 ALERTE : la RMSE dépasse le seuil !")
 
+    return {
+        "date": date_str,
+        "batch": str(batch_csv),
+        "rmse_log": round(rmse, 4),
+        "r2": round(r2, 4),
+        "alert": alert,
+        "artifacts": artifacts,
+    }
+
+def main(batch_csv: str, rmse_threshold: float = 0.12):
+    run(batch_csv, rmse_threshold)
+
 # ─── Entrée en CLI ───────────────────────────────────────────────────────────
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--data", required=True, help="Chemin vers le batch CSV du jour")
+    parser.add_argument("--data", required=True, help="Batch CSV du jour, ou store[:AAAA-MM-JJ]")
     args = parser.parse_args()
     main(args.data)
@@ -0,0 +1,28 @@
+"""
+paths.py — chemins du monitoring, sans dépendance lourde
+  • importé par l'API (app/api/endpoints/jobs.py) sans charger scikit-learn
+    ni pandas, qui restent dans monitor.py
+  • MODEL_PATH (MONITORING_MODEL_PATH) : modèle évalué par monitor.run, distinct
+    de models/pipeline.pkl servi par /predict (autres features) ; absent du
+    dépôt, les jobs qui en dépendent sont refusés à la soumission
+"""
+
+import os
+import pathlib
+
+# ─── Chemins ────────────────────────────────────────────────────────────────
+BASE_DIR     = pathlib.Path(__file__).resolve().parent.parent.parent   # → Server
+MODEL_PATH   = pathlib.Path(os.getenv("MONITORING_MODEL_PATH", BASE_DIR / "app" / "models" / "covid_deaths_xgb.joblib"))
+METRICS_PATH = BASE_DIR / "app" / "monitoring" / "metrics.csv"
+REPORT_DIR   = BASE_DIR / "app" / "monitoring"
+REF_DATA     = BASE_DIR / "training_sample.csv"   # échantillon de référence
+BATCH_DIR    = BASE_DIR / "batches"
+# batch lu dans covid_features (app/monitoring/features.py) : "store" (dernier
+# jour calculé) ou "store:AAAA-MM-JJ"
+STORE_BATCH  = "store"
+# jobs qui chargent MODEL_PATH (monitor.run)
+MODEL_KINDS  = ("monitoring", "report")
+
+
+def model_available() -> bool:
+    return MODEL_PATH.is_file()
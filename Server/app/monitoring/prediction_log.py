@@ -0,0 +1,102 @@
+"""
+prediction_log.py — journal des prédictions servies par /predict
+  • record() : simple append dans une deque bornée (aucune I/O sur la requête)
+  • un thread vide le tampon par lots (INSERT multi-lignes) toutes les
+    PREDICTION_LOG_FLUSH_SECONDS ou dès que PREDICTION_LOG_BATCH lignes attendent
+  • si la base est indisponible, les lignes les plus anciennes sont perdues :
+    c'est de la télémétrie, elle ne doit jamais ralentir /predict
+"""
+
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models.prediction_log import PredictionLog
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionLogBuffer:
+    def __init__(
+        self,
+        max_size: int = settings.PREDICTION_LOG_MAX_BUFFER,
+        batch_size: int = settings.PREDICTION_LOG_BATCH,
+        flush_seconds: float = settings.PREDICTION_LOG_FLUSH_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._rows = deque(maxlen=max_size)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.written = 0
+        self.dropped = 0
+
+    def record(self, **row) -> None:
+        """Appelé sur le chemin de la requête : O(1), sans verrou ni I/O"""
+        if len(self._rows) == self._rows.maxlen:
+            self.dropped += 1
+        row.setdefault("created_at", datetime.utcnow())
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            self._wake.set()
+
+    # ---------- cycle de vie ----------
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="prediction-log", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    # ---------- écriture ----------
+    def _take_batch(self) -> list:
+        rows = []
+        while self._rows and len(rows) < self.batch_size:
+            rows.append(self._rows.popleft())
+        return rows
+
+    def flush(self) -> int:
+        total = 0
+        while True:
+            rows = self._take_batch()
+            if not rows:
+                return total
+            db = SessionLocal()
+            try:
+                db.execute(insert(PredictionLog), rows)
+                db.commit()
+                total += len(rows)
+                self.written += len(rows)
+            except Exception as e:
+                db.rollback()
+                self.dropped += len(rows)
+                logger.warning(f"Prediction log flush failed, {len(rows)} rows dropped: {e}")
+                return total
+            finally:
+                db.close()
+
+    def stats(self) -> dict:
+        return {"pending": len(self._rows), "written": self.written, "dropped": self.dropped}
+
+
+prediction_log = PredictionLogBuffer()
@@ -0,0 +1,196 @@
+"""
+runner.py — exécution des jobs de monitoring hors des threads de requête
+  • un thread superviseur par process API lit la table `monitoring_jobs`
+  • chaque job tourne dans un processus fils (timeout → terminate)
+  • échec / timeout → nouvelle tentative avec backoff (job_repo.fail_job)
+  • planificateur : jobs quotidiens après JOBS_DAILY_HOUR (UTC) ; chaque worker
+    gunicorn planifie, la clé unique (type, jour) n'en laisse passer qu'un ;
+    monitoring et report ne sont pas planifiés sans le modèle (paths.MODEL_PATH)
+"""
+
+import datetime
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.repositories import job_repo
+from app.monitoring import paths
+
+logger = logging.getLogger(__name__)
+
+# "spawn" : le fils ne récupère ni le pool SQLAlchemy ni les threads du parent
+_mp = multiprocessing.get_context("spawn")
+
+
+def _execute(kind: str, params: dict, out_q) -> None:
+    """Point d'entrée du processus fils"""
+    from app.monitoring.jobs import JOB_HANDLERS
+
+    try:
+        out_q.put(("ok", JOB_HANDLERS[kind](**params)))
+    except Exception as e:
+        out_q.put(("error", f"{type(e).__name__}: {e}"))
+
+
+class _RunningJob:
+    def __init__(self, job_id: int, process, out_q, timeout_seconds: int):
+        self.job_id = job_id
+        self.process = process
+        self.out_q = out_q
+        self.deadline = time.monotonic() + timeout_seconds
+        self.outcome = None
+
+
+class JobRunner:
+    def __init__(
+        self,
+        workers: int = settings.JOBS_WORKERS,
+        poll_seconds: float = settings.JOBS_POLL_SECONDS,
+    ):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self._running: dict[int, _RunningJob] = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._skipped: set = set()     # jobs quotidiens non planifiés (modèle absent), signalés une fois
+
+    # ---------- cycle de vie ----------
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="job-runner", daemon=True)
+        self._thread.start()
+        logger.info(f"Job runner started ({self.workers} worker(s), poll {self.poll_seconds}s)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        # Les jobs interrompus repartent en file au prochain démarrage
+        for running in list(self._running.values()):
+            running.process.terminate()
+            self._fail(running.job_id, "interrupted by shutdown")
+        self._running.clear()
+
+    # ---------- boucle ----------
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._schedule_daily()
+                self._reap()
+                self._dispatch()
+            except Exception:
+                logger.exception("Job runner iteration failed")
+            self._stop.wait(self.poll_seconds)
+
+    def _dispatch(self) -> None:
+        while len(self._running) < self.workers:
+            db = SessionLocal()
+            try:
+                job = job_repo.claim_next_job(db)
+                if job is None:
+                    return
+                job_id, kind = job.id, job.kind
+                params, timeout_seconds = dict(job.params or {}), job.timeout_seconds
+            finally:
+                db.close()
+
+            out_q = _mp.Queue()
+            process = _mp.Process(
+                target=_execute, args=(kind, params, out_q), name=f"job-{job_id}", daemon=True
+            )
+            process.start()
+            self._running[job_id] = _RunningJob(job_id, process, out_q, timeout_seconds)
+            logger.info(f"Job {job_id} ({kind}) started in pid {process.pid}")
+
+    def _reap(self) -> None:
+        for job_id, running in list(self._running.items()):
+            # Vider la queue avant le join : un fils bloqué sur put() ne se termine pas
+            if running.outcome is None:
+                try:
+                    running.outcome = running.out_q.get_nowait()
+                except queue.Empty:
+                    pass
+
+            if running.process.is_alive():
+                if time.monotonic() < running.deadline:
+                    continue
+                running.process.terminate()
+                running.process.join(5)
+                self._fail(job_id, "timeout")
+            else:
+                running.process.join()
+                if running.outcome is None:
+                    try:
+                        running.outcome = running.out_q.get(timeout=1)
+                    except queue.Empty:
+                        pass
+                status, payload = running.outcome or ("error", f"exit code {running.process.exitcode}")
+                if status == "ok":
+                    self._finish(job_id, payload)
+                else:
+                    self._fail(job_id, payload)
+
+            del self._running[job_id]
+
+        if not self._running:
+            db = SessionLocal()
+            try:
+                if job_repo.requeue_stale_jobs(db):
+                    logger.warning("Stale monitoring jobs requeued")
+            finally:
+                db.close()
+
+    def _finish(self, job_id: int, result: dict) -> None:
+        db = SessionLocal()
+        try:
+            job_repo.finish_job(db, job_id, result)
+        finally:
+            db.close()
+        logger.info(f"Job {job_id} succeeded")
+
+    def _fail(self, job_id: int, error: str) -> None:
+        db = SessionLocal()
+        try:
+            status = job_repo.fail_job(db, job_id, error)
+        finally:
+            db.close()
+        logger.warning(f"Job {job_id} failed ({error}) → {status}")
+
+    # ---------- planificateur ----------
+    def _schedule_daily(self) -> None:
+        now = datetime.datetime.utcnow()
+        if now.hour < settings.JOBS_DAILY_HOUR:
+            return
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        db = SessionLocal()
+        try:
+            for kind in settings.JOBS_DAILY_KINDS:
+                if job_repo.has_job_since(db, kind, midnight):
+                    continue
+                if kind in paths.MODEL_KINDS and not paths.model_available():
+                    if kind not in self._skipped:
+                        logger.warning(f"Daily {kind} job not scheduled: model {paths.MODEL_PATH} missing")
+                        self._skipped.add(kind)
+                    continue
+                # plusieurs workers peuvent passer le test ci-dessus au même instant :
+                # la clé renvoie alors le job déjà créé
+                job = job_repo.create_job(
+                    db,
+                    kind,
+                    max_attempts=settings.JOB_MAX_ATTEMPTS,
+                    timeout_seconds=settings.JOB_TIMEOUT_SECONDS,
+                    dedupe_key=f"daily:{kind}:{midnight.date().isoformat()}",
+                )
+                logger.info(f"Daily {kind} job scheduled (id={job.id})")
+        finally:
+            db.close()
+
+
+job_runner = JobRunner()
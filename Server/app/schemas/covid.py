@@ -1,4 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
 from pydantic import BaseModel, ConfigDict
 
 
@@ -23,3 +25,18 @@ class CountrySummary(BaseModel):
     deaths_new: float
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class SeriesPoint(BaseModel):
+    date: date
+    value: float
+
+
+class CountrySeries(BaseModel):
+    id: str
+    country: str
+    start: Optional[date] = None
+    end: Optional[date] = None
+    points: Optional[int] = None     # demandé ; chaque métrique en a au plus autant
+    raw_points: Dict[str, int]       # lignes avant réduction, par métrique
+    metrics: Dict[str, List[SeriesPoint]]
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Any, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class JobSubmit(BaseModel):
+    kind: Literal["monitoring", "drift", "report", "parquet_export", "features"]
+    batch: Optional[str] = None            # nom de fichier dans Server/batches, ou store[:AAAA-MM-JJ]
+    rmse_threshold: Optional[float] = Field(None, gt=0)
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: str
+    params: Optional[dict[str, Any]] = None
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    submitted_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
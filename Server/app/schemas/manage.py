@@ -1,4 +1,9 @@
-from pydantic import BaseModel, ConfigDict
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# taille maximale d'un lot PUT/DELETE /covid/countries/manage
+MAX_BATCH = 500
 
 
 class CountryManage(BaseModel):
@@ -21,3 +26,11 @@ class CountryManage(BaseModel):
     #     populate_by_name=True,
     #     from_attributes=True
     # )
+
+
+class CountryBatchUpdate(BaseModel):
+    countries: List[CountryManage] = Field(..., min_length=1, max_length=MAX_BATCH)
+
+
+class CountryBatchDelete(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH)
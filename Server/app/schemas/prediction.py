@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 class InputRow(BaseModel):
     Confirmed: int
@@ -17,3 +17,29 @@ class InputRow(BaseModel):
 class PredictionOut(BaseModel):
     pred_new_deaths: float
 
+
+class CountryQuality(BaseModel):
+    country: str
+    model_version: str
+    n: int
+    rmse: float
+    bias: float
+    first_ts: int
+    last_ts: int
+
+    model_config = ConfigDict(protected_namespaces=())
+
+
+class ModelVersionQuality(BaseModel):
+    model_version: str
+    n: int
+    rmse: float
+
+    model_config = ConfigDict(protected_namespaces=())
+
+
+class ModelQuality(BaseModel):
+    days: int
+    by_model: list[ModelVersionQuality]
+    by_country: list[CountryQuality]
+
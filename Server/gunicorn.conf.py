@@ -0,0 +1,113 @@
+"""
+gunicorn.conf.py — lancement de production (maître gunicorn + workers uvicorn)
+  • N workers, par défaut le nombre de CPU réellement disponibles
+    (affinité et quota cgroup du conteneur), WEB_CONCURRENCY pour forcer
+  • preload_app : l'application et le modèle (app/core/load_model.py) sont chargés
+    une fois dans le maître, puis partagés en copy-on-write par les workers ;
+    gc.freeze() avant le fork évite que le ramasse-miettes ne recopie ces pages
+  • schéma mis à niveau par le maître avant le fork (app/db/migrations.py)
+  • chaque worker journalise son RSS / PSS / mémoire partagée et son temps de
+    démarrage (app/core/process_stats.py) : de quoi dimensionner le conteneur
+  • FORWARDED_ALLOW_IPS : adresses des proxys (nginx du frontend) dont les
+    en-têtes X-Forwarded-For / -Proto sont crus ; request.client devient le
+    vrai client (limite d'échecs de login par IP, app/core/login_guard.py)
+  • METRICS_DIR (défaut : dossier temporaire vidé au démarrage) : /metrics
+    additionne les compteurs de tous les workers
+  • redémarrages progressifs :
+      kill -HUP <maître>   nouveaux workers puis arrêt gracieux des anciens
+                           (même code : l'application est préchargée)
+      kill -USR2 <maître>  nouveau maître avec le nouveau code/modèle, puis
+                           kill -WINCH puis -QUIT sur l'ancien maître
+      MAX_REQUESTS         recyclage périodique, décalé par un jitter
+
+Usage (depuis Server/) :
+    gunicorn app.main:app -c gunicorn.conf.py
+    WEB_CONCURRENCY=4 gunicorn app.main:app -c gunicorn.conf.py
+"""
+
+import gc
+import logging
+import math
+import os
+import shutil
+import tempfile
+
+logger = logging.getLogger("gunicorn.error")
+
+
+def _available_cpus() -> int:
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:      # hors Linux
+        cpus = os.cpu_count() or 1
+    # quota cgroup v2 ("max 100000" si illimité)
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+# ------------------------------------------------------------------
+# Serveur
+# ------------------------------------------------------------------
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv("WEB_CONCURRENCY") or _available_cpus())
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+# Proxys de confiance : sans eux, tout le trafic relayé par nginx partage une IP
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+max_requests = int(os.getenv("MAX_REQUESTS", "0"))                 # 0 = jamais recyclé
+max_requests_jitter = max(1, max_requests // 10) if max_requests else 0
+
+accesslog = None        # RequestMiddleware journalise déjà chaque requête
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+# Un pool OpenMP/BLAS par worker se partage les CPU au lieu de les sursouscrire
+# (fixé avant le préchargement, donc avant l'import de numpy/xgboost)
+os.environ.setdefault("OMP_NUM_THREADS", str(max(1, _available_cpus() // workers)))
+# Dépôt des métriques de chaque worker, lu par GET /metrics (app/core/instrumentation.py)
+os.environ.setdefault("METRICS_DIR", os.path.join(tempfile.gettempdir(), "covid-api-metrics"))
+
+
+# ------------------------------------------------------------------
+# Hooks
+# ------------------------------------------------------------------
+def on_starting(server):
+    # fichiers d'un précédent maître : pids potentiellement réutilisés
+    shutil.rmtree(os.environ["METRICS_DIR"], ignore_errors=True)
+
+
+def when_ready(server):
+    """Application préchargée, aucun worker encore forké"""
+    from app.core.load_model import warm_up
+    from app.core.process_stats import memory_usage
+    from app.db import migrations
+
+    # schéma mis à niveau une seule fois, avant que les workers ne l'inspectent
+    migrations.migrate()
+    # l'import de l'application ne charge plus le modèle : phase explicite, avant le fork
+    warm_up()
+    gc.collect()
+    gc.freeze()     # objets du maître hors du suivi du GC : pages laissées partagées
+    logger.info(
+        f"Master {os.getpid()} preloaded app, {server.num_workers} workers on {bind} - "
+        f"rss={memory_usage().get('rss')}MB"
+    )
+
+
+def post_fork(server, worker):
+    from app.core import process_stats
+    from app.db.database import engine
+
+    process_stats.mark_started()
+    # connexions éventuellement ouvertes par le maître : jamais partagées entre processus
+    engine.dispose(close=False)
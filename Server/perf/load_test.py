@@ -0,0 +1,313 @@
+"""
+load_test.py — test de charge reproductible, sans service externe
+  • jeu covid_stats synthétique (perf/synthetic.py) à l'échelle --scale,
+    sur une base SQLite locale qui tient lieu de MySQL
+  • application complète (app.main, lifespan compris) appelée en ASGI dans le
+    même processus : ni serveur, ni réseau, ni Docker
+  • --users utilisateurs virtuels en boucle fermée, chacun tirant ses actions
+    selon --mix (graine fixe → même séquence d'une exécution à l'autre) :
+      - dashboard : chargement de page (résumé, analytics en parallèle, puis
+        série d'un pays), revalidation If-None-Match aux visites suivantes
+      - predict   : POST /predict sur une ligne tirée du jeu
+      - manage    : liste paginée filtrée, puis PUT d'un pays
+  • rapport JSON par endpoint (modèle de route) : p50 / p95 / p99, débit,
+    statuts ; commit git et paramètres inclus, à comparer d'un commit à l'autre
+
+Usage (depuis Server/) :
+    python -m perf.load_test --scale 1 --users 8 --duration 30
+    python -m perf.load_test --scale 10 --mix dashboard=60,predict=30,manage=10 --output perf/.data/x10.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import pathlib
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from perf import synthetic
+
+SERVER_DIR = pathlib.Path(__file__).resolve().parent.parent
+PASSWORD = "Load-test-password-1!"
+DEFAULT_MIX = "dashboard=70,predict=20,manage=10"
+METRICS = ["cases", "deaths", "recovered"]
+
+
+# ------------------------------------------------------------------
+# Préparation : environnement, jeu de données, comptes
+# ------------------------------------------------------------------
+def _configure(args) -> str:
+    url = args.database_url or synthetic.database_url(args.scale, args.days, args.seed)
+    # lu à l'import de app.* : à poser avant tout import de l'application
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("JOBS_ENABLED", "false")
+    os.environ.setdefault("JWT_SECRET_KEY", "load-test-secret")
+    os.environ["ADMISSION_ENABLED"] = "true" if args.admission else "false"
+    return url
+
+
+def _create_users(count: int) -> list:
+    from app.core.security import get_password_hash
+    from app.db.database import SessionLocal
+    from app.db.models.user import User
+
+    usernames = [f"loadtest-{i}" for i in range(count)]
+    hashed = get_password_hash(PASSWORD)        # un seul hachage bcrypt pour tous les comptes
+    db = SessionLocal()
+    try:
+        existing = {u for (u,) in db.query(User.username).filter(User.username.in_(usernames))}
+        for username in usernames:
+            if username not in existing:
+                db.add(User(username=username, email=f"{username}@load.test", hashed_password=hashed))
+        db.commit()
+    finally:
+        db.close()
+    return usernames
+
+
+def _countries() -> list:
+    from sqlalchemy import distinct, select
+
+    from app.db.database import SessionLocal
+    from app.db.models.covid import CovidStat
+
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(distinct(CovidStat.country), CovidStat.country_slug, CovidStat.continent)
+        ).all()
+    finally:
+        db.close()
+    return sorted(rows)
+
+
+def _git_commit() -> dict:
+    def git(*cmd):
+        out = subprocess.run(["git", *cmd], cwd=SERVER_DIR, capture_output=True, text=True)
+        return out.stdout.strip() if out.returncode == 0 else None
+
+    return {"commit": git("rev-parse", "--short", "HEAD"), "dirty": bool(git("status", "--porcelain", "--", "."))}
+
+
+# ------------------------------------------------------------------
+# Utilisateurs virtuels
+# ------------------------------------------------------------------
+class VirtualUser:
+    def __init__(self, client, username: str, rng: random.Random, countries: list, recorder):
+        self.client = client
+        self.username = username
+        self.rng = rng
+        self.countries = countries
+        self.record = recorder
+        self.headers = {}
+        self.etags = {}
+
+    async def request(self, method: str, label: str, url: str, revalidate: bool = False, **kwargs):
+        headers = dict(self.headers)
+        if revalidate and url in self.etags:
+            headers["If-None-Match"] = self.etags[url]
+        start = time.perf_counter()
+        response = await self.client.request(method, url, headers=headers, **kwargs)
+        self.record(f"{method} {label}", response.status_code, time.perf_counter() - start)
+        if revalidate and "etag" in response.headers:
+            self.etags[url] = response.headers["etag"]
+        return response
+
+    async def login(self) -> None:
+        response = await self.client.post("/api/v1/auth/login", json={"username": self.username, "password": PASSWORD})
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    # ---------- scénarios ----------
+    async def dashboard(self) -> None:
+        metric = self.rng.choice(METRICS)
+        await asyncio.gather(
+            self.request("GET", "/covid/countries/summary", "/api/v1/covid/countries/summary?limit=50&sort=confirmed_total&order=desc", revalidate=True),
+            self.request("GET", "/analytics/{metric}/top", f"/api/v1/analytics/{metric}/top?limit=10", revalidate=True),
+            self.request("GET", "/analytics/{metric}/trend", f"/api/v1/analytics/{metric}/trend", revalidate=True),
+            self.request("GET", "/analytics/{metric}/total", f"/api/v1/analytics/{metric}/total", revalidate=True),
+            self.request("GET", "/analytics/mortality-recovery", "/api/v1/analytics/mortality-recovery", revalidate=True),
+            self.request("GET", "/metadata", "/api/v1/metadata", revalidate=True),
+        )
+        _, slug, _ = self.rng.choice(self.countries)
+        await self.request(
+            "GET", "/covid/countries/{cid}/series",
+            f"/api/v1/covid/countries/{slug}/series?metrics=cases&metrics=deaths&points=200", revalidate=True,
+        )
+
+    async def predict(self) -> None:
+        country, _, region = self.rng.choice(self.countries)
+        confirmed = self.rng.randint(1_000, 500_000)
+        deaths = int(confirmed * self.rng.uniform(0.005, 0.05))
+        recovered = int(confirmed * self.rng.uniform(0.3, 0.9))
+        day = datetime(2020, 3, 1, tzinfo=timezone.utc) + timedelta(days=self.rng.randint(0, 180))
+        await self.request("POST", "/predict", "/api/v1/predict", json={
+            "Confirmed": confirmed,
+            "Deaths": deaths,
+            "Recovered": recovered,
+            "Active": confirmed - deaths - recovered,
+            "New_cases": self.rng.randint(0, 5_000),
+            "New_recovered": self.rng.randint(0, 3_000),
+            "date": day.isoformat(),
+            "Country": country,
+            "WHO_Region": region or "Europe",
+        })
+
+    async def manage(self) -> None:
+        country, slug, _ = self.rng.choice(self.countries)
+        await self.request("GET", "/covid/countries/manage", f"/api/v1/covid/countries/manage?limit=50&q={country[:2]}")
+        cases = self.rng.randint(10_000, 1_000_000)
+        await self.request("PUT", "/covid/countries/{cid}", f"/api/v1/covid/countries/{slug}", json={
+            "id": slug,
+            "country": country,
+            "total_cases": cases,
+            "total_deaths": cases // 50,
+            "total_recovered": cases // 2,
+        })
+
+    async def run(self, mix: list, stop: asyncio.Event, think: float) -> None:
+        names, weights = zip(*mix)
+        while not stop.is_set():
+            await getattr(self, self.rng.choices(names, weights)[0])()
+            if think:
+                await asyncio.sleep(self.rng.expovariate(1 / think))
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.active = False
+
+    def __call__(self, endpoint: str, status: int, seconds: float) -> None:
+        if self.active:
+            self.samples[endpoint].append(seconds)
+            self.statuses[endpoint][status] += 1
+
+
+def _quantile(ordered: list, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def _summary(samples: list, statuses: dict, seconds: float) -> dict:
+    ordered = sorted(samples)
+    return {
+        "requests": len(ordered),
+        "throughput_rps": round(len(ordered) / seconds, 2),
+        "p50_ms": round(_quantile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(_quantile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(_quantile(ordered, 0.99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+        "errors": sum(n for status, n in statuses.items() if status >= 400),
+        "statuses": {str(status): n for status, n in sorted(statuses.items())},
+    }
+
+
+async def run_load(args, mix: list, countries: list, usernames: list) -> dict:
+    import httpx
+
+    from app.main import app
+
+    recorder = Recorder()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=None) as client:
+            users = [
+                VirtualUser(client, username, random.Random(args.seed * 1000 + i), countries, recorder)
+                for i, username in enumerate(usernames)
+            ]
+            for user in users:
+                await user.login()
+
+            stop = asyncio.Event()
+            tasks = [asyncio.create_task(user.run(mix, stop, args.think)) for user in users]
+            await asyncio.sleep(args.warmup)        # caches, plans, modèle : hors mesure
+            recorder.active = True
+            started = time.perf_counter()
+            await asyncio.sleep(args.duration)
+            recorder.active = False
+            elapsed = time.perf_counter() - started
+            stop.set()
+            await asyncio.gather(*tasks)
+
+    all_samples = [s for samples in recorder.samples.values() for s in samples]
+    all_statuses = defaultdict(int)
+    for statuses in recorder.statuses.values():
+        for status, n in statuses.items():
+            all_statuses[status] += n
+    return {
+        "measured_seconds": round(elapsed, 2),
+        "total": _summary(all_samples, all_statuses, elapsed) if all_samples else {"requests": 0},
+        "endpoints": {
+            endpoint: _summary(samples, recorder.statuses[endpoint], elapsed)
+            for endpoint, samples in sorted(recorder.samples.items())
+        },
+    }
+
+
+def parse_mix(value: str) -> list:
+    mix = []
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("dashboard", "predict", "manage"):
+            raise SystemExit(f"Unknown scenario in --mix: {name}")
+        mix.append((name, float(weight or 1)))
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge local sur un jeu synthétique")
+    parser.add_argument("--scale", type=int, default=1, help="Multiplicateur du nombre de pays (1, 10, 100…)")
+    parser.add_argument("--days", type=int, default=synthetic.BASE_DAYS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int, default=8, help="Utilisateurs virtuels concurrents")
+    parser.add_argument("--duration", type=float, default=30, help="Durée mesurée (s)")
+    parser.add_argument("--warmup", type=float, default=3, help="Durée non mesurée avant la mesure (s)")
+    parser.add_argument("--think", type=float, default=0, help="Pause moyenne entre deux actions (s)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Poids des scénarios dashboard / predict / manage")
+    parser.add_argument("--admission", action="store_true", help="Garder le contrôle d'admission actif")
+    parser.add_argument("--database-url", default=None, help="Défaut : SQLite dans perf/.data")
+    parser.add_argument("--output", default=None, help="Fichier JSON (défaut : perf/.data/load_<commit>_x<scale>.json)")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    synthetic.BENCH_DIR.mkdir(exist_ok=True)
+    url = _configure(args)
+
+    from app.db.database import engine
+
+    dataset = synthetic.build(engine, args.scale, args.days, args.seed)
+    usernames = _create_users(args.users)
+    countries = _countries()
+    logging.disable(logging.WARNING)        # un log par requête fausserait la mesure
+    warnings.simplefilter("ignore")         # pays synthétiques inconnus de l'encodeur du modèle
+
+    git = _git_commit()
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": git,
+        "environment": {"python": platform.python_version(), "cpus": os.cpu_count(), "database": url.split(":")[0]},
+        "dataset": dataset,
+        "load": {"users": args.users, "duration": args.duration, "warmup": args.warmup,
+                 "think": args.think, "mix": dict(mix), "admission": args.admission},
+        **asyncio.run(run_load(args, mix, countries, usernames)),
+    }
+
+    output = pathlib.Path(args.output or synthetic.BENCH_DIR / f"load_{git['commit'] or 'nogit'}_x{args.scale}.json")
+    output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report, indent=2))
+    print(f"Report written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+login_storm.py — latence des autres endpoints pendant une tempête de logins
+  • application complète (app.main) appelée en ASGI, sur une base SQLite dédiée
+    (perf/.data/login_storm.db) avec un compte admin haché par bcrypt
+  • sonde : GET --probe (authentifié, SQL + threadpool) en boucle, seule
+    (« baseline ») puis pendant --logins logins concurrents en continu (« storm »)
+  • deux modes comparés : « pool » (bcrypt sur le pool dédié de login_guard)
+    et « inline » (PASSWORD_HASH_WORKERS=0 : bcrypt dans le threadpool partagé)
+  • résultat : p50 / p95 / max de la sonde, logins réussis par seconde et
+    refus 503 du pool, en JSON
+
+Usage (depuis Server/) :
+    python -m perf.login_storm --logins 64 --duration 10
+    python -m perf.login_storm --modes pool --probe /api/v1/admission
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import pathlib
+import statistics
+import time
+
+BENCH_DIR = pathlib.Path(__file__).resolve().parent / ".data"
+USERNAME, PASSWORD = "storm-admin", "Storm-password-1!"
+
+
+def _setup_database() -> None:
+    BENCH_DIR.mkdir(exist_ok=True)
+    db_path = BENCH_DIR / "login_storm.db"
+    if db_path.exists():
+        db_path.unlink()
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("JOBS_ENABLED", "false")
+    os.environ.setdefault("JWT_SECRET_KEY", "login-storm-benchmark-secret")
+    # la tempête ne doit pas être coupée par les autres protections
+    os.environ["ADMISSION_ENABLED"] = "false"
+    os.environ["LOGIN_MAX_FAILURES_IP"] = "1000000"
+
+    from app.core.security import get_password_hash
+    from app.db.database import Base, SessionLocal, engine
+    from app.db.models.user import User, UserSession  # noqa: F401 (tables)
+
+    Base.metadata.create_all(engine, tables=[User.__table__, UserSession.__table__])
+    db = SessionLocal()
+    db.add(User(username=USERNAME, email="storm@covid-app.com", hashed_password=get_password_hash(PASSWORD)))
+    db.commit()
+    db.close()
+
+
+def _percentiles(samples: list) -> dict:
+    samples = sorted(samples)
+    if not samples:
+        return {"requests": 0}
+    return {
+        "requests": len(samples),
+        "p50_ms": round(statistics.median(samples) * 1000, 2),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2),
+    }
+
+
+async def _probe(client, path: str, headers: dict, stop: asyncio.Event, interval: float) -> list:
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def _login_loop(client, stop: asyncio.Event, results: dict) -> None:
+    while not stop.is_set():
+        response = await client.post("/api/v1/auth/login", json={"username": USERNAME, "password": PASSWORD})
+        results[response.status_code] = results.get(response.status_code, 0) + 1
+        if response.status_code == 503:
+            await asyncio.sleep(0.05)
+
+
+async def run_mode(mode: str, args) -> dict:
+    import httpx
+
+    from app.core import login_guard
+    from app.core.config import settings
+    from app.main import app
+
+    workers = settings.PASSWORD_HASH_WORKERS if mode == "pool" else 0
+    login_guard.password_pool = login_guard.PasswordPool(workers, settings.PASSWORD_HASH_QUEUE)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=None) as client:
+        response = await client.post("/api/v1/auth/login", json={"username": USERNAME, "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(client, args.probe, headers, stop, args.interval))
+        await asyncio.sleep(args.duration / 2)
+        stop.set()
+        baseline = await probe
+
+        stop = asyncio.Event()
+        results = {}
+        storm = [asyncio.create_task(_login_loop(client, stop, results)) for _ in range(args.logins)]
+        await asyncio.sleep(0.5)        # tempête installée avant de mesurer
+        probe = asyncio.create_task(_probe(client, args.probe, headers, stop, args.interval))
+        started = time.perf_counter()
+        await asyncio.sleep(args.duration)
+        stop.set()
+        during = await probe
+        await asyncio.gather(*storm)
+        elapsed = time.perf_counter() - started + 0.5
+
+    return {
+        "password_hash_workers": workers,
+        "baseline": _percentiles(baseline),
+        "storm": _percentiles(during),
+        "logins_per_second": round(results.get(200, 0) / elapsed, 1),
+        "login_status": {str(k): v for k, v in sorted(results.items())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latence d'un endpoint pendant une tempête de logins")
+    parser.add_argument("--logins", type=int, default=64, help="Logins concurrents pendant la tempête")
+    parser.add_argument("--duration", type=float, default=10, help="Durée de la tempête (s)")
+    parser.add_argument("--probe", default="/api/v1/admission", help="Endpoint authentifié mesuré")
+    parser.add_argument("--interval", type=float, default=0.02, help="Pause entre deux sondes (s)")
+    parser.add_argument("--modes", default="inline,pool", help="Modes comparés : inline, pool")
+    args = parser.parse_args()
+
+    _setup_database()
+    logging.disable(logging.INFO)       # un log par requête fausserait la mesure
+    report = {
+        "logins": args.logins,
+        "duration_seconds": args.duration,
+        "probe": args.probe,
+        "modes": {mode: asyncio.run(run_mode(mode, args)) for mode in args.modes.split(",")},
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
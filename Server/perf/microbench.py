@@ -0,0 +1,302 @@
+"""
+microbench.py — microbenchmarks des fonctions chaudes, avec références et comparaison
+  • fonctions mesurées : requêtes des dépôts (global, summary, manage),
+    chaque requête /analytics (SQL), verify_token, chemin d'inférence
+    (InputRow → DataFrame → model.predict) et monitor.evaluate
+  • fixtures fixes et à graine : jeu synthétique perf/synthetic.py (SQLite),
+    token signé par une clé fixe, ligne InputRow fixe, vecteurs numpy à graine
+  • à la manière de pytest-benchmark : itérations par série calibrées
+    (--min-time), --rounds séries après une série d'échauffement ; min,
+    médiane, moyenne, écart-type, IQR et opérations/s par benchmark
+  • --save NOM : référence écrite dans perf/baselines/NOM.json (versionnée)
+  • --compare NOM : comparaison à la référence (--stat, min par défaut) ; un
+    benchmark plus lent que --tolerance (20 % par défaut) est remesuré une fois,
+    et s'il reste lent le code de sortie vaut 1
+
+Usage (depuis Server/) :
+    python -m perf.microbench --save default
+    python -m perf.microbench --compare default --tolerance 0.2
+    python -m perf.microbench -k analytics --rounds 30
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import platform
+import statistics
+import sys
+import time
+import warnings
+from datetime import datetime, timezone
+from typing import Callable, Dict, NamedTuple
+
+from perf import synthetic
+
+BASELINE_DIR = pathlib.Path(__file__).resolve().parent / "baselines"
+SEED = 1234
+
+
+class Benchmark(NamedTuple):
+    name: str
+    factory: Callable        # fixtures → fonction mesurée, sans argument
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str):
+    def register(factory):
+        BENCHMARKS[name] = Benchmark(name, factory)
+        return factory
+    return register
+
+
+# ------------------------------------------------------------------
+# Fixtures (graine fixe)
+# ------------------------------------------------------------------
+class Fixtures:
+    def __init__(self, scale: int):
+        import numpy as np
+
+        from app.core.security import create_access_token
+        from app.db.database import SessionLocal, engine
+        from app.schemas.prediction import InputRow
+
+        self.dataset = synthetic.build(engine, scale, synthetic.BASE_DAYS, SEED)
+        self.db = SessionLocal()
+        self.token = create_access_token({"sub": "bench", "jti": "bench-jti"})
+        rng = np.random.default_rng(SEED)
+        self.input_row = InputRow(
+            Confirmed=125_000, Deaths=2_400, Recovered=98_000, Active=24_600,
+            New_cases=1_350, New_recovered=900, date=datetime(2020, 6, 1, tzinfo=timezone.utc),
+            Country="France", WHO_Region="Europe",
+        )
+        self.y_true = rng.normal(5, 2, 5_000)
+        self.y_pred = self.y_true + rng.normal(0, 0.3, 5_000)
+
+    def close(self) -> None:
+        self.db.close()
+
+
+# ------------------------------------------------------------------
+# Benchmarks
+# ------------------------------------------------------------------
+@benchmark("covid.get_global_stats")
+def _global_stats(fx):
+    from app.db.repositories.covid_repo import get_global_stats
+    return lambda: get_global_stats(fx.db)
+
+
+@benchmark("covid.get_countries_summary")
+def _summary(fx):
+    from app.db.repositories.covid_repo import get_countries_summary
+    return lambda: get_countries_summary(fx.db, "confirmed_total", "desc", 50)
+
+
+@benchmark("covid.get_countries_summary[cold]")
+def _summary_cold(fx):
+    from app.db.repositories import latest_repo
+    from app.db.repositories.covid_repo import get_countries_summary
+
+    def run():
+        latest_repo._snapshot["version"] = None     # instantané reconstruit à chaque appel
+        return get_countries_summary(fx.db, "confirmed_total", "desc", 50)
+    return run
+
+
+@benchmark("manage.list_country_totals")
+def _manage_list(fx):
+    from app.db.repositories.manage_repo import list_country_totals
+    return lambda: list_country_totals(fx.db, "country", "asc", 50, None, "A")
+
+
+def _analytics(name: str, method: str, *args):
+    @benchmark(f"analytics.{name}")
+    def factory(fx):
+        from app.db.repositories.analytics_repo import sql_analytics
+        fn = getattr(sql_analytics, method)
+        return lambda: fn(fx.db, *args)
+    return factory
+
+
+_analytics("top_countries", "top_countries", "cases", 10)
+_analytics("newest_values", "newest_values", "deaths", 10)
+_analytics("trend", "trend", "cases", 36500)
+_analytics("mortality_recovery", "mortality_recovery", 10)
+_analytics("total", "total", "recovered")
+
+
+@benchmark("security.verify_token")
+def _verify_token(fx):
+    from app.core.security import verify_token
+    return lambda: verify_token(fx.token)
+
+
+@benchmark("predict.input_frame")
+def _input_frame(fx):
+    from app.api.predict import input_frame
+    return lambda: input_frame(fx.input_row)
+
+
+@benchmark("predict.model_predict")
+def _model_predict(fx):
+    from app.api.predict import input_frame
+    from app.core.load_model import get_model
+
+    model, _ = get_model()
+    frame = input_frame(fx.input_row)
+    return lambda: model.predict(frame)
+
+
+@benchmark("predict.end_to_end")
+def _predict_path(fx):
+    from app.api.predict import input_frame
+    from app.core.load_model import get_model
+
+    model, _ = get_model()
+    return lambda: model.predict(input_frame(fx.input_row))[0]
+
+
+@benchmark("monitor.evaluate")
+def _evaluate(fx):
+    from app.monitoring.monitor import evaluate
+    return lambda: evaluate(fx.y_true, fx.y_pred)
+
+
+# ------------------------------------------------------------------
+# Exécution
+# ------------------------------------------------------------------
+def _calibrate(fn, min_time: float) -> int:
+    """Itérations par série pour qu'une série dure au moins min_time"""
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or iterations >= 1_000_000:
+            return iterations
+        iterations = max(iterations * 2, int(iterations * min_time / max(elapsed, 1e-9)))
+
+
+def run_benchmark(bench: Benchmark, fx: Fixtures, rounds: int, min_time: float) -> dict:
+    fn = bench.factory(fx)
+    fn()                                    # échauffement (caches, imports, plans)
+    iterations = _calibrate(fn, min_time)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        timings.append((time.perf_counter() - start) / iterations)
+    timings.sort()
+    q1, _, q3 = statistics.quantiles(timings, n=4) if len(timings) > 1 else (timings[0],) * 3
+    median = statistics.median(timings)
+    return {
+        "rounds": rounds,
+        "iterations": iterations,
+        "min_us": round(timings[0] * 1e6, 2),
+        "median_us": round(median * 1e6, 2),
+        "mean_us": round(statistics.fmean(timings) * 1e6, 2),
+        "stddev_us": round(statistics.stdev(timings) * 1e6, 2) if len(timings) > 1 else 0.0,
+        "iqr_us": round((q3 - q1) * 1e6, 2),
+        "ops": round(1 / median, 1),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, stat: str = "min") -> dict:
+    """Ratio mesure / référence par benchmark ; « slower » au-delà de 1 + tolérance"""
+    key = f"{stat}_us"
+    rows = {}
+    for name, stats in results.items():
+        ref = baseline["benchmarks"].get(name)
+        if ref is None:
+            rows[name] = {"status": "new", key: stats[key]}
+            continue
+        ratio = stats[key] / ref[key] if ref[key] else 1.0
+        status = "slower" if ratio > 1 + tolerance else "faster" if ratio < 1 - tolerance else "ok"
+        rows[name] = {"status": status, "ratio": round(ratio, 3), key: stats[key], f"baseline_{key}": ref[key]}
+    for name in baseline["benchmarks"].keys() - results.keys():
+        rows[name] = {"status": "not_run"}
+    return rows
+
+
+def _environment() -> dict:
+    return {"python": platform.python_version(), "machine": platform.machine(),
+            "cpus": os.cpu_count(), "system": platform.system()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks des fonctions chaudes")
+    parser.add_argument("-k", dest="select", default=None, help="Sous-chaîne du nom des benchmarks à lancer")
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--min-time", type=float, default=0.02, help="Durée minimale d'une série (s)")
+    parser.add_argument("--scale", type=int, default=1, help="Échelle du jeu synthétique")
+    parser.add_argument("--save", default=None, help="Enregistrer la référence perf/baselines/NOM.json")
+    parser.add_argument("--compare", default=None, help="Comparer à la référence perf/baselines/NOM.json")
+    parser.add_argument("--tolerance", type=float, default=float(os.getenv("MICROBENCH_TOLERANCE", "0.2")),
+                        help="Ralentissement toléré avant échec (0.2 = +20 %%)")
+    parser.add_argument("--stat", choices=["min", "median", "mean"], default="min",
+                        help="Statistique comparée (min : la moins sensible au bruit de la machine)")
+    parser.add_argument("--list", action="store_true", help="Lister les benchmarks")
+    args = parser.parse_args()
+
+    selected = [b for name, b in BENCHMARKS.items() if not args.select or args.select in name]
+    if args.list:
+        print("\n".join(b.name for b in selected))
+        return
+
+    synthetic.BENCH_DIR.mkdir(exist_ok=True)
+    # lu à l'import de app.* : base et clé fixes, avant tout import de l'application
+    os.environ["DATABASE_URL"] = synthetic.database_url(args.scale, synthetic.BASE_DAYS, SEED)
+    os.environ["JWT_SECRET_KEY"] = "microbench-secret"
+    warnings.simplefilter("ignore")
+
+    baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text()) if args.compare else None
+    key = f"{args.stat}_us"
+    fx = Fixtures(args.scale)
+    results = {}
+    try:
+        for bench in selected:
+            results[bench.name] = run_benchmark(bench, fx, args.rounds, args.min_time)
+            print(f"{bench.name:40s} {results[bench.name]['median_us']:>12.2f} µs", file=sys.stderr)
+        if baseline is not None:
+            # un ralentissement n'est retenu que s'il se confirme à une seconde mesure
+            for name, row in compare(results, baseline, args.tolerance, args.stat).items():
+                if row["status"] == "slower":
+                    retry = run_benchmark(BENCHMARKS[name], fx, args.rounds, args.min_time)
+                    results[name] = min(results[name], retry, key=lambda r: r[key])
+    finally:
+        fx.close()
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": _environment(),
+        "dataset": {k: v for k, v in fx.dataset.items() if k != "ingest"},
+        "benchmarks": results,
+    }
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        (BASELINE_DIR / f"{args.save}.json").write_text(json.dumps(report, indent=2) + "\n")
+
+    exit_code = 0
+    if baseline is not None:
+        report["comparison"] = {
+            "baseline": args.compare,
+            "tolerance": args.tolerance,
+            "stat": args.stat,
+            # références prises sur une autre machine : ratios indicatifs seulement
+            "same_environment": baseline.get("environment") == report["environment"],
+            "benchmarks": compare(results, baseline, args.tolerance, args.stat),
+        }
+        slower = [n for n, row in report["comparison"]["benchmarks"].items() if row["status"] == "slower"]
+        report["comparison"]["slower"] = slower
+        exit_code = 1 if slower else 0
+
+    print(json.dumps(report, indent=2))
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
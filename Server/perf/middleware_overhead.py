@@ -0,0 +1,140 @@
+"""
+middleware_overhead.py — coût par requête des middlewares de main.py
+  • « before » : les deux @app.middleware("http") historiques (BaseHTTPMiddleware)
+  • « after »  : RequestMiddleware (app/core/middleware.py), ASGI pur
+  • « bare »   : même application sans middleware (référence)
+  • appels ASGI directs, sans réseau ni serveur : seul le coût applicatif est mesuré
+  • résultat : µs par requête (médiane des séries) et surcoût par rapport à « bare », en JSON
+
+Usage (depuis Server/) :
+    python -m perf.middleware_overhead --requests 20000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from fastapi import FastAPI, Request
+
+from app.core.middleware import RequestMiddleware
+
+logger = logging.getLogger("perf.middleware")
+
+
+def _bare_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    return app
+
+
+def before_app() -> FastAPI:
+    """Copie des middlewares retirés de main.py, pour comparaison"""
+    app = _bare_app()
+
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        start_time = time.time()
+        client_ip = request.client.host if request.client else "unknown"
+        logger.info(f"📥 {request.method} {request.url.path} from {client_ip}")
+        try:
+            response = await call_next(request)
+            process_time = time.time() - start_time
+            if response.status_code >= 400:
+                logger.warning(f"📤 {request.method} {request.url.path} - Status: {response.status_code} - Time: {process_time:.2f}s")
+            else:
+                logger.info(f"📤 {request.method} {request.url.path} - Status: {response.status_code} - Time: {process_time:.2f}s")
+            return response
+        except Exception as e:
+            logger.error(f"💥 {request.method} {request.url.path} - ERROR: {str(e)} - Time: {time.time() - start_time:.2f}s")
+            raise
+
+    @app.middleware("http")
+    async def security_headers(request: Request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        if not request.url.hostname in ["localhost", "127.0.0.1"]:
+            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        return response
+
+    return app
+
+
+def after_app() -> FastAPI:
+    app = _bare_app()
+    app.add_middleware(RequestMiddleware)
+    return app
+
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/ping",
+    "raw_path": b"/ping",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"api.example.org"), (b"user-agent", b"bench")],
+    "client": ("10.0.0.1", 50000),
+    "server": ("api.example.org", 80),
+}
+
+
+async def _run(app, n: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(SCOPE), receive, send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def measure(apps: dict, n: int, rounds: int) -> dict:
+    """Séries entrelacées (bare, before, after, bare, …) : même bruit machine pour les trois"""
+    for app in apps.values():
+        asyncio.run(_run(app, 200))     # échauffement (pile de middlewares construite)
+    timings = {name: [] for name in apps}
+    for _ in range(rounds):
+        for name, app in apps.items():
+            timings[name].append(asyncio.run(_run(app, n)))
+    return {name: round(statistics.median(values), 2) for name, values in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Surcoût par requête des middlewares")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    # niveau INFO comme en production, sortie jetée : le formatage des messages est compté
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])
+
+    results = measure({"bare": _bare_app(), "before": before_app(), "after": after_app()},
+                      args.requests, args.rounds)
+    print(json.dumps({
+        "requests": args.requests,
+        "us_per_request": results,
+        "overhead_us": {
+            "before": round(results["before"] - results["bare"], 2),
+            "after": round(results["after"] - results["bare"], 2),
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
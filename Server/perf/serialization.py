@@ -0,0 +1,135 @@
+"""
+serialization.py — sérialisation et taille sur le réseau des endpoints à gros volume
+  • « pydantic » : chemin historique (un modèle par ligne, validation du
+    response_model, jsonable_encoder, json.dumps de JSONResponse)
+  • « orjson »   : dicts sérialisés directement (FastJSONResponse)
+  • octets : brut, gzip (niveau de CompressionMiddleware), brotli si installé
+  • données construites depuis data_cleaned_used.csv, pays répliqués `--scale` fois
+  • résultat JSON : µs par réponse (médiane) et octets par endpoint
+
+Usage (depuis Server/) :
+    python -m perf.serialization --scale 10
+"""
+
+import argparse
+import gzip
+import json
+import pathlib
+import statistics
+import time
+from typing import List
+
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.middleware import CompressionMiddleware, brotli
+from app.core.responses import FastJSONResponse
+from app.schemas.covid import CountrySeries, CountrySummary
+from app.schemas.manage import CountryManage
+
+SOURCE_CSV = pathlib.Path(__file__).resolve().parent.parent / "app" / "data" / "data_cleaned_used.csv"
+
+
+def build_payloads(scale: int) -> dict:
+    df = pd.read_csv(SOURCE_CSV).rename(columns={"New cases": "new_cases", "New deaths": "new_deaths"})
+    latest = df.sort_values("Date").groupby("Country").tail(1)
+    latest = pd.concat(
+        [latest.assign(Country=latest["Country"] + (f" #{k}" if k else "")) for k in range(scale)]
+    )
+    summary = [
+        {
+            "id": row.Country.lower().replace(" ", "-"),
+            "country": row.Country,
+            "confirmed_total": float(row.Confirmed),
+            "confirmed_new": float(row.new_cases),
+            "deaths_total": float(row.Deaths),
+            "deaths_new": float(row.new_deaths),
+        }
+        for row in latest.itertuples()
+    ]
+    manage = [
+        {
+            "id": row["id"],
+            "country": row["country"],
+            "total_cases": int(row["confirmed_total"]),
+            "total_deaths": int(row["deaths_total"]),
+            "total_recovered": 0,
+        }
+        for row in summary
+    ]
+    trend = [
+        {"name": day, "value": int(value)}
+        for day, value in df.groupby("Date")["new_cases"].sum().items()
+    ]
+    france = df[df["Country"] == "France"]
+    series = {
+        "id": "france",
+        "country": "France",
+        "start": None,
+        "end": None,
+        "points": None,
+        "raw_points": {m: len(france) for m in ("cases", "deaths", "total_cases")},
+        "metrics": {
+            metric: [{"date": d, "value": float(v)} for d, v in zip(france["Date"], france[column])]
+            for metric, column in [("cases", "new_cases"), ("deaths", "new_deaths"), ("total_cases", "Confirmed")]
+        },
+    }
+    return {
+        "countries/summary": (summary, List[CountrySummary], True),
+        "countries/manage": (manage, List[CountryManage], True),
+        "countries/{id}/series": (series, CountrySeries, True),
+        "analytics/{metric}/trend": (trend, None, False),
+    }
+
+
+def pydantic_path(data, model, as_models: bool) -> bytes:
+    """Ce que faisait FastAPI : modèles construits par le repository, revalidés, encodés, json.dumps"""
+    if model is not None:
+        adapter = TypeAdapter(model)
+        content = adapter.validate_python(data) if as_models else data
+        content = adapter.dump_python(adapter.validate_python(content), mode="json")
+    else:
+        content = data
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def orjson_path(data, model, as_models: bool) -> bytes:
+    return FastJSONResponse(data).body
+
+
+def timed(fn, *args, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return round(statistics.median(timings), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sérialisation JSON et compression des réponses")
+    parser.add_argument("--scale", type=int, default=10, help="Réplication des pays")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    compressor = CompressionMiddleware(None)
+    report = {"scale": args.scale, "endpoints": {}}
+    for name, (data, model, as_models) in build_payloads(args.scale).items():
+        body = orjson_path(data, model, as_models)
+        assert json.loads(body) == json.loads(pydantic_path(data, model, as_models)), name
+        wire = {"raw": len(body), "gzip": len(compressor._compress(body, "gzip"))}
+        if brotli is not None:
+            wire["br"] = len(compressor._compress(body, "br"))
+        report["endpoints"][name] = {
+            "us_pydantic": timed(pydantic_path, data, model, as_models, repeat=args.repeat),
+            "us_orjson": timed(orjson_path, data, model, as_models, repeat=args.repeat),
+            "us_gzip": timed(gzip.compress, body, compressor.gzip_level, repeat=args.repeat),
+            "bytes": wire,
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
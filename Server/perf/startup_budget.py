@@ -0,0 +1,90 @@
+"""
+startup_budget.py — temps d'import de app.main et garde-fou de démarrage
+  • `import app.main` chronométré dans des interpréteurs neufs (médiane de --runs)
+  • rapport -X importtime : modules les plus coûteux (temps propre et cumulé)
+  • échec (code de sortie 1) si la médiane dépasse --budget secondes, ou si une
+    dépendance lourde censée être chargée à la demande est importée au démarrage
+    (pandas, scikit-learn, xgboost, passlib, jose, pyarrow, duckdb…)
+  • résultat JSON ; mêmes contrôles dans la suite pytest (tests/test_startup.py)
+
+Usage (depuis Server/) :
+    python -m perf.startup_budget --budget 2.0
+    python -m perf.startup_budget --top 30 --runs 5
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+
+SERVER_DIR = pathlib.Path(__file__).resolve().parent.parent
+
+# chargés au premier usage ou dans la phase de démarrage explicite (lifespan / maître gunicorn)
+LAZY_MODULES = ["pandas", "sklearn", "scipy", "xgboost", "joblib", "passlib", "jose", "pyarrow", "duckdb"]
+
+PROBE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import app.main\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(json.dumps({'seconds': elapsed, 'eager': [m for m in %r if m in sys.modules]}))\n"
+) % (LAZY_MODULES,)
+
+
+def _env() -> dict:
+    # pas de base MySQL nécessaire : l'import ne se connecte pas
+    return {**os.environ, "DATABASE_URL": os.environ.get("DATABASE_URL", "sqlite://")}
+
+
+def timed_import() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=SERVER_DIR, env=_env(),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def import_profile(top: int) -> list:
+    """Lignes de -X importtime : (module, propre µs, cumulé µs), triées par cumulé"""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=SERVER_DIR, env=_env(),
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({"module": name.strip(), "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    rows.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps d'import de app.main et budget de démarrage")
+    parser.add_argument("--budget", type=float, default=float(os.getenv("STARTUP_BUDGET_SECONDS", "2.0")),
+                        help="Secondes maximales pour `import app.main` (médiane)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=20, help="Modules listés dans le rapport")
+    args = parser.parse_args()
+
+    runs = [timed_import() for _ in range(args.runs)]
+    median = statistics.median(r["seconds"] for r in runs)
+    eager = sorted({m for r in runs for m in r["eager"]})
+    report = {
+        "budget_seconds": args.budget,
+        "import_seconds": round(median, 3),
+        "runs": [round(r["seconds"], 3) for r in runs],
+        "eager_heavy_modules": eager,
+        "top_imports": import_profile(args.top),
+    }
+    report["ok"] = median <= args.budget and not eager
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
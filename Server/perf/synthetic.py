@@ -0,0 +1,142 @@
+"""
+synthetic.py — jeu covid_stats synthétique et reproductible, à l'échelle voulue
+  • échelle 1 : BASE_COUNTRIES pays × BASE_DAYS jours ; `--scale` multiplie le
+    nombre de pays, `--days` allonge les séries (10x, 100x : pays × jours)
+  • noms de pays et régions OMS tirés par Faker (version épinglée dans
+    requirements.txt), séries cumulées par marche aléatoire numpy : même
+    graine → mêmes lignes, d'une machine à l'autre
+  • format du CSV d'origine (Date, Country, Confirmed, …, WHO Region) : chargé
+    par app.db.ingest.ingest_frames, comme une vraie ingestion
+  • base SQLite réutilisée si elle contient déjà le jeu demandé
+
+Usage (depuis Server/) :
+    python -m perf.synthetic --scale 10 --database-url sqlite:///perf/.data/load_x10.db
+"""
+
+import argparse
+import json
+import logging
+import os
+import pathlib
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = pathlib.Path(__file__).resolve().parent / ".data"
+BASE_COUNTRIES = 50
+BASE_DAYS = 200
+START_DATE = "2020-01-22"
+WHO_REGIONS = ["Africa", "Americas", "Eastern Mediterranean", "Europe", "South-East Asia", "Western Pacific"]
+
+
+def country_names(count: int, seed: int) -> list:
+    from faker import Faker
+
+    fake = Faker()
+    fake.seed_instance(seed)
+    names = []
+    seen = set()
+    while len(names) < count:
+        name = fake.country()
+        if name in seen:        # réservoir Faker épuisé : suffixe numérique
+            name = f"{name} {len(names)}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def synthetic_frames(scale: int = 1, days: int = BASE_DAYS, seed: int = 42,
+                     countries_per_frame: int = 50) -> Iterator[pd.DataFrame]:
+    """Blocs de `countries_per_frame` pays × `days` jours, au format du CSV d'origine"""
+    rng = np.random.default_rng(seed)
+    names = country_names(BASE_COUNTRIES * scale, seed)
+    dates = pd.date_range(START_DATE, periods=days, freq="D").strftime("%Y-%m-%d")
+
+    for offset in range(0, len(names), countries_per_frame):
+        block = names[offset:offset + countries_per_frame]
+        n = len(block)
+        # nouveaux cas : croissance log-normale par pays, bruit quotidien
+        growth = rng.lognormal(mean=3.0, sigma=1.2, size=(n, 1))
+        new_cases = rng.poisson(growth * (1 + np.sin(np.linspace(0, 6, days)) ** 2)).astype("int64")
+        new_deaths = rng.binomial(new_cases, 0.02)
+        new_recovered = rng.binomial(new_cases, 0.7)
+        confirmed = new_cases.cumsum(axis=1)
+        deaths = new_deaths.cumsum(axis=1)
+        recovered = new_recovered.cumsum(axis=1)
+        yield pd.DataFrame({
+            "Date": np.tile(dates, n),
+            "Country": np.repeat(block, days),
+            "Confirmed": confirmed.ravel(),
+            "Deaths": deaths.ravel(),
+            "Recovered": recovered.ravel(),
+            "Active": (confirmed - deaths - recovered).ravel(),
+            "New cases": new_cases.ravel(),
+            "New deaths": new_deaths.ravel(),
+            "New recovered": new_recovered.ravel(),
+            "WHO Region": np.repeat(rng.choice(WHO_REGIONS, size=n), days),
+        })
+
+
+def database_url(scale: int, days: int, seed: int) -> str:
+    return f"sqlite:///{BENCH_DIR / f'load_x{scale}_d{days}_s{seed}.db'}"
+
+
+def create_schema(engine) -> None:
+    """Toutes les tables des modèles (init.sql n'est pas rejoué sur SQLite)"""
+    import importlib
+    import pkgutil
+
+    import app.db.models
+    from app.db.database import Base
+
+    for module in pkgutil.iter_modules(app.db.models.__path__):
+        importlib.import_module(f"app.db.models.{module.name}")
+    Base.metadata.create_all(engine)
+
+
+def build(engine, scale: int = 1, days: int = BASE_DAYS, seed: int = 42) -> dict:
+    """Crée les tables et charge le jeu (sauf s'il est déjà présent) ; renvoie sa description"""
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import sessionmaker
+
+    from app.db import ingest
+    from app.db.models.covid import CovidStat
+
+    create_schema(engine)
+    expected = BASE_COUNTRIES * scale * days
+    with engine.connect() as conn:
+        existing = conn.execute(select(func.count()).select_from(CovidStat.__table__)).scalar()
+    info = {"scale": scale, "days": days, "seed": seed, "countries": BASE_COUNTRIES * scale, "rows": expected}
+    if existing == expected:
+        return {**info, "ingest": "reused"}
+    if existing:
+        raise SystemExit(f"Benchmark table holds {existing} rows, expected {expected}: use an empty database")
+
+    db = sessionmaker(bind=engine)()
+    try:
+        stats = ingest.ingest_frames(db, synthetic_frames(scale, days, seed))
+    finally:
+        db.close()
+    return {**info, "ingest": stats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jeu covid_stats synthétique")
+    parser.add_argument("--scale", type=int, default=1, help="Multiplicateur du nombre de pays")
+    parser.add_argument("--days", type=int, default=BASE_DAYS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default=None, help="Défaut : SQLite dans perf/.data")
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine
+
+    logging.basicConfig(level=logging.INFO)
+    BENCH_DIR.mkdir(exist_ok=True)
+    url = args.database_url or database_url(args.scale, args.days, args.seed)
+    os.environ.setdefault("DATABASE_URL", url)      # app.db.database lu à l'import
+    print(json.dumps(build(create_engine(url), args.scale, args.days, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+conftest.py — base SQLite jetable pour la suite de tests
+  • app.* lit DATABASE_URL et ses réglages à l'import : fixés ici, avant tout
+    import de l'application
+  • jeu covid_stats synthétique à graine fixe (perf/synthetic.py), construit
+    une fois par session
+  • client HTTP de l'application (sans lifespan : pas de job runner ni de
+    threads de synchronisation) et en-têtes d'un administrateur connecté
+
+Usage (depuis Server/) :
+    python -m pytest
+"""
+
+import os
+import pathlib
+import shutil
+import tempfile
+
+import pytest
+
+TMP_DIR = pathlib.Path(tempfile.mkdtemp(prefix="covid-tests-"))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{TMP_DIR / 'tests.db'}"
+os.environ["ANALYTICS_PARQUET_PATH"] = str(TMP_DIR / "covid_stats.parquet")
+os.environ["JWT_SECRET_KEY"] = "tests-secret"
+os.environ["JOBS_ENABLED"] = "false"
+# limites d'admission testées sur le middleware seul (test_admission.py)
+os.environ["ADMISSION_ENABLED"] = "false"
+
+DATASET_DAYS = 120
+DATASET_SEED = 7
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _tmp_dir():
+    yield TMP_DIR
+    shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    """covid_stats chargé par la vraie ingestion (ingest_frames), séries terminées aujourd'hui"""
+    from datetime import date, timedelta
+
+    from perf import synthetic
+    from app.db.database import engine
+
+    # fenêtres /trend (1, 30, 365 jours avant aujourd'hui) non vides
+    synthetic.START_DATE = (date.today() - timedelta(days=DATASET_DAYS - 1)).isoformat()
+    return synthetic.build(engine, 1, DATASET_DAYS, DATASET_SEED)
+
+
+@pytest.fixture
+def db(dataset):
+    from app.db.database import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+ADMIN_PASSWORD = "tests-password"
+
+
+@pytest.fixture(scope="session")
+def admin(dataset):
+    from app.core.security import get_password_hash
+    from app.db.database import SessionLocal
+    from app.db.models.user import User
+
+    session = SessionLocal()
+    try:
+        user = User(username="admin", email="admin@example.com",
+                    hashed_password=get_password_hash(ADMIN_PASSWORD), role="admin")
+        session.add(user)
+        session.commit()
+        return user.username
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def client(dataset):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    return TestClient(app, base_url="http://localhost")
+
+
+@pytest.fixture
+def login(client, admin):
+    """Connexion d'un utilisateur (admin par défaut) ; renvoie l'en-tête Authorization"""
+    def _login(username: str = admin, password: str = ADMIN_PASSWORD) -> dict:
+        response = client.post("/api/v1/auth/login", json={"username": username, "password": password})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return _login
+
+
+@pytest.fixture
+def admin_headers(login):
+    return login()
@@ -0,0 +1,123 @@
+"""AdmissionMiddleware piloté directement (ASGI), devant une application factice"""
+
+import asyncio
+
+import pytest
+
+from app.core import admission
+from app.core.config import settings
+
+ANALYTICS = f"{settings.API_V1_STR}/analytics/top"
+
+
+class FakeApp:
+    """Répond 200 ; retient les requêtes tant que `hold` n'est pas levé"""
+
+    def __init__(self):
+        self.hold = asyncio.Event()
+        self.hold.set()
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await self.hold.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def request(app, path: str = ANALYTICS, ip: str = "10.0.0.1", method: str = "GET"):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": [], "client": (ip, 1234)}
+    await app(scope, None, send)
+    start = messages[0]
+    return start["status"], dict(start["headers"])
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    def _gate(rate=100.0, burst=100, in_flight=10, queue=10, timeout=1.0):
+        created = admission.AdmissionGate("analytics", rate, burst, in_flight, queue)
+        monkeypatch.setitem(admission.gates, "analytics", created)
+        monkeypatch.setattr(settings, "ADMISSION_QUEUE_TIMEOUT", timeout)
+        return created
+    return _gate
+
+
+def test_unguarded_route_passes_through(gate):
+    gate(rate=0.0, burst=0)
+    app = FakeApp()
+    status, _ = asyncio.run(request(admission.AdmissionMiddleware(app), f"{settings.API_V1_STR}/covid/global"))
+    assert status == 200 and app.calls == 1
+
+
+def test_token_bucket_429_with_retry_after(gate):
+    g = gate(rate=0.5, burst=2)
+    middleware = admission.AdmissionMiddleware(FakeApp())
+
+    async def scenario():
+        first = [await request(middleware) for _ in range(3)]
+        other_ip = await request(middleware, ip="10.0.0.2")       # seau distinct
+        return first, other_ip
+
+    first, other_ip = asyncio.run(scenario())
+    assert [status for status, _ in first] == [200, 200, 429]
+    assert first[2][1][b"retry-after"] == b"2"                   # 1 jeton à 0.5/s
+    assert other_ip[0] == 200
+    assert g.counters["rejected_rate"] == 1 and g.in_flight == 0
+
+
+def test_queue_full_then_queued_request_admitted(gate):
+    g = gate(in_flight=1, queue=1, timeout=5)
+    app = FakeApp()
+    middleware = admission.AdmissionMiddleware(app)
+
+    async def scenario():
+        app.hold.clear()
+        running = asyncio.create_task(request(middleware))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(request(middleware))
+        await asyncio.sleep(0)
+        rejected = await request(middleware)                     # place et file occupées
+        assert (g.in_flight, len(g.waiters)) == (1, 1)
+        app.hold.set()
+        return rejected, await running, await queued
+
+    rejected, running, queued = asyncio.run(scenario())
+    assert rejected[0] == 503
+    assert rejected[1][b"retry-after"] == str(settings.ADMISSION_RETRY_AFTER).encode()
+    assert running[0] == 200 and queued[0] == 200
+    assert g.in_flight == 0 and not g.waiters
+    assert g.counters["rejected_queue_full"] == 1 and g.counters["queued"] == 1
+
+
+def test_queue_timeout_503(gate):
+    g = gate(in_flight=1, queue=5, timeout=0.05)
+    app = FakeApp()
+    middleware = admission.AdmissionMiddleware(app)
+
+    async def scenario():
+        app.hold.clear()
+        running = asyncio.create_task(request(middleware))
+        await asyncio.sleep(0)
+        timed_out = await request(middleware)
+        app.hold.set()
+        await running
+        return timed_out
+
+    status, headers = asyncio.run(scenario())
+    assert status == 503 and b"retry-after" in headers
+    assert g.counters["rejected_timeout"] == 1
+    assert g.in_flight == 0 and not g.waiters
+
+
+def test_route_groups():
+    prefix = settings.API_V1_STR
+    assert admission.route_group("POST", f"{prefix}/predict") == "predict"
+    assert admission.route_group("GET", f"{prefix}/predict/health") is None
+    assert admission.route_group("GET", f"{prefix}/covid/countries/manage") == "manage"
+    assert admission.route_group("PUT", f"{prefix}/covid/countries/france") == "manage"
+    assert admission.route_group("GET", f"{prefix}/covid/countries/summary") is None
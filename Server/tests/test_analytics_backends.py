@@ -0,0 +1,35 @@
+"""perf/analytics_backends.py : jeu agrandi construit, une requête par moteur"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.analytics.memory import MemoryAnalyticsEngine
+from app.db.repositories.analytics_repo import sql_analytics
+from perf import analytics_backends
+
+
+def test_build_dataset_then_query_each_backend(tmp_path):
+    pytest.importorskip("duckdb")
+    if not analytics_backends.SOURCE_CSV.exists():
+        pytest.skip("data_cleaned_used.csv absent")
+    from app.analytics.duckdb_backend import DuckDBAnalytics, export_parquet
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'bench.db'}")
+    rows = analytics_backends.build_dataset(engine, 1)
+    assert rows > 0
+    assert analytics_backends.build_dataset(engine, 1) == rows        # jeu réutilisé
+
+    parquet = tmp_path / "bench.parquet"
+    export_parquet(parquet, engine=engine)
+    memory = MemoryAnalyticsEngine(session_factory=sessionmaker(bind=engine))
+    memory.load()
+
+    db = sessionmaker(bind=engine)()
+    try:
+        expected = sql_analytics.top_countries(db, "cases", 5)
+        assert expected
+        for backend in (memory, DuckDBAnalytics(parquet)):
+            assert backend.top_countries(db, "cases", 5) == expected
+    finally:
+        db.close()
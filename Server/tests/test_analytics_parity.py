@@ -0,0 +1,49 @@
+"""Moteurs mémoire et DuckDB : mêmes résultats que le SQL pour chaque requête /analytics"""
+
+import pytest
+
+from app.analytics import parity
+from app.analytics.memory import MemoryAnalyticsEngine
+from app.db.repositories import analytics_repo
+
+CASES = list(parity.cases())
+
+
+@pytest.fixture(scope="module")
+def memory_engine(dataset):
+    engine = MemoryAnalyticsEngine()
+    engine.load()
+    return engine
+
+
+@pytest.fixture(scope="module")
+def duckdb_engine(dataset):
+    pytest.importorskip("duckdb")
+    from app.analytics.duckdb_backend import duckdb_analytics, export_parquet
+
+    export_parquet(duckdb_analytics.parquet_path)
+    return duckdb_analytics
+
+
+@pytest.mark.parametrize("backend", ["memory", "duckdb"])
+@pytest.mark.parametrize("name, fn, args, same", CASES, ids=[case[0] for case in CASES])
+def test_same_results_as_sql(request, db, backend, name, fn, args, same):
+    engine = request.getfixturevalue(f"{backend}_engine")
+    expected = getattr(analytics_repo, fn)(db, *args)
+    actual = getattr(engine, fn)(db, *args)
+    assert expected, f"{name}: aucune donnée, la comparaison ne prouverait rien"
+    assert (same(expected, actual) if same else expected == actual), name
+
+
+def test_memory_refresh_after_write_keeps_parity(db, memory_engine):
+    """Une édition /manage est reprise par le rafraîchissement incrémental"""
+    from app.db.repositories.manage_repo import list_country_totals, update_many_country_totals
+    from app.schemas.manage import CountryManage
+
+    rows, _, _ = list_country_totals(db, "country", "asc", 3, None, None)
+    update_many_country_totals(db, [
+        CountryManage(**{**row, "total_cases": row["total_cases"] * 10 + 1}) for row in rows
+    ])
+
+    assert memory_engine.refresh() == len(rows)
+    assert parity.run(memory_engine) == []
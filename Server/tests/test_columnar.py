@@ -0,0 +1,57 @@
+"""Cache Arrow IPC : écrit à côté du CSV, invalidé par une modification, même DataFrame que le CSV"""
+
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from app.data import columnar
+
+REFERENCE_CSV = columnar.SERVER_DIR / "app" / "data" / "data_cleaned_used.csv"
+
+
+@pytest.fixture
+def csv_copy(tmp_path):
+    if not REFERENCE_CSV.exists():
+        pytest.skip("data_cleaned_used.csv absent")
+    path = tmp_path / REFERENCE_CSV.name
+    shutil.copy(REFERENCE_CSV, path)
+    return path
+
+
+def test_convert_writes_fresh_cache(csv_copy):
+    assert not columnar.is_fresh(csv_copy)
+    out = columnar.convert(csv_copy)
+    assert out == columnar.arrow_path(csv_copy) and out.exists()
+    assert columnar.is_fresh(csv_copy)
+
+
+def test_cache_stale_after_csv_change(csv_copy):
+    cache = columnar.convert(csv_copy)
+    # CSV modifié après la conversion : cache plus ancien que sa source
+    earlier = csv_copy.stat().st_mtime_ns - 10 * 10**9
+    os.utime(cache, ns=(earlier, earlier))
+    assert not columnar.is_fresh(csv_copy)
+    columnar.convert(csv_copy)
+    assert columnar.is_fresh(csv_copy)
+
+
+def test_read_frame_equals_read_csv(csv_copy):
+    expected = pd.read_csv(csv_copy)
+    pd.testing.assert_frame_equal(columnar.read_frame(csv_copy), expected)     # repli CSV
+    columnar.convert(csv_copy)
+    pd.testing.assert_frame_equal(columnar.read_frame(csv_copy), expected)     # cache Arrow
+    columns = ["Country", "New deaths"]
+    pd.testing.assert_frame_equal(columnar.read_frame(csv_copy, columns), expected[columns])
+
+
+def test_read_frame_ignores_stale_cache(csv_copy):
+    columnar.convert(csv_copy)
+    pd.read_csv(csv_copy).head(10).to_csv(csv_copy, index=False)
+    assert len(columnar.read_frame(csv_copy)) == 10
+
+
+def test_benchmark_reports_timings(csv_copy):
+    result = columnar.benchmark(csv_copy, repeat=1)
+    assert {"csv_ms", "arrow_to_pandas_ms", "arrow_mmap_ms"} <= result.keys()
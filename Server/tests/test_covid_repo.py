@@ -0,0 +1,11 @@
+"""Requêtes de /covid : conversions faites par le dépôt"""
+
+from datetime import date, timedelta
+
+from app.db.repositories import covid_repo
+
+
+def test_global_stats_last_updated_from_milliseconds(db):
+    # date_timestamp en millisecondes : lu en secondes, l'année sort de la plage de datetime
+    stats = covid_repo.get_global_stats(db)
+    assert abs(stats.last_updated.date() - date.today()) <= timedelta(days=1)
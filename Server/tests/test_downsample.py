@@ -0,0 +1,92 @@
+"""LTTB (app/analytics/downsample.py) et séries de /covid/countries/{cid}/series"""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.analytics.downsample import lttb
+from app.db.models.covid import CovidStat
+from app.db.repositories.covid_repo import get_country_series
+
+
+def _reference_lttb(x, y, threshold):
+    """Algorithme de Steinarsson, boucle Python point par point"""
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    selected, a = [0], 0
+    for i in range(threshold - 2):
+        avg_start, avg_end = math.floor((i + 1) * every) + 1, min(math.floor((i + 2) * every) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+        best, best_area = None, -1.0
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    return selected + [n - 1]
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(3)
+    x = np.arange(1000, dtype=np.float64) * 86_400_000
+    y = np.cumsum(rng.normal(size=1000))
+    return x, y
+
+
+@pytest.mark.parametrize("threshold", [3, 10, 97, 500, 999])
+def test_length_bounds_and_order(series, threshold):
+    x, y = series
+    picked = lttb(x, y, threshold)
+    assert len(picked) == threshold
+    assert picked[0] == 0 and picked[-1] == len(x) - 1
+    assert np.all(np.diff(picked) > 0)
+
+
+@pytest.mark.parametrize("threshold", [3, 10, 97, 500])
+def test_same_points_as_reference(series, threshold):
+    x, y = series
+    assert lttb(x, y, threshold).tolist() == _reference_lttb(x.tolist(), y.tolist(), threshold)
+
+
+def test_short_series_unchanged(series):
+    x, y = series
+    assert lttb(x[:50], y[:50], 50).tolist() == list(range(50))
+    assert lttb(x[:50], y[:50], 80).tolist() == list(range(50))
+    assert lttb(x[:0], y[:0], 10).tolist() == []
+
+
+def test_peak_is_kept():
+    y = np.zeros(500)
+    y[321] = 100.0
+    assert 321 in lttb(np.arange(500), y, 20)
+
+
+def test_country_series_downsampled(db):
+    slug = db.query(CovidStat.country_slug).first()[0]
+    full = get_country_series(db, slug, ["cases", "total_deaths"])
+    reduced = get_country_series(db, slug, ["cases", "total_deaths"], points=10)
+    for metric in ("cases", "total_deaths"):
+        assert reduced["raw_points"][metric] == len(full["metrics"][metric])
+        assert len(reduced["metrics"][metric]) == 10
+        assert reduced["metrics"][metric][0] == full["metrics"][metric][0]
+        assert reduced["metrics"][metric][-1] == full["metrics"][metric][-1]
+
+
+@pytest.mark.parametrize("metrics", [["cases", "bogus"], []])
+def test_country_series_rejects_unknown_metrics(db, metrics):
+    with pytest.raises(ValueError):
+        get_country_series(db, "anywhere", metrics)
+
+
+def test_series_endpoint_validates_metrics(client, admin_headers, db):
+    slug = db.query(CovidStat.country_slug).first()[0]
+    url = f"/api/v1/covid/countries/{slug}/series"
+    assert client.get(url, headers=admin_headers, params={"metrics": "bogus"}).status_code == 422
+    assert client.get(url, headers=admin_headers, params={"points": 2}).status_code == 422
+    response = client.get(url, headers=admin_headers, params={"metrics": ["cases", "deaths"], "points": 5})
+    assert response.status_code == 200
+    assert {m: len(v) for m, v in response.json()["metrics"].items()} == {"cases": 5, "deaths": 5}
@@ -0,0 +1,36 @@
+"""GET /covid/export : CSV compressé en flux, lu sur le réplica ou le primaire"""
+
+import csv
+import gzip
+import io
+
+from app.db.models.covid import CovidStat
+from app.db.replica import replica_router
+
+
+def test_csv_export_streams_gzip(client, admin_headers, db):
+    before = replica_router.routes.get(("primary", "no_replica"), 0)
+    with client.stream("GET", "/api/v1/covid/export",
+                       headers={**admin_headers, "Accept-Encoding": "gzip"}) as response:
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        body = gzip.decompress(b"".join(response.iter_raw()))
+
+    rows = list(csv.reader(io.StringIO(body.decode())))
+    assert rows[0] == [c.name for c in CovidStat.__table__.columns if c.name != "id"]
+    assert len(rows) - 1 == db.query(CovidStat).count()
+    # session de l'export obtenue du routeur (pas de réplica configuré ici)
+    assert replica_router.routes[("primary", "no_replica")] == before + 1
+
+
+def test_export_filters(client, admin_headers, db):
+    slug = db.query(CovidStat.country_slug).order_by(CovidStat.country_slug).first()[0]
+    response = client.get("/api/v1/covid/export", params={"country": slug}, headers=admin_headers)
+    assert response.status_code == 200
+    expected = db.query(CovidStat).filter(CovidStat.country_slug == slug).count()
+    assert len(response.text.strip().splitlines()) - 1 == expected
+
+
+def test_export_requires_admin(client):
+    assert client.get("/api/v1/covid/export").status_code in (401, 403)
@@ -0,0 +1,50 @@
+"""covid_features : rafraîchissement incrémental de l'ingestion et lecture par le monitoring"""
+
+import pandas as pd
+
+from app.db import ingest
+from app.db.models.covid import CovidStat
+from app.monitoring import features, monitor
+
+
+def _upsert_changed_days(db, country: str, first: int, last: int) -> None:
+    rows = (
+        db.query(CovidStat.date_timestamp, CovidStat.total_confirmed, CovidStat.total_deaths)
+        .filter(CovidStat.country == country)
+        .order_by(CovidStat.date_timestamp)
+        .all()[first:last]
+    )
+    # même format qu'un CSV quotidien : passe par l'upsert et DERIVED_REFRESHERS
+    ingest.ingest_frames(db, [pd.DataFrame({
+        "Country": country,
+        "date_timestamp": [r.date_timestamp for r in rows],
+        "Confirmed": [r.total_confirmed * 3 + 7 for r in rows],
+        "Deaths": [r.total_deaths + 1 for r in rows],
+    })])
+
+
+def test_incremental_refresh_matches_full_rebuild(db):
+    countries = sorted(c for (c,) in db.query(CovidStat.country).distinct())
+    _upsert_changed_days(db, countries[0], 40, 55)
+
+    stored = features.load_features(db)
+    rebuilt = features.compute_features(features._load_stats(db, countries, None, None))
+    rebuilt = rebuilt[stored.columns].astype({c: "float64" for c in features.FEATURE_COLUMNS})
+    pd.testing.assert_frame_equal(
+        stored.reset_index(drop=True),
+        rebuilt.astype({"date_timestamp": stored["date_timestamp"].dtype}).reset_index(drop=True),
+    )
+
+
+def test_monitor_reads_store_batch(db):
+    last_day = db.query(CovidStat.date_timestamp).order_by(CovidStat.date_timestamp.desc()).first()[0]
+    countries = db.query(CovidStat.country).filter(CovidStat.date_timestamp == last_day).count()
+
+    assert monitor.default_batch() == monitor.STORE_BATCH
+    batch = monitor.load_batch(monitor.STORE_BATCH)
+    assert list(batch.columns) == monitor.FEATURES + [monitor.TARGET]
+    assert len(batch) == countries
+    assert (batch["Confirmed_log"] > 0).all()
+
+    day = pd.Timestamp(last_day, unit="ms").date().isoformat()
+    pd.testing.assert_frame_equal(monitor.load_batch(f"store:{day}"), batch)
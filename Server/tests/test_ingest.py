@@ -0,0 +1,95 @@
+"""Ré-ingestion idempotente (app/db/ingest.py) sur une base SQLite dédiée"""
+
+import pandas as pd
+import pytest
+from sqlalchemy import MetaData, UniqueConstraint, create_engine, func, inspect, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import ingest
+from app.db.models.change import CovidChange
+from app.db.models.covid import CovidStat
+from app.db.repositories import change_repo
+from perf.synthetic import create_schema
+
+
+def _frame(deaths_offset: int = 0) -> pd.DataFrame:
+    rows = []
+    for country, region in (("France", "Europe"), ("Chile", "Americas")):
+        for day in range(3):
+            rows.append({
+                "Country": country, "Date": f"2021-03-0{day + 1}", "WHO Region": region,
+                "Confirmed": 1000 + 10 * day, "Deaths": 50 + day, "New cases": 10,
+            })
+    frame = pd.DataFrame(rows)
+    frame.loc[frame["Country"] == "Chile", "Deaths"] += deaths_offset
+    return frame
+
+
+@pytest.fixture
+def session(tmp_path):
+    """Base à l'ancien schéma : covid_stats sans clé unique (ajoutée par ensure_unique_key)"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'ingest.db'}")
+    legacy = CovidStat.__table__.to_metadata(MetaData())
+    legacy.constraints = {c for c in legacy.constraints if not isinstance(c, UniqueConstraint)}
+    legacy.create(engine)
+    create_schema(engine)
+
+    db = sessionmaker(bind=engine)()
+    ingest.ensure_unique_key(db)
+    ingest.ensure_unique_key(db)            # déjà présente : sans effet
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def _unique_keys(db) -> list:
+    indexes = inspect(db.get_bind()).get_indexes("covid_stats")
+    return [ix["column_names"] for ix in indexes if ix.get("unique")]
+
+
+def _rows(db) -> dict:
+    query = select(CovidStat.country, CovidStat.date_timestamp, CovidStat.deaths)
+    return {(country, ts): deaths for country, ts, deaths in db.execute(query)}
+
+
+def test_ensure_unique_key_adds_index_once(session):
+    assert _unique_keys(session) == [["country", "date_timestamp"]]
+
+
+def test_reingest_is_idempotent_and_updates_changed_values(session):
+    ingest.ingest_frames(session, [_frame()])
+    first = _rows(session)
+    version = change_repo.data_version(session)
+    assert len(first) == 6
+
+    ingest.ingest_frames(session, [_frame()])
+    assert _rows(session) == first
+    assert session.execute(select(func.count()).select_from(CovidStat)).scalar() == 6
+
+    ingest.ingest_frames(session, [_frame(deaths_offset=7)])
+    updated = _rows(session)
+    assert len(updated) == 6
+    assert all(updated[key] == first[key] + 7 for key in first if key[0] == "Chile")
+    assert all(updated[key] == first[key] for key in first if key[0] == "France")
+
+    # chaque chargement journalise ses pays dans covid_changes, sous une nouvelle version
+    assert change_repo.data_version(session) == version + 2
+    changes = session.execute(
+        select(CovidChange.country, CovidChange.kind).where(CovidChange.version == version + 2)
+    ).all()
+    assert sorted(changes) == [("Chile", "ingest"), ("France", "ingest")]
+
+
+def test_upsert_statement_dialects():
+    from sqlalchemy.dialects import mysql, sqlite
+
+    records = ingest._records(ingest.map_chunk(_frame()))
+    mysql_sql = str(ingest.upsert_statement("mysql", records).compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE" in mysql_sql and "`Deaths` = VALUES(`Deaths`)" in mysql_sql
+    assert "date_timestamp = VALUES" not in mysql_sql
+    sqlite_sql = str(ingest.upsert_statement("sqlite", records).compile(dialect=sqlite.dialect()))
+    assert "ON CONFLICT (country, date_timestamp)" in sqlite_sql or "ON CONFLICT (date_timestamp, country)" in sqlite_sql
+    assert '"Deaths" = excluded."Deaths"' in sqlite_sql and "date_timestamp = excluded" not in sqlite_sql
+
+    with pytest.raises(ValueError):
+        ingest.upsert_statement("oracle", records)
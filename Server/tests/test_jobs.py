@@ -0,0 +1,87 @@
+"""File des jobs de monitoring : clé de déduplication, cycle de statut, refus sans modèle"""
+
+import datetime
+
+import pytest
+
+from app.db.models.job import MonitoringJob
+from app.db.repositories import job_repo
+from app.monitoring import paths, runner
+
+
+@pytest.fixture
+def jobs(db):
+    db.query(MonitoringJob).delete()
+    db.commit()
+    yield db
+    db.query(MonitoringJob).delete()
+    db.commit()
+
+
+def test_same_dedupe_key_returns_existing_job(jobs):
+    first = job_repo.create_job(jobs, "features", dedupe_key="daily:features:2026-01-01")
+    second = job_repo.create_job(jobs, "features", {"other": 1}, dedupe_key="daily:features:2026-01-01")
+
+    assert second.id == first.id and second.params == {}
+    assert jobs.query(MonitoringJob).count() == 1
+    # sans clé, aucune déduplication
+    job_repo.create_job(jobs, "features")
+    job_repo.create_job(jobs, "features")
+    assert jobs.query(MonitoringJob).count() == 3
+
+
+def test_status_queued_running_succeeded(jobs):
+    job = job_repo.create_job(jobs, "features")
+    assert job.status == "queued" and job.attempts == 0
+
+    claimed = job_repo.claim_next_job(jobs)
+    assert claimed.id == job.id and claimed.status == "running" and claimed.attempts == 1
+    assert job_repo.claim_next_job(jobs) is None             # déjà réservé
+
+    job_repo.finish_job(jobs, job.id, {"rows": 3})
+    jobs.expire_all()
+    done = job_repo.get_job(jobs, job.id)
+    assert done.status == "succeeded" and done.result == {"rows": 3} and done.finished_at is not None
+
+
+def test_failure_retried_with_backoff_then_failed(jobs):
+    job = job_repo.create_job(jobs, "features", max_attempts=2)
+
+    job_repo.claim_next_job(jobs)
+    assert job_repo.fail_job(jobs, job.id, "boom") == "queued"
+    jobs.expire_all()
+    retried = job_repo.get_job(jobs, job.id)
+    assert retried.run_after > datetime.datetime.utcnow()
+    assert job_repo.claim_next_job(jobs) is None             # backoff pas encore écoulé
+
+    retried.run_after = datetime.datetime.utcnow()
+    jobs.commit()
+    assert job_repo.claim_next_job(jobs).attempts == 2
+    assert job_repo.fail_job(jobs, job.id, "boom again") == "failed"
+    jobs.expire_all()
+    failed = job_repo.get_job(jobs, job.id)
+    assert failed.status == "failed" and failed.error == "boom again"
+
+
+def test_model_jobs_refused_without_model(client, admin_headers, jobs, monkeypatch, tmp_path):
+    monkeypatch.setattr(paths, "MODEL_PATH", tmp_path / "missing.joblib")
+    response = client.post("/api/v1/jobs", json={"kind": "monitoring"}, headers=admin_headers)
+    assert response.status_code == 409
+    assert client.post("/api/v1/jobs", json={"kind": "features"}, headers=admin_headers).status_code == 202
+
+    model = tmp_path / "model.joblib"
+    model.write_bytes(b"")
+    monkeypatch.setattr(paths, "MODEL_PATH", model)
+    response = client.post("/api/v1/jobs", json={"kind": "report"}, headers=admin_headers)
+    assert response.status_code == 202 and response.json()["status"] == "queued"
+
+
+def test_daily_schedule_skips_model_jobs_without_model(jobs, monkeypatch, tmp_path):
+    monkeypatch.setattr(paths, "MODEL_PATH", tmp_path / "missing.joblib")
+    monkeypatch.setattr(runner.settings, "JOBS_DAILY_HOUR", 0)
+    monkeypatch.setattr(runner.settings, "JOBS_DAILY_KINDS", ["monitoring", "features"])
+
+    job_runner = runner.JobRunner()
+    job_runner._schedule_daily()
+    job_runner._schedule_daily()
+    assert [job.kind for job in jobs.query(MonitoringJob).all()] == ["features"]
@@ -0,0 +1,67 @@
+"""Listes paginées par curseur (/covid/countries/summary, /manage) sur l'instantané latest_repo"""
+
+import base64
+
+import pytest
+
+from app.db.repositories import latest_repo
+
+SUMMARY = "/api/v1/covid/countries/summary"
+
+
+def _walk(client, headers, limit: int, **params) -> list:
+    pages, cursor = [], None
+    while True:
+        response = client.get(SUMMARY, headers=headers, params={**params, "limit": limit, "cursor": cursor})
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            assert int(response.headers["x-total-count"]) == sum(len(p) for p in pages)
+            return pages
+
+
+@pytest.mark.parametrize("sort, order", [("country", "asc"), ("deaths_total", "desc"), ("confirmed_new", "asc")])
+def test_walk_every_page(client, admin_headers, sort, order):
+    full = client.get(SUMMARY, headers=admin_headers, params={"sort": sort, "order": order}).json()
+    pages = _walk(client, admin_headers, 7, sort=sort, order=order)
+
+    walked = [row["id"] for page in pages for row in page]
+    assert all(len(page) == 7 for page in pages[:-1])
+    assert len(walked) == len(set(walked))                  # aucun doublon
+    assert walked == [row["id"] for row in full]            # aucun trou, même ordre
+
+
+def test_walk_with_prefix_filter(client, admin_headers):
+    first = client.get(SUMMARY, headers=admin_headers).json()[0]["id"][0]
+    pages = _walk(client, admin_headers, 2, q=first)
+    assert all(row["id"].startswith(first) for page in pages for row in page)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 !",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b'["country","asc"]').decode(),
+    base64.urlsafe_b64encode(b'["country","asc",[null,{}]]').decode(),
+    latest_repo.encode_cursor("deaths_total", "asc", [True, 1.0, "x"]),   # autre tri
+])
+def test_malformed_cursor_is_400(client, admin_headers, cursor):
+    response = client.get(SUMMARY, headers=admin_headers, params={"limit": 5, "cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_write_between_pages_refreshes_snapshot(client, admin_headers):
+    first = client.get(SUMMARY, headers=admin_headers, params={"limit": 5})
+    cursor = first.headers["x-next-cursor"]
+    version = latest_repo._snapshot["version"]
+
+    target = client.get(SUMMARY, headers=admin_headers, params={"limit": 1, "cursor": cursor}).json()[0]
+    edited = {"id": target["id"], "country": target["country"],
+              "total_cases": int(target["confirmed_total"]) + 1000, "total_deaths": 0, "total_recovered": 0}
+    assert client.put(f"/api/v1/covid/countries/{target['id']}", headers=admin_headers, json=edited).status_code == 200
+
+    second = client.get(SUMMARY, headers=admin_headers, params={"limit": 5, "cursor": cursor}).json()
+    assert latest_repo._snapshot["version"] != version      # instantané reconstruit
+    assert second[0]["id"] == target["id"]                  # la page reprend après le curseur
+    assert second[0]["confirmed_total"] == edited["total_cases"]
+    assert not {row["id"] for row in first.json()} & {row["id"] for row in second}
@@ -0,0 +1,80 @@
+"""Limite d'échecs de login par IP et par utilisateur (app/core/login_guard.py)"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import login_guard
+from conftest import ADMIN_PASSWORD
+from app.main import app
+
+LOGIN = "/api/v1/auth/login"
+
+
+@pytest.fixture
+def trackers(monkeypatch):
+    def _trackers(user_limit=100, ip_limit=100, window=60.0):
+        monkeypatch.setattr(login_guard, "user_failures", login_guard.FailureTracker(user_limit, window))
+        monkeypatch.setattr(login_guard, "ip_failures", login_guard.FailureTracker(ip_limit, window))
+    return _trackers
+
+
+def _client(ip: str, asgi=app) -> TestClient:
+    return TestClient(asgi, base_url="http://localhost", client=(ip, 50000))
+
+
+def _bad_login(client: TestClient, username: str = "nobody", headers: dict = None):
+    return client.post(LOGIN, json={"username": username, "password": "wrong"}, headers=headers)
+
+
+def test_ip_throttled_after_failures_other_ips_not(dataset, trackers):
+    trackers(ip_limit=3)
+    attacker, other = _client("203.0.113.7"), _client("198.51.100.2")
+
+    # noms différents : seul le compteur de l'IP atteint sa limite
+    statuses = [_bad_login(attacker, f"user{i}").status_code for i in range(4)]
+    assert statuses == [401, 401, 401, 429]
+    response = _bad_login(attacker, "someone-else")
+    assert response.status_code == 429 and int(response.headers["Retry-After"]) >= 1
+
+    assert _bad_login(other).status_code == 401
+    assert login_guard.rejected_early["ip"] >= 2
+
+
+def test_user_locked_out_across_ips(dataset, admin, trackers):
+    trackers(user_limit=2)
+    for ip in ("192.0.2.1", "192.0.2.2"):
+        assert _bad_login(_client(ip), admin.upper()).status_code == 401
+
+    # verrouillé même avec le bon mot de passe, depuis une autre IP
+    response = _client("192.0.2.3").post(LOGIN, json={"username": admin, "password": ADMIN_PASSWORD})
+    assert response.status_code == 429 and "Retry-After" in response.headers
+    assert _bad_login(_client("192.0.2.3"), "another-user").status_code == 401
+
+
+def test_window_expiry_lifts_throttle(dataset, trackers, monkeypatch):
+    trackers(ip_limit=1, window=30.0)
+    client = _client("203.0.113.9")
+    assert _bad_login(client).status_code == 401
+    assert _bad_login(client).status_code == 429
+
+    now = login_guard.time.monotonic()
+    monkeypatch.setattr(login_guard.time, "monotonic", lambda: now + 31)
+    assert _bad_login(client).status_code == 401
+
+
+def test_ip_keyed_on_forwarded_client_behind_trusted_proxy(dataset, trackers):
+    proxy_headers = pytest.importorskip("uvicorn.middleware.proxy_headers")
+    trackers(ip_limit=2)
+    proxied = proxy_headers.ProxyHeadersMiddleware(app, trusted_hosts="10.0.0.10")
+    nginx = _client("10.0.0.10", proxied)
+
+    for _ in range(2):
+        assert _bad_login(nginx, headers={"X-Forwarded-For": "203.0.113.50"}).status_code == 401
+    assert _bad_login(nginx, headers={"X-Forwarded-For": "203.0.113.50"}).status_code == 429
+    # autre client derrière le même nginx : compteur distinct
+    assert _bad_login(nginx, headers={"X-Forwarded-For": "203.0.113.51"}).status_code == 401
+    # proxy non reconnu : X-Forwarded-For ignoré, l'IP de connexion est comptée
+    rogue = _client("10.0.0.99", proxied)
+    for _ in range(2):
+        assert _bad_login(rogue, headers={"X-Forwarded-For": "203.0.113.52"}).status_code == 401
+    assert _bad_login(rogue, headers={"X-Forwarded-For": "203.0.113.53"}).status_code == 429
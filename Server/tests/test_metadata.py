@@ -0,0 +1,60 @@
+"""/metadata : ETag calculé sur l'index région → pays, revalidé sur mtime/taille du CSV"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from app.api.endpoints import metadata
+
+URL = "/api/v1/metadata"
+
+
+def _write(path, rows, mtime_ns):
+    pd.DataFrame(rows, columns=["Country", "WHO Region", "Confirmed"]).to_csv(path, index=False)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def csv(tmp_path, monkeypatch):
+    path = tmp_path / "data_cleaned_used.csv"
+    _write(path, [("France", "Europe", 1), ("Chile", "Americas", 2), ("France", "Europe", 3)], 10**18)
+    monkeypatch.setattr(metadata, "CSV_PATH", str(path))
+    monkeypatch.setattr(metadata, "_index", {"signature": None, "payload": None, "etag": None})
+    return path
+
+
+def test_etag_and_304(client, admin_headers, csv):
+    response = client.get(URL, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "who_regions": ["Americas", "Europe"],
+        "countries_by_region": {"Americas": ["Chile"], "Europe": ["France"]},
+    }
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    cached = client.get(URL, headers={**admin_headers, "If-None-Match": etag})
+    assert cached.status_code == 304 and cached.headers["ETag"] == etag and not cached.content
+    stale = client.get(URL, headers={**admin_headers, "If-None-Match": '"other"'})
+    assert stale.status_code == 200
+
+
+def test_new_etag_after_file_change(client, admin_headers, csv):
+    etag = client.get(URL, headers=admin_headers).headers["ETag"]
+
+    # fichier réécrit à l'identique : index relu, même contenu donc même ETag
+    _write(csv, [("France", "Europe", 1), ("Chile", "Americas", 2), ("France", "Europe", 3)], 2 * 10**18)
+    assert client.get(URL, headers={**admin_headers, "If-None-Match": etag}).status_code == 304
+
+    _write(csv, [("France", "Europe", 1), ("Chile", "Americas", 2), ("Kenya", "Africa", 3)], 3 * 10**18)
+    response = client.get(URL, headers={**admin_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["countries_by_region"]["Africa"] == ["Kenya"]
+    assert client.get(URL, headers={**admin_headers, "If-None-Match": response.headers["ETag"]}).status_code == 304
+
+
+def test_missing_file_500(client, admin_headers, csv):
+    os.remove(csv)
+    assert client.get(URL, headers=admin_headers).status_code == 500
@@ -0,0 +1,43 @@
+"""RMSE glissante de /predict/quality : prédictions journalisées × New deaths réels"""
+
+import math
+
+import pytest
+
+from app.db.models.covid import CovidStat
+from app.db.models.prediction_log import PredictionLog
+from app.db.repositories.quality_repo import rolling_rmse
+
+
+@pytest.fixture
+def logged(db):
+    """Trois prédictions d'un pays, écart connu au réel ; annulées après le test"""
+    country = db.query(CovidStat.country).order_by(CovidStat.country).first()[0]
+    actuals = (
+        db.query(CovidStat.date_timestamp, CovidStat.new_deaths)
+        .filter(CovidStat.country == country)
+        .order_by(CovidStat.date_timestamp.desc())
+        .limit(3)
+        .all()
+    )
+    offsets = [1.0, -1.0, 3.0]
+    for (ts, actual), offset in zip(actuals, offsets):
+        db.add(PredictionLog(country=country, target_ts=ts, pred_new_deaths=actual + offset, model_version="v1"))
+    # jour prédit sans réel (après la fin de la série) : ignoré
+    db.add(PredictionLog(country=country, target_ts=actuals[0][0] + 86_400_000, pred_new_deaths=5, model_version="v1"))
+    db.flush()
+    yield country, offsets
+    db.rollback()
+
+
+def test_rolling_rmse_and_bias(db, logged):
+    country, offsets = logged
+    [row] = rolling_rmse(db, days=14)
+    assert (row["country"], row["model_version"], row["n"]) == (country, "v1", 3)
+    assert row["rmse"] == round(math.sqrt(sum(o * o for o in offsets) / 3), 4)
+    assert row["bias"] == round(sum(offsets) / 3, 4)
+
+
+def test_rolling_rmse_country_filter(db, logged):
+    assert rolling_rmse(db, country="nowhere") == []
+    assert len(rolling_rmse(db, country=logged[0])) == 1
@@ -0,0 +1,73 @@
+"""Révocation des tokens : logout, changement de mot de passe, révocation vue par un autre worker"""
+
+import pytest
+
+from app.core.revocation import revocation_cache
+from app.core.security import get_password_hash
+from app.db.models.user import User
+from app.db.repositories import session_repo
+
+PASSWORD = "Old-passw0rd!"
+SESSIONS = "/api/v1/auth/sessions"
+
+
+def _create_user(db, username: str) -> User:
+    user = User(username=username, email=f"{username}@example.com",
+                hashed_password=get_password_hash(PASSWORD), role="admin")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def user(db, request):
+    return _create_user(db, f"revoc-{request.node.name.replace('_', '-')[:30]}")
+
+
+def _jti(db, user_id: int) -> str:
+    return session_repo.active_sessions(db, user_id)[0].token_jti
+
+
+def test_logout_revokes_token(client, login, user):
+    headers = login(user.username, PASSWORD)
+    assert client.get(SESSIONS, headers=headers).status_code == 200
+
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+    response = client.get(SESSIONS, headers=headers)
+    assert response.status_code == 401 and response.json()["detail"] == "Token revoked"
+    # un nouveau login reste possible
+    assert client.get(SESSIONS, headers=login(user.username, PASSWORD)).status_code == 200
+
+
+def test_revocation_by_other_worker_applies_after_sync(client, login, db, user):
+    headers = login(user.username, PASSWORD)
+    jti = _jti(db, user.id)
+
+    # révocation écrite en base par un autre worker : le cache local l'ignore jusqu'à la synchronisation
+    session_repo.revoke_token(db, user.id, jti, session_repo.active_sessions(db, user.id)[0].expires_at)
+    assert not revocation_cache.is_revoked(jti)
+    assert client.get(SESSIONS, headers=headers).status_code == 200
+
+    assert revocation_cache.sync() >= 1
+    assert revocation_cache.is_revoked(jti)
+    assert client.get(SESSIONS, headers=headers).status_code == 401
+
+
+def test_password_change_revokes_all_sessions(client, login, user):
+    first = login(user.username, PASSWORD)
+    second = login(user.username, PASSWORD)
+
+    response = client.post("/api/v1/auth/change-password", headers=first,
+                           json={"current_password": "wrong", "new_password": "New-passw0rd!"})
+    assert response.status_code == 400
+    assert client.get(SESSIONS, headers=first).status_code == 200
+
+    response = client.post("/api/v1/auth/change-password", headers=first,
+                           json={"current_password": PASSWORD, "new_password": "New-passw0rd!"})
+    assert response.status_code == 200 and response.json()["revoked"] == 2
+    assert client.get(SESSIONS, headers=first).status_code == 401
+    assert client.get(SESSIONS, headers=second).status_code == 401
+
+    old = client.post("/api/v1/auth/login", json={"username": user.username, "password": PASSWORD})
+    assert old.status_code == 401
+    assert client.get(SESSIONS, headers=login(user.username, "New-passw0rd!")).status_code == 200
@@ -0,0 +1,18 @@
+"""`import app.main` : budget de temps et dépendances lourdes chargées à la demande"""
+
+import os
+import statistics
+
+from perf import startup_budget
+
+BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "2.0"))
+
+
+def test_import_within_budget():
+    runs = [startup_budget.timed_import() for _ in range(3)]
+    median = statistics.median(run["seconds"] for run in runs)
+    assert median <= BUDGET_SECONDS, f"import app.main: {median:.2f}s > {BUDGET_SECONDS}s"
+
+
+def test_no_heavy_module_imported_eagerly():
+    assert startup_budget.timed_import()["eager"] == []
@@ -13,3 +13,105 @@ CREATE TABLE IF NOT EXISTS users (
 INSERT INTO users (username, email, hashed_password, role) VALUES 
 ('admin', 'admin@covid-app.com', '$2a$12$j18RBhI6Z8I7xW/B.N7aEuxVdo/6sSh/n4zanab5Sf5anwcbQx5N2', 'admin')
 ON DUPLICATE KEY UPDATE email = VALUES(email);
+
+CREATE TABLE IF NOT EXISTS user_sessions (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    user_id INT NOT NULL,
+    token_jti VARCHAR(255) UNIQUE NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    is_revoked BOOLEAN NOT NULL DEFAULT FALSE,
+    revoked_at DATETIME NULL,
+    INDEX ix_user_sessions_user_id (user_id),
+    INDEX ix_user_sessions_revoked_at (revoked_at)
+);
+
+CREATE TABLE IF NOT EXISTS covid_stats (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    country VARCHAR(100),
+    country_slug VARCHAR(100),
+    `Confirmed` DOUBLE,
+    `Deaths` DOUBLE,
+    `Recovered` DOUBLE,
+    `Active` DOUBLE,
+    `New cases` DOUBLE,
+    `New deaths` DOUBLE,
+    `New recovered` DOUBLE,
+    continent VARCHAR(50),
+    total_confirmed DOUBLE,
+    total_deaths DOUBLE,
+    total_recovered DOUBLE,
+    active_cases DOUBLE,
+    serious_or_critical DOUBLE,
+    total_tests DOUBLE,
+    population DOUBLE,
+    date_timestamp BIGINT,
+    UNIQUE KEY uq_covid_stats_country_date (country, date_timestamp),
+    INDEX ix_covid_stats_country_slug (country_slug)
+);
+
+CREATE TABLE IF NOT EXISTS monitoring_jobs (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    kind VARCHAR(32) NOT NULL,
+    status VARCHAR(16) NOT NULL DEFAULT 'queued',
+    params JSON NULL,
+    result JSON NULL,
+    error TEXT NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 3,
+    timeout_seconds INT NOT NULL DEFAULT 900,
+    submitted_by VARCHAR(50) NULL,
+    dedupe_key VARCHAR(64) NULL,
+    created_at DATETIME NULL,
+    run_after DATETIME NULL,
+    started_at DATETIME NULL,
+    finished_at DATETIME NULL,
+    UNIQUE KEY ux_monitoring_jobs_dedupe_key (dedupe_key),
+    INDEX ix_monitoring_jobs_kind (kind),
+    INDEX ix_monitoring_jobs_status_run_after (status, run_after)
+);
+
+CREATE TABLE IF NOT EXISTS prediction_log (
+    id BIGINT PRIMARY KEY AUTO_INCREMENT,
+    country VARCHAR(100) NOT NULL,
+    who_region VARCHAR(50) NULL,
+    target_ts BIGINT NOT NULL,
+    pred_new_deaths DOUBLE NOT NULL,
+    model_version VARCHAR(32) NOT NULL,
+    features JSON NULL,
+    username VARCHAR(50) NULL,
+    created_at DATETIME NULL,
+    INDEX ix_prediction_log_country_target (country, target_ts),
+    INDEX ix_prediction_log_target (target_ts)
+);
+
+CREATE TABLE IF NOT EXISTS covid_changes (
+    id BIGINT PRIMARY KEY AUTO_INCREMENT,
+    country VARCHAR(100) NULL,
+    kind VARCHAR(16) NOT NULL,
+    created_at DATETIME NULL,
+    version BIGINT NULL,
+    INDEX ix_covid_changes_version (version)
+);
+
+-- Version des données : incrémentée (verrou de ligne) par chaque transaction d'écriture
+CREATE TABLE IF NOT EXISTS covid_data_version (
+    id INT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME NULL
+);
+INSERT IGNORE INTO covid_data_version (id, version) VALUES (1, 0);
+
+CREATE TABLE IF NOT EXISTS covid_features (
+    id BIGINT PRIMARY KEY AUTO_INCREMENT,
+    country VARCHAR(100) NOT NULL,
+    date_timestamp BIGINT NOT NULL,
+    `Confirmed_log` DOUBLE NULL,
+    `Confirmed_log_ma_14` DOUBLE NULL,
+    `Deaths_log` DOUBLE NULL,
+    cases_per_million DOUBLE NULL,
+    tests_per_million DOUBLE NULL,
+    population DOUBLE NULL,
+    computed_at DATETIME NULL,
+    UNIQUE KEY uq_covid_features_country_date (country, date_timestamp)
+);